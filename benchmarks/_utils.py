@@ -0,0 +1,29 @@
+"""Helpers shared by the benchmark scripts in this directory."""
+import time
+
+
+def best_of(function, repeat=3):
+    """Return the best wall-clock time, in seconds, of calling function()."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report_scaling(title, sizes, run, repeat=3, unit="cue"):
+    """
+    Time run(size) for every size and print the total time and the time per
+    item. Linear algorithms show a roughly constant time per item.
+
+    :param run: a callable receiving a size and returning a callable to time
+        (so that the input can be built outside of the measurement)
+    """
+    print(title)
+    for size in sizes:
+        elapsed = best_of(run(size), repeat)
+        print(f"  {size:>8} {unit}s: {elapsed * 1000:10.1f} ms"
+              f"  ({elapsed / size * 1e6:6.2f} us/{unit})")
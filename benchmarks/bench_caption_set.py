@@ -0,0 +1,46 @@
+"""
+Benchmark CaptionSet.merge_captions and
+CaptionSet.make_sure_of_sane_start_times_and_gap on synthetic caption sets
+where every other cue has a concurrent duplicate (as is common for captions
+read from SCC).
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_caption_set.py
+"""
+from _utils import report_scaling
+
+from pycaption import Caption, CaptionList, CaptionNode, CaptionSet
+
+SIZES = (25000, 50000, 100000, 200000)
+
+
+def build_caption_set(size):
+    captions = CaptionList()
+    start = 0
+    while len(captions) < size:
+        end = start + 2000000
+        captions.append(
+            Caption(start, end, [CaptionNode.create_text(f"cue {start}")]))
+        if len(captions) % 2:
+            captions.append(
+                Caption(start, end, [CaptionNode.create_text("concurrent")]))
+        # consecutive cues touch, so gap enforcement has work to do
+        start = end
+    return CaptionSet({"en": captions})
+
+
+def merge(size):
+    caption_set = build_caption_set(size)
+    return caption_set.merge_captions
+
+
+def sane_start_times(size):
+    caption_set = build_caption_set(size)
+    return caption_set.make_sure_of_sane_start_times_and_gap
+
+
+if __name__ == "__main__":
+    report_scaling("CaptionSet.merge_captions", SIZES, merge, repeat=1)
+    report_scaling("CaptionSet.make_sure_of_sane_start_times_and_gap",
+                   SIZES, sane_start_times, repeat=1)
@@ -0,0 +1,68 @@
+"""
+Benchmark DFXPReader.read on synthetic DFXP files made of paragraphs with
+nested <span> tags, some of them with their own region, where determining
+the region of every element used to scan its whole subtree.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_dfxp_nested_spans.py
+"""
+from _utils import report_scaling
+
+from pycaption import DFXPReader
+
+SIZES = (2500, 5000, 10000)
+
+HEAD = """<?xml version="1.0" encoding="utf-8"?>
+<tt xml:lang="en" xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling">
+ <head>
+  <layout>
+   <region xml:id="top" tts:origin="10% 10%" tts:extent="80% 20%"/>
+   <region xml:id="bottom" tts:origin="10% 70%" tts:extent="80% 20%"/>
+  </layout>
+ </head>
+ <body>
+  <div>
+"""
+
+TAIL = """  </div>
+ </body>
+</tt>
+"""
+
+
+def _timestamp(milliseconds):
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+def build_dfxp(size):
+    cues = []
+    for cue in range(size):
+        region = ' region="top"' if cue % 3 == 0 else ''
+        cues.append(
+            f'   <p begin="{_timestamp(cue * 3000)}" '
+            f'end="{_timestamp(cue * 3000 + 2500)}">'
+            f'<span tts:fontStyle="italic">Caption '
+            f'<span tts:fontWeight="bold"{region}>number '
+            f'<span tts:textDecoration="underline">{cue}</span></span>'
+            f'</span><br/><span>on <span>two</span> rows</span></p>\n'
+        )
+    return HEAD + "".join(cues) + TAIL
+
+
+def read_with(backend):
+    def run(size):
+        content = build_dfxp(size)
+        return lambda: DFXPReader(backend=backend).read(content)
+    return run
+
+
+if __name__ == "__main__":
+    report_scaling("DFXPReader.read, nested spans, BeautifulSoup backend",
+                   SIZES, read_with("beautifulsoup"))
+    report_scaling("DFXPReader.read, nested spans, lxml backend",
+                   SIZES, read_with("lxml"))
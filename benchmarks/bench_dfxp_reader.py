@@ -0,0 +1,86 @@
+"""
+Benchmark DFXPReader.read on synthetic DFXP files with a region per cue
+group and styled spans, with the BeautifulSoup backend (the default) and the
+streaming lxml one, and compare the peak memory they use.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_dfxp_reader.py
+"""
+import tracemalloc
+
+from _utils import report_scaling
+
+from pycaption import DFXPReader
+
+SIZES = (1250, 2500, 5000)
+
+HEAD = """<?xml version="1.0" encoding="utf-8"?>
+<tt xml:lang="en" xmlns="http://www.w3.org/ns/ttml"
+    xmlns:tts="http://www.w3.org/ns/ttml#styling">
+ <head>
+  <styling>
+   <style xml:id="p" tts:color="#ffffff" tts:fontFamily="Arial"
+          tts:fontSize="10pt" tts:textAlign="center"/>
+  </styling>
+  <layout>
+   <region xml:id="top" tts:origin="10% 10%" tts:extent="80% 20%"/>
+   <region xml:id="bottom" tts:origin="10% 70%" tts:extent="80% 20%"
+           tts:displayAlign="after"/>
+  </layout>
+ </head>
+ <body>
+  <div>
+"""
+
+TAIL = """  </div>
+ </body>
+</tt>
+"""
+
+
+def _timestamp(milliseconds):
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+def build_dfxp(size):
+    cues = []
+    for cue in range(size):
+        region = "top" if cue % 4 == 0 else "bottom"
+        cues.append(
+            f'   <p begin="{_timestamp(cue * 3000)}" '
+            f'end="{_timestamp(cue * 3000 + 2500)}" style="p" '
+            f'region="{region}">\n'
+            f'    Caption number {cue}<br/>\n'
+            f'    <span tts:fontStyle="italic">on two rows</span>\n'
+            f'   </p>\n'
+        )
+    return HEAD + "".join(cues) + TAIL
+
+
+def read_with(backend):
+    def run(size):
+        content = build_dfxp(size)
+        return lambda: DFXPReader(backend=backend).read(content)
+    return run
+
+
+def report_peak_memory(size):
+    content = build_dfxp(size)
+    print(f"Peak memory of DFXPReader.read, {size} cues")
+    for backend in ("beautifulsoup", "lxml"):
+        tracemalloc.start()
+        DFXPReader(backend=backend).read(content)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {backend:>14}: {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    report_scaling("DFXPReader.read, BeautifulSoup backend", SIZES,
+                   read_with("beautifulsoup"))
+    report_scaling("DFXPReader.read, lxml backend", SIZES, read_with("lxml"))
+    report_peak_memory(SIZES[-1])
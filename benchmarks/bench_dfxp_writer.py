@@ -0,0 +1,57 @@
+"""
+Benchmark DFXPWriter.write on caption sets read from synthetic DFXP files,
+with styled spans and a couple of regions, with and without the positioning
+written inline. Also report how often the writer finds the relativized
+layouts in its cache for a caption set built by hand, whose captions have
+equal but separate layouts.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_dfxp_writer.py
+"""
+from _utils import report_scaling
+from bench_dfxp_reader import build_dfxp
+
+from pycaption import (
+    Caption, CaptionList, CaptionNode, CaptionSet, DFXPReader, DFXPWriter,
+)
+from pycaption.geometry import Layout, Point, Size, UnitEnum
+
+SIZES = (1250, 2500, 5000, 10000)
+
+
+def write_with(**writer_options):
+    def run(size):
+        caption_set = DFXPReader(backend="lxml").read(build_dfxp(size))
+        return lambda: DFXPWriter(**writer_options).write(caption_set)
+    return run
+
+
+def build_caption_set(size):
+    captions = CaptionList()
+    for index in range(size):
+        start = index * 3000000
+        layout = Layout(origin=Point(Size(10, UnitEnum.PERCENT),
+                                     Size(10 + 20 * (index % 4),
+                                          UnitEnum.PERCENT)))
+        captions.append(Caption(start, start + 2500000, [
+            CaptionNode.create_text(f"Caption number {index}", layout),
+        ], layout_info=layout))
+    return CaptionSet({"en": captions})
+
+
+def report_layout_cache(size):
+    caption_set = build_caption_set(size)
+    writer = DFXPWriter()
+    writer.write(caption_set)
+    hits, misses = writer.layout_cache_hits, writer.layout_cache_misses
+    print(f"Layout cache of DFXPWriter.write, {size} cues")
+    print(f"  {hits} hits, {misses} misses "
+          f"({100 * hits / ((hits + misses) or 1):.1f}% hit rate)")
+
+
+if __name__ == "__main__":
+    report_scaling("DFXPWriter.write", SIZES, write_with())
+    report_scaling("DFXPWriter.write, inline positioning", SIZES,
+                   write_with(write_inline_positioning=True))
+    report_layout_cache(SIZES[-1])
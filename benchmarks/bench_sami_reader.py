@@ -0,0 +1,57 @@
+"""
+Benchmark SAMIReader.read on synthetic SAMI files with 3 languages, a
+<SYNC> block per cue and language, and styled text.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_sami_reader.py
+"""
+from _utils import report_scaling
+
+from pycaption import SAMIReader
+
+SIZES = (2500, 5000, 10000, 20000)
+LANGUAGES = ("en", "fr", "de")
+
+HEAD = """<SAMI>
+<HEAD>
+<TITLE>Benchmark</TITLE>
+<STYLE TYPE="text/css">
+<!--
+P { margin-left: 1pt; margin-right: 1pt; margin-bottom: 2pt;
+    text-align: center; font-size: 10pt; font-family: Arial;
+    color: #ffffff; }
+.ENCC { Name: English; lang: en-US; }
+.FRCC { Name: French; lang: fr-FR; }
+.DECC { Name: German; lang: de-DE; }
+-->
+</STYLE>
+</HEAD>
+<BODY>
+"""
+
+TAIL = """</BODY>
+</SAMI>
+"""
+
+
+def build_sami(size):
+    blocks = []
+    for cue in range(size):
+        for lang in LANGUAGES:
+            blocks.append(
+                f'<SYNC start="{cue * 3000 + LANGUAGES.index(lang)}">'
+                f'<P class="{lang.upper()}CC">Caption number {cue} &amp; '
+                f'<i>more</i><br/>on <span style="color:#ff0000">two</span> '
+                f'rows\n'
+            )
+    return HEAD + "".join(blocks) + TAIL
+
+
+def read(size):
+    content = build_sami(size)
+    return lambda: SAMIReader().read(content)
+
+
+if __name__ == "__main__":
+    report_scaling("SAMIReader.read, 3 languages", SIZES, read)
@@ -0,0 +1,49 @@
+"""
+Benchmark SAMIWriter.write on synthetic caption sets with 3 languages, whose
+captions start at different times, so that the <SYNC> tags of the other
+languages have to be placed between the ones of the first language. Also
+with the first two captions of the first language swapped, so that the
+<SYNC> tags are out of order from the start.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_sami_writer.py
+"""
+from _utils import report_scaling
+
+from pycaption import Caption, CaptionList, CaptionNode, CaptionSet, SAMIWriter
+
+SIZES = (2500, 5000, 10000, 20000)
+LANGUAGES = ("en", "fr", "de")
+
+
+def build_caption_set(size, swap_first_captions=False):
+    captions = {}
+    for offset, lang in enumerate(LANGUAGES):
+        caption_list = CaptionList()
+        for index in range(size):
+            start = (index * 3000 + offset * 500) * 1000
+            caption_list.append(Caption(start, start + 2000000, [
+                CaptionNode.create_text(f"Caption number {index}"),
+                CaptionNode.create_break(),
+                CaptionNode.create_text(f"in {lang}"),
+            ]))
+        captions[lang] = caption_list
+    if swap_first_captions:
+        first_captions = captions[LANGUAGES[0]]
+        first_captions[0], first_captions[1] = \
+            first_captions[1], first_captions[0]
+    return CaptionSet(captions)
+
+
+def write_with(**options):
+    def run(size):
+        caption_set = build_caption_set(size, **options)
+        return lambda: SAMIWriter(relativize=False).write(caption_set)
+    return run
+
+
+if __name__ == "__main__":
+    report_scaling("SAMIWriter.write, 3 languages", SIZES, write_with())
+    report_scaling("SAMIWriter.write, 3 languages, out of order", SIZES,
+                   write_with(swap_first_captions=True))
@@ -0,0 +1,88 @@
+"""
+Benchmark SCCReader.read on synthetic pop-on SCC files, where every cue is
+loaded into the non-displayed memory and shown with an End Of Caption.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_scc_reader.py
+"""
+from _utils import report_scaling
+
+from pycaption import SCCReader
+from pycaption.scc.constants import CHARACTER_TO_CODE, HEADER
+
+SIZES = (1000, 2000, 4000, 8000)
+
+FIRST_ROW = "Caption number one"
+SECOND_ROW = "two rows of text"
+
+
+def _timestamp(frames):
+    seconds, frames = divmod(frames, 30)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02};{frames:02}"
+
+
+def _words(text):
+    codes = "".join(CHARACTER_TO_CODE[char] for char in text)
+    return " ".join(codes[i:i + 4] for i in range(0, len(codes), 4))
+
+
+def _pop_on_cue(frames, channel_byte):
+    """The lines of a pop-on cue on CC1 (channel_byte "94") or CC2 ("1c")"""
+    rcl, enm, pac_14, pac_15, eoc, edm = (
+        f"{channel_byte}{command}"
+        for command in ("20", "ae", "52", "70", "2f", "2c")
+    )
+    return [
+        f"{_timestamp(frames)}\t{rcl} {rcl} {enm} {enm} {pac_14} {pac_14} "
+        f"{_words(FIRST_ROW)} {pac_15} {pac_15} {_words(SECOND_ROW)} "
+        f"{eoc} {eoc}",
+        "",
+        f"{_timestamp(frames + 75)}\t{edm} {edm}",
+        "",
+    ]
+
+
+def build_pop_on_scc(size):
+    lines = [HEADER, ""]
+    for cue in range(size):
+        lines.extend(_pop_on_cue(cue * 90, "94"))
+    return "\n".join(lines)
+
+
+def build_two_channel_scc(size):
+    """Alternates cues on CC1 and CC2, size cues on each channel"""
+    lines = [HEADER, ""]
+    for cue in range(size):
+        lines.extend(_pop_on_cue(cue * 180, "94"))
+        lines.extend(_pop_on_cue(cue * 180 + 90, "1c"))
+    return "\n".join(lines)
+
+
+def read_pop_on(size):
+    content = build_pop_on_scc(size)
+    return lambda: SCCReader().read(content)
+
+
+def read_both_channels(size):
+    content = build_two_channel_scc(size)
+    return lambda: SCCReader().read(content, channels=[1, 2])
+
+
+def read_each_channel(size):
+    content = build_two_channel_scc(size)
+
+    def read():
+        SCCReader().read(content, channels=[1])
+        SCCReader().read(content, channels=[2])
+    return read
+
+
+if __name__ == "__main__":
+    report_scaling("SCCReader.read, pop-on captions", SIZES, read_pop_on)
+    report_scaling("SCCReader.read, CC1 and CC2 in one pass", SIZES,
+                   read_both_channels, unit="channel cue")
+    report_scaling("SCCReader.read, CC1 and CC2 in two passes", SIZES,
+                   read_each_channel, unit="channel cue")
@@ -0,0 +1,35 @@
+"""
+Benchmark SCCWriter.write on synthetic caption sets the length of a feature
+film and more (about 1500 cues per 2 hours), including special and extended
+characters.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_scc_writer.py
+"""
+from _utils import report_scaling
+
+from pycaption import Caption, CaptionList, CaptionNode, CaptionSet, SCCWriter
+
+SIZES = (1500, 3000, 6000, 12000)
+
+
+def build_caption_set(size):
+    captions = CaptionList()
+    for index in range(size):
+        start = index * 4000000
+        captions.append(Caption(start, start + 3000000, [
+            CaptionNode.create_text(f"Caption number {index}, señor"),
+            CaptionNode.create_break(),
+            CaptionNode.create_text("with a second line ♪ «quoted»"),
+        ]))
+    return CaptionSet({"en-US": captions})
+
+
+def write(size):
+    caption_set = build_caption_set(size)
+    return lambda: SCCWriter().write(caption_set)
+
+
+if __name__ == "__main__":
+    report_scaling("SCCWriter.write", SIZES, write)
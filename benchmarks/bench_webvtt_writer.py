@@ -0,0 +1,23 @@
+"""
+Benchmark WebVTTWriter.write on caption sets read from synthetic DFXP files,
+whose cues are positioned in a couple of regions and have styled spans.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_webvtt_writer.py
+"""
+from _utils import report_scaling
+from bench_dfxp_reader import build_dfxp
+
+from pycaption import DFXPReader, WebVTTWriter
+
+SIZES = (1250, 2500, 5000, 10000)
+
+
+def write(size):
+    caption_set = DFXPReader(backend="lxml").read(build_dfxp(size))
+    return lambda: WebVTTWriter().write(caption_set)
+
+
+if __name__ == "__main__":
+    report_scaling("WebVTTWriter.write", SIZES, write)
@@ -9,19 +9,21 @@ from .sami import SAMIReader, SAMIWriter
 from .scenarist import ScenaristDVDWriter
 from .filtergraph import FiltergraphWriter
 from .srt import SRTReader, SRTWriter
-from .scc import SCCReader, SCCWriter
-from .scc.translator import translate_scc
+from .scc import SCCDecoder, SCCReader, SCCWriter
+from .scc.translator import iter_translate_scc, translate_scc
 from .transcript import TranscriptWriter
 from .webvtt import WebVTTReader, WebVTTWriter
 from .exceptions import (
-    CaptionReadError, CaptionReadNoCaptions, CaptionReadSyntaxError, CaptionLineLengthError
+    CaptionReadError, CaptionReadNoCaptions, CaptionReadSyntaxError,
+    CaptionLineLengthError, CaptionLineLengthWarning,
 )
 
 
 __all__ = [
     'CaptionConverter', 'DFXPReader', 'DFXPWriter', 'MicroDVDReader',
     'MicroDVDWriter', 'SAMIReader', 'SAMIWriter', 'SRTReader', 'SRTWriter',
-    'SCCReader', 'SCCWriter', 'translate_scc', 'WebVTTReader', 'WebVTTWriter',
+    'SCCReader', 'SCCWriter', 'SCCDecoder', 'translate_scc',
+    'iter_translate_scc', 'WebVTTReader', 'WebVTTWriter',
     'CaptionReadError', 'CaptionReadNoCaptions', 'CaptionReadSyntaxError',
     'detect_format', 'CaptionNode', 'Caption', 'CaptionList', 'CaptionSet',
     'ScenaristDVDWriter', 'FiltergraphWriter', 'TranscriptWriter'
@@ -1,11 +1,14 @@
+import codecs
 import os
 import re
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
+from copy import copy
 from datetime import timedelta
 from numbers import Number
 
 from .exceptions import CaptionReadError, CaptionReadTimingError
+from .timing import CaptionTimingView
 
 # `und` a special identifier for an undetermined language according to ISO 639-2
 DEFAULT_LANGUAGE_CODE = os.getenv("PYCAPTION_DEFAULT_LANG", "und")
@@ -53,6 +56,9 @@ class BaseReader:
 
 
 class BaseWriter:
+    # How many distinct layouts _relativize_and_fit_to_screen remembers
+    LAYOUT_CACHE_SIZE = 256
+
     def __init__(
         self, relativize=True, video_width=None, video_height=None, fit_to_screen=True
     ):
@@ -80,21 +86,66 @@ class BaseWriter:
         self.video_height = video_height
         self.fit_to_screen = fit_to_screen
 
+        # The layouts transformed by _relativize_and_fit_to_screen, least
+        # recently used first, and how often they were found there
+        self._layout_cache = OrderedDict()
+        self.layout_cache_hits = 0
+        self.layout_cache_misses = 0
+
     def _relativize_and_fit_to_screen(self, layout_info):
-        if layout_info:
-            if self.relativize:
-                # Transform absolute values (e.g. px) into percentages
-                layout_info = layout_info.as_percentage_of(
-                    self.video_width, self.video_height
-                )
-            if self.fit_to_screen:
-                # Make sure origin + extent <= 100%
-                layout_info = layout_info.fit_to_screen()
+        """Returns the layout, relativized and fitted to the screen according
+        to the writer's settings. The captions of a file share a handful of
+        layouts, so the results for the last LAYOUT_CACHE_SIZE distinct
+        layouts are remembered.
+        """
+        if not layout_info:
+            return layout_info
+
+        # Layouts compare equal regardless of these last two attributes
+        key = (
+            layout_info, self.relativize, self.video_width,
+            self.video_height, self.fit_to_screen,
+            layout_info.webvtt_positioning, layout_info.center_horizontal,
+        )
+        result = self._layout_cache.get(key)
+        if result is None:
+            self.layout_cache_misses += 1
+            result = self._layout_cache[key] = \
+                self._relativize_and_fit_layout(layout_info)
+            if len(self._layout_cache) > self.LAYOUT_CACHE_SIZE:
+                self._layout_cache.popitem(last=False)
+        else:
+            self.layout_cache_hits += 1
+            self._layout_cache.move_to_end(key)
+        return result
+
+    def _relativize_and_fit_layout(self, layout_info):
+        if self.relativize:
+            # Transform absolute values (e.g. px) into percentages
+            layout_info = layout_info.as_percentage_of(
+                self.video_width, self.video_height
+            )
+        if self.fit_to_screen:
+            # Make sure origin + extent <= 100%
+            layout_info = layout_info.fit_to_screen()
         return layout_info
 
     def write(self, content):
         return content
 
+    def write_to(self, caption_set, fp, **kwargs):
+        """
+        Serialize the caption set to a writable file-like object.
+
+        Text writers override this to emit their output in chunks, so that
+        large documents never have to be held in memory as one string. The
+        default implementation simply writes the result of ``write``.
+
+        :param caption_set: the CaptionSet to serialize
+        :param fp: any object with a ``write`` method accepting strings
+        """
+        fp.write(self.write(caption_set, **kwargs))
+
 
 class Style:
     def __init__(self):
@@ -113,6 +164,8 @@ class CaptionNode:
         values (if necessary) when reading their respective formats.
     """
 
+    __slots__ = ("type_", "content", "position", "start", "layout_info")
+
     TEXT = 1
     # When and if this is extended, it might be better to turn it into a
     # property of the node, not a type of node itself.
@@ -177,6 +230,8 @@ class Caption:
     for its display.
     """
 
+    __slots__ = ("start", "end", "nodes", "style", "layout_info")
+
     def __init__(self, start, end, nodes, style={}, layout_info=None):
         """
         Initialize the Caption object
@@ -259,6 +314,35 @@ class Caption:
         return timestamp
 
 
+class _CaptionIntervalIndex:
+    """
+    Interval index over a list of captions: the captions sorted by start
+    time, plus the running maximum of their end times. Since the running
+    maximum never decreases, the captions that may still be displayed at a
+    given time form a contiguous run found by binary search.
+    """
+
+    def __init__(self, captions):
+        self.captions = sorted(captions, key=lambda caption: caption.start)
+        self.starts = [caption.start for caption in self.captions]
+        self.max_ends = []
+        max_end = None
+        for caption in self.captions:
+            if max_end is None or caption.end > max_end:
+                max_end = caption.end
+            self.max_ends.append(max_end)
+
+    def overlapping(self, start, end, include_start):
+        if include_start:
+            hi = bisect_right(self.starts, start)
+        else:
+            hi = bisect_left(self.starts, end)
+        lo = bisect_right(self.max_ends, start, 0, hi)
+        return [
+            caption for caption in self.captions[lo:hi] if caption.end > start
+        ]
+
+
 class CaptionList(list):
     """A list of captions with a layout object attached to it"""
 
@@ -268,9 +352,89 @@ class CaptionList(list):
         :param Layout layout_info: A Layout object with the positioning info
         """
         self.layout_info = layout_info
+        self._interval_index = None
         args = [iterable] if iterable else []
         super().__init__(*args)
 
+    def active_at(self, time):
+        """
+        Return the captions displayed at the given time, i.e. those with
+        ``start <= time < end``, ordered by start time.
+
+        The lookup uses an interval index which is built on first use and
+        discarded whenever the list is modified. Changing the timing of the
+        captions in place requires calling ``invalidate_index``.
+
+        :param time: time in microseconds
+        """
+        return self._get_interval_index().overlapping(time, time, True)
+
+    def overlapping(self, start, end):
+        """
+        Return the captions displayed at some point of the [start, end)
+        window, ordered by start time.
+
+        :param start: window start in microseconds
+        :param end: window end in microseconds
+        """
+        return self._get_interval_index().overlapping(start, end, False)
+
+    def invalidate_index(self):
+        self._interval_index = None
+
+    def _get_interval_index(self):
+        if self._interval_index is None:
+            self._interval_index = _CaptionIntervalIndex(self)
+        return self._interval_index
+
+    def append(self, caption):
+        self._interval_index = None
+        super().append(caption)
+
+    def extend(self, iterable):
+        self._interval_index = None
+        super().extend(iterable)
+
+    def insert(self, index, caption):
+        self._interval_index = None
+        super().insert(index, caption)
+
+    def remove(self, caption):
+        self._interval_index = None
+        super().remove(caption)
+
+    def pop(self, *args):
+        self._interval_index = None
+        return super().pop(*args)
+
+    def clear(self):
+        self._interval_index = None
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._interval_index = None
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._interval_index = None
+        super().reverse()
+
+    def __setitem__(self, key, value):
+        self._interval_index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._interval_index = None
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self._interval_index = None
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._interval_index = None
+        return super().__imul__(other)
+
     def __getslice__(self, i, j):
         return CaptionList(list.__getslice__(self, i, j), layout_info=self.layout_info)
 
@@ -322,6 +486,9 @@ class CaptionSet:
         self.layout_info = layout_info
 
     def set_captions(self, lang, captions):
+        if isinstance(captions, CaptionList):
+            # The captions' timing may have changed since the index was built
+            captions.invalidate_index()
         self._captions[lang] = captions
 
     def get_languages(self):
@@ -364,6 +531,52 @@ class CaptionSet:
             return caption_list.layout_info
         return None
 
+    def copy_with_layout(self, transform, languages=None):
+        """
+        Return a copy-on-write copy of this caption set where the layout_info
+        of every caption and node has been replaced by
+        ``transform(layout_info)``.
+
+        Only the containers and the captions/nodes whose layout actually
+        changes are copied (shallowly); everything else is shared with this
+        caption set. This lets writers adjust positioning without altering
+        the caller's objects and without paying for a deepcopy. The returned
+        caption set must be treated as read-only except for layout_info.
+
+        :param transform: a callable receiving a Layout (or None) and
+            returning the Layout to use instead. It is called once per
+            distinct Layout instance, whose result is reused for all the
+            captions and nodes sharing it.
+        :param languages: if given, only the captions of these languages are
+            transformed (the others are still shared)
+        """
+        transform = _transform_once_per_instance(transform)
+        captions = {}
+        for lang, caption_list in self._captions.items():
+            layout_info = getattr(caption_list, "layout_info", None)
+            if languages is None or lang in languages:
+                caption_list = [
+                    _copy_caption_with_layout(caption, transform)
+                    for caption in caption_list
+                ]
+            captions[lang] = CaptionList(caption_list, layout_info=layout_info)
+        return CaptionSet(captions, dict(self._styles), self.layout_info)
+
+    def get_timing_view(self, use_numpy=None):
+        """
+        Return a columnar view over the start/end times of all the captions,
+        for bulk timing operations. Changes made through the view are only
+        written back to the captions by calling its ``apply`` method, e.g.::
+
+            timing = caption_set.get_timing_view()
+            timing.skew(24000 / 1001 / 25).offset(-10000).clamp(0).apply()
+
+        :param use_numpy: whether to use the NumPy backend. Defaults to using
+            it if it is installed.
+        :rtype: CaptionTimingView
+        """
+        return CaptionTimingView(self, use_numpy)
+
     def adjust_caption_timing(self, offset=0, rate_skew=1.0):
         """
         Adjust the timing according to offset and rate_skew.
@@ -380,6 +593,8 @@ class CaptionSet:
                 caption.end = caption.end * rate_skew + offset
                 if caption.start >= 0:
                     out_captions.append(caption)
+            if isinstance(captions, CaptionList):
+                captions.invalidate_index()
             self.set_captions(lang, out_captions)
 
     def strip_html_tags(self):
@@ -464,29 +679,18 @@ class CaptionSet:
         :param caps: CaptionList of captions to group
         :return: List of lists of captions, where each inner list contains captions with the same start time.
         """
-
-        caps_start_time = OrderedDict()
-        for i, cap in enumerate(caps):
-            if cap.start not in caps_start_time:
-                caps_start_time[cap.start] = [cap]
-            else:
-                caps_start_time[cap.start].append(cap)
-
-        # order by start timestamp
-        caps_start_time = OrderedDict(sorted(caps_start_time.items(), key=lambda item: item[0]))
-
-        # check if captions with the same start time also have the same end time
-        # fail if different end times are found - this is not (yet?) supported
+        # A single sweep over the captions sorted by start time (the sort is
+        # stable, so captions with the same start keep their relative order)
         caps_final = []
-        for start_time, caps_list in caps_start_time.items():
-            if len(caps_list) == 1:
-                caps_final.append(caps_list)
-            else:
-                end_times = list(set([c.end for c in caps_list]))
-                if len(end_times) != 1:
+        for cap in sorted(caps, key=lambda c: c.start):
+            if caps_final and caps_final[-1][0].start == cap.start:
+                # captions with the same start time must also have the same
+                # end time - this is not (yet?) supported
+                if cap.end != caps_final[-1][0].end:
                     raise ValueError("Unsupported subtitles - overlapping subtitles with different end times found")
-                else:
-                    caps_final.append(caps_list)
+                caps_final[-1].append(cap)
+            else:
+                caps_final.append([cap])
         return caps_final
 
     def make_sure_of_sane_start_times_and_gap(self, min_sub_gap_ms=250):
@@ -515,6 +719,9 @@ class CaptionSet:
                     for c in caps:
                         c.start = min(prev_caption_end + (min_sub_gap_ms * 1000), curr_caption_end)
 
+            if isinstance(_captions, CaptionList):
+                _captions.invalidate_index()
+
     def merge_captions(self, merge_layout_info=False):
         """
         Merge captions that have the same start and end time.
@@ -524,37 +731,127 @@ class CaptionSet:
             captions_raw = self.get_captions(lang)
             _captions_by_start = self._group_captions_by_start_time(captions_raw)
 
-            all_captions_with_same_time = [l for l in _captions_by_start if len(l) > 1]
-            for current_captions_with_same_time in all_captions_with_same_time:
-                nodes_to_append = [CaptionNode(CaptionNode.BREAK)]
-                for dupe_caption in current_captions_with_same_time[1:]:
-                    nodes_to_append.extend(dupe_caption.nodes)
-                    nodes_to_append.append(CaptionNode(CaptionNode.BREAK))
-                    captions_raw.remove(dupe_caption)
-
-                if len(nodes_to_append) > 0:
-                    if nodes_to_append[-1].type_ == CaptionNode.BREAK:
-                        nodes_to_append.pop()
-
-                if nodes_to_append:
-                    current_caption = current_captions_with_same_time[0]
-                    current_caption.nodes.extend(nodes_to_append)
-                    if merge_layout_info:
-                        layout_info = current_caption.layout_info
-                        if not layout_info:
-                            for node in current_caption.nodes:
-                                if node.type_ == CaptionNode.TEXT:
-                                    layout_info = node.layout_info
-                                    if layout_info:
-                                        break
-                        if not layout_info:
-                            return
-
-                        current_caption.layout_info = layout_info
-                        for node in current_captions_with_same_time[0].nodes:
-                            node.layout_info = layout_info
+            # Ids of the captions merged into another one. They are removed
+            # from the list in one go, instead of one list.remove() each.
+            merged_ids = set()
+            complete = True
+            for current_captions_with_same_time in _captions_by_start:
+                if len(current_captions_with_same_time) > 1:
+                    complete = self._merge_same_time_captions(
+                        current_captions_with_same_time, merged_ids,
+                        merge_layout_info)
+                    if not complete:
+                        break
+
+            if merged_ids:
+                captions_raw[:] = [
+                    caption for caption in captions_raw
+                    if id(caption) not in merged_ids
+                ]
+            if not complete:
+                return
+
+    @staticmethod
+    def _merge_same_time_captions(captions, merged_ids, merge_layout_info):
+        """
+        Merge the nodes of the given captions into the first one, separating
+        them with a line break, and record the ids of the merged captions.
+
+        :return: False if merge_layout_info is set but no layout info was
+            found to merge, True otherwise
+        """
+        nodes_to_append = [CaptionNode(CaptionNode.BREAK)]
+        for dupe_caption in captions[1:]:
+            nodes_to_append.extend(dupe_caption.nodes)
+            nodes_to_append.append(CaptionNode(CaptionNode.BREAK))
+            merged_ids.add(id(dupe_caption))
+
+        if nodes_to_append[-1].type_ == CaptionNode.BREAK:
+            nodes_to_append.pop()
+
+        current_caption = captions[0]
+        current_caption.nodes.extend(nodes_to_append)
+        if merge_layout_info:
+            layout_info = current_caption.layout_info
+            if not layout_info:
+                for node in current_caption.nodes:
+                    if node.type_ == CaptionNode.TEXT:
+                        layout_info = node.layout_info
+                        if layout_info:
+                            break
+            if not layout_info:
+                return False
+
+            current_caption.layout_info = layout_info
+            for node in current_caption.nodes:
+                node.layout_info = layout_info
+        return True
+
 
 # Functions
+def _transform_once_per_instance(transform):
+    """Wrap a layout transformation so that it runs once per distinct layout
+    instance; the nodes of a caption set typically share a handful of them
+    """
+    # id(layout_info) -> (layout_info, transformed layout_info), keeping the
+    # layouts alive so that their ids aren't reused
+    results = {}
+
+    def transform_once(layout_info):
+        result = results.get(id(layout_info))
+        if result is None:
+            result = results[id(layout_info)] = (
+                layout_info, transform(layout_info))
+        return result[1]
+
+    return transform_once
+
+
+def _copy_caption_with_layout(caption, transform):
+    """
+    Return ``caption`` with its layouts transformed, copying the caption and
+    its nodes only when their layout_info actually changes.
+    """
+    new_nodes = None
+    for index, node in enumerate(caption.nodes):
+        layout_info = transform(node.layout_info)
+        if layout_info is not node.layout_info:
+            if new_nodes is None:
+                new_nodes = list(caption.nodes)
+            node = copy(node)
+            node.layout_info = layout_info
+            new_nodes[index] = node
+
+    layout_info = transform(caption.layout_info)
+    if new_nodes is None and layout_info is caption.layout_info:
+        return caption
+
+    caption = copy(caption)
+    caption.layout_info = layout_info
+    if new_nodes is not None:
+        caption.nodes = new_nodes
+    return caption
+
+
+def iter_lines(fileobj, encoding="utf-8-sig"):
+    """
+    Yield the lines of a text or binary file-like object (or any iterable of
+    lines) one at a time, without their line terminators, decoding binary
+    lines with the given encoding.
+    """
+    decoder = None
+    for line in fileobj:
+        if isinstance(line, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            line = decoder.decode(line)
+        if line.endswith("\n"):
+            line = line[:-1]
+        if line.endswith("\r"):
+            line = line[:-1]
+        yield line
+
+
 def merge_concurrent_captions(caption_set):
     """Merge captions that have the same start and end times"""
     for lang in caption_set.get_languages():
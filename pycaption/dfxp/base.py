@@ -1,8 +1,8 @@
 import re
-from copy import deepcopy
 from xml.sax.saxutils import escape
 
 from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
 
 from ..base import (
     BaseReader, BaseWriter, CaptionSet, CaptionList, Caption, CaptionNode,
@@ -14,9 +14,10 @@ from ..exceptions import (
 )
 from ..geometry import (
     Point, Stretch, UnitEnum, Padding, VerticalAlignmentEnum,
-    HorizontalAlignmentEnum, Alignment, Layout,
+    HorizontalAlignmentEnum, Alignment, Layout, sharing_instances,
 )
-from ..utils import is_leaf
+from ..utils import MarkupTag, is_leaf
+from .iterparse import DFXPStreamReader, DFXPStreamingError
 
 __all__ = [
     'DFXP_BASE_MARKUP', 'DFXP_DEFAULT_STYLE', 'DFXP_DEFAULT_STYLE_ID',
@@ -66,6 +67,14 @@ MICROSECONDS_PER_UNIT = {
 
 DFXP_DEFAULT_LANGUAGE_CODE = "en"
 
+DFXP_READER_BACKENDS = ('beautifulsoup', 'lxml')
+
+# The attributes that can't change the layout of an element
+LAYOUT_IRRELEVANT_ATTRIBUTES = frozenset(
+    ('begin', 'end', 'dur', 'xml:id', 'id'))
+# The layout signature of the elements whose layout isn't cached
+UNCACHEABLE_LAYOUT = -1
+
 
 class DFXPReader(BaseReader):
     def __init__(self, *args, **kw):
@@ -80,6 +89,14 @@ class DFXPReader(BaseReader):
         indicated in the following table."""
         self.read_invalid_positioning = (
             kw.get('read_invalid_positioning', False))
+        # 'lxml' streams the document, converting the <p> tags as they are
+        # read, instead of building the whole BeautifulSoup tree first. The
+        # documents lxml can't read are read with BeautifulSoup.
+        self.backend = kw.get('backend', 'beautifulsoup')
+        if self.backend not in DFXP_READER_BACKENDS:
+            raise ValueError(
+                f"Invalid backend: {self.backend}. "
+                f"Accepted values: {', '.join(DFXP_READER_BACKENDS)}.")
         self.nodes = []
 
     def detect(self, content):
@@ -88,10 +105,19 @@ class DFXPReader(BaseReader):
         else:
             return False
 
+    @sharing_instances()
     def read(self, content):
         if not isinstance(content, str):
             raise InvalidInputError('The content is not a unicode string.')
 
+        if self.backend == 'lxml':
+            try:
+                return DFXPStreamReader(self).read(content)
+            except (etree.XMLSyntaxError, DFXPStreamingError):
+                # Not well-formed XML (e.g. unescaped '<' characters or HTML
+                # entities), which html.parser is lenient about
+                pass
+
         dfxp_document = self._get_dfxp_parser_class()(
             content, read_invalid_positioning=
             self.read_invalid_positioning)
@@ -309,6 +335,74 @@ class DFXPReader(BaseReader):
         return attrs
 
 
+# The tags of each base markup the writer started a document from, parsed
+# once, as (name, attributes, string, children) tuples
+_BASE_MARKUP_TEMPLATES = {}
+
+
+def _parse_base_markup(markup):
+    def to_template(tag):
+        string = ''.join(
+            str(child) for child in tag.children
+            if isinstance(child, NavigableString)
+        ).strip() or None
+        children = tuple(
+            to_template(child) for child in tag.children
+            if not isinstance(child, NavigableString)
+        )
+        return tag.name, dict(tag.attrs), string, children
+
+    try:
+        return _BASE_MARKUP_TEMPLATES[markup]
+    except KeyError:
+        root = BeautifulSoup(markup, 'lxml-xml').find()
+        template = _BASE_MARKUP_TEMPLATES[markup] = to_template(root)
+        return template
+
+
+class _DFXPDocument:
+    """The DFXP document being written, starting out as DFXP_BASE_MARKUP"""
+
+    def __init__(self, lang):
+        self._sections = {}
+        self.tt = self._build(_parse_base_markup(DFXP_BASE_MARKUP))
+        self.tt['xml:lang'] = lang
+        self._style_ids = set()
+
+    def _build(self, template):
+        name, attrs, string, children = template
+        tag = MarkupTag(name, **attrs)
+        tag.string = string
+        self._sections.setdefault(name, tag)
+        for child in children:
+            tag.append(self._build(child))
+        return tag
+
+    @staticmethod
+    def new_tag(name, **attrs):
+        return MarkupTag(name, **attrs)
+
+    def find(self, name):
+        """Returns the first tag of DFXP_BASE_MARKUP with the name, e.g. one
+        of the sections of the document: 'tt', 'head', 'styling', 'layout' or
+        'body'
+        """
+        return self._sections.get(name)
+
+    def add_style(self, style):
+        """Append a <style> tag to the <styling> section"""
+        self._sections['styling'].append(style)
+        self._style_ids.add(style.attrs.get('xml:id'))
+
+    def has_style(self, style_id):
+        return style_id in self._style_ids
+
+    def prettify(self):
+        pieces = ['<?xml version="1.0" encoding="utf-8"?>\n']
+        self.tt.serialize(pieces)
+        return ''.join(pieces)
+
+
 class DFXPWriter(BaseWriter):
     def __init__(self, *args, **kwargs):
         self.write_inline_positioning = kwargs.pop(
@@ -327,26 +421,18 @@ class DFXPWriter(BaseWriter):
 
         :rtype: str
         """
-        dfxp = BeautifulSoup(DFXP_BASE_MARKUP, 'lxml-xml')
-
         langs = caption_set.get_languages()
         if force in langs:
             langs = [force]
-            dfxp.find('tt')['xml:lang'] = force
+            dfxp = _DFXPDocument(force)
         else:
-            dfxp.find('tt')['xml:lang'] = DFXP_DEFAULT_LANGUAGE_CODE
-
-        caption_set = deepcopy(caption_set)
+            dfxp = _DFXPDocument(DFXP_DEFAULT_LANGUAGE_CODE)
 
-        # Loop through all captions/nodes and apply transformations to layout
-        # in function of the provided or default settings
-        for lang in langs:
-            for caption in caption_set.get_captions(lang):
-                caption.layout_info = self._relativize_and_fit_to_screen(
-                    caption.layout_info)
-                for node in caption.nodes:
-                    node.layout_info = self._relativize_and_fit_to_screen(
-                        node.layout_info)
+        # Apply transformations to the layout of all captions/nodes in
+        # function of the provided or default settings, without altering the
+        # caller's caption set
+        caption_set = caption_set.copy_with_layout(
+            self._relativize_and_fit_to_screen, langs)
 
         # Create the styles in the <styling> section, or a default style.
         for style_id, style in caption_set.get_styles():
@@ -380,8 +466,7 @@ class DFXPWriter(BaseWriter):
 
             body.append(div)
         self.region_creator.cleanup_regions()
-        caption_content = dfxp.prettify(formatter=None)
-        return caption_content
+        return dfxp.prettify()
 
     @staticmethod
     def _get_region_creator_class():
@@ -411,17 +496,12 @@ class DFXPWriter(BaseWriter):
                 tag.attrs.update(attribs)
 
     def _recreate_styling_tag(self, style, content, dfxp):
-        # TODO - should be drastically simplified: if attributes : append
-        dfxp_style = dfxp.new_tag('style')
-        dfxp_style.attrs.update({'xml:id': style})
-
         attributes = _recreate_style(content, dfxp)
-        dfxp_style.attrs.update(attributes)
-
-        new_tag = dfxp.new_tag('style')
-        new_tag.attrs.update({'xml:id': style})
-        if dfxp_style != new_tag:
-            dfxp.find('styling').append(dfxp_style)
+        if attributes:
+            dfxp_style = dfxp.new_tag('style')
+            dfxp_style.attrs.update({'xml:id': style})
+            dfxp_style.attrs.update(attributes)
+            dfxp.add_style(dfxp_style)
 
         return dfxp
 
@@ -432,7 +512,7 @@ class DFXPWriter(BaseWriter):
         p = dfxp.new_tag("p", begin=start, end=end)
         p.string = self._recreate_text(caption, dfxp, caption_set, lang)
 
-        if dfxp.find("style", {"xml:id": "p"}):
+        if dfxp.has_style('p'):
             p['style'] = 'p'
 
         p.attrs.update(_recreate_style(caption_style, dfxp))
@@ -562,11 +642,26 @@ class LayoutAwareDFXPParser(BeautifulSoup):
             markup, features, builder, parse_only, from_encoding, **kwargs)
 
         self.read_invalid_positioning = read_invalid_positioning
+        self.id_index = DFXPIdIndex(self)
+        # The layouts resolved so far, by region id and layout signature
+        self._layouts = {}
+        self._layout_signatures = {}
 
         for div in self.find_all('div'):
-            self._pre_order_visit(div)
-
-    def _pre_order_visit(self, element, inherit_from=None):
+            parent_signature = None
+            for parent in reversed(list(div.parents)):
+                parent_signature = self._get_layout_signature(
+                    parent, parent_signature, self._layout_signatures)
+            descendant_region_ids = {}
+            self._collect_descendant_region_ids(div, descendant_region_ids)
+            self._pre_order_visit(
+                div, parent_signature=parent_signature,
+                ancestor_region_id=self._get_region_from_ancestors(div),
+                descendant_region_ids=descendant_region_ids)
+
+    def _pre_order_visit(self, element, inherit_from=None,
+                         parent_signature=None, ancestor_region_id=None,
+                         descendant_region_ids=None):
         """Process the xml tree elements in pre order by adding a .layout_info
         attribute to each of them.
 
@@ -576,20 +671,80 @@ class LayoutAwareDFXPParser(BeautifulSoup):
         :param element: a BeautifulSoup Tag or NavigableString.
         :param inherit_from: a Layout object with all the layout info
                 inherited from the ancestors of the present node
+        :param parent_signature: the layout signature of the parent of the
+                present node (see _get_layout_signature)
+        :param ancestor_region_id: the region of the nearest ancestor of the
+                present node that has one
+        :param descendant_region_ids: the region ids of the descendants of
+                every node, as gathered by _collect_descendant_region_ids.
+                If missing, the region is looked up in the tree for every
+                node.
         """
         if is_leaf(element):
             # The element is a leaf (e.g. NavigableString or <br>)
             element.layout_info = inherit_from
         else:
-            region_id = self._determine_region_id(element)
-            # TODO - this looks highly cachable. If it turns out too much
-            # memory is being taken up by the caption set, cache this with a
-            # WeakValueDict
-            layout_info = (
-                self._extract_positioning_information(region_id, element))
+            if descendant_region_ids is None:
+                region_id = self._determine_region_id(element)
+            else:
+                region_id = self._resolve_region_id(
+                    element.get('region'), ancestor_region_id,
+                    descendant_region_ids[id(element)])
+            signature = self._get_layout_signature(
+                element, parent_signature, self._layout_signatures)
+            layout_info = self._get_cached_layout(
+                self._layouts, region_id, signature,
+                self._extract_positioning_information, element)
             element.layout_info = layout_info
+            ancestor_region_id = element.get('region') or ancestor_region_id
             for child in element.contents:
-                self._pre_order_visit(child, inherit_from=layout_info)
+                self._pre_order_visit(
+                    child, inherit_from=layout_info,
+                    parent_signature=signature,
+                    ancestor_region_id=ancestor_region_id,
+                    descendant_region_ids=descendant_region_ids)
+
+    @classmethod
+    def _get_layout_signature(cls, element, parent_signature, signatures):
+        """Identifies the attributes the layout of an element is determined
+        from: its own and those of its ancestors, except for the timing and
+        the ids, which are different on every <p>. Elements with the same
+        signature and region have the same layout.
+
+        :param element: a BeautifulSoup Tag
+        :param parent_signature: the signature of the element's parent, None
+            for the root of the document
+        :param signatures: the signatures known so far, which are numbered
+            so they don't grow with the depth of the tree
+        :return: an int, UNCACHEABLE_LAYOUT if the layout can't be cached
+            (the element or an ancestor has nested <style> tags)
+        """
+        if parent_signature is UNCACHEABLE_LAYOUT:
+            return UNCACHEABLE_LAYOUT
+        if element.name not in ('div', 'body', 'tt') and any(
+                getattr(child, 'name', None) == 'style'
+                for child in element.contents):
+            return UNCACHEABLE_LAYOUT
+        attributes = tuple(sorted(
+            (name, value) for name, value in element.attrs.items()
+            if name not in LAYOUT_IRRELEVANT_ATTRIBUTES
+        ))
+        return signatures.setdefault(
+            (parent_signature, element.name, attributes), len(signatures))
+
+    @staticmethod
+    def _get_cached_layout(layouts, region_id, signature, extract, element):
+        """Return the layout of the element from the cache, or extract and
+        cache it
+        """
+        if signature is UNCACHEABLE_LAYOUT:
+            return extract(region_id, element)
+        key = (region_id, signature)
+        try:
+            return layouts[key]
+        except KeyError:
+            layout_info = layouts[key] = extract(region_id, element)
+            return layout_info
 
     @staticmethod
     def _get_region_from_ancestors(element):
@@ -655,6 +810,51 @@ class LayoutAwareDFXPParser(BeautifulSoup):
 
         return region_id
 
+    @staticmethod
+    def _resolve_region_id(region_id, ancestor_region_id,
+                           descendant_region_ids):
+        """Same as _determine_region_id, from the region ids of the element
+        and its relatives, gathered beforehand
+
+        :param region_id: the region attribute of the element
+        :param ancestor_region_id: the region of the nearest ancestor that
+            has one
+        :param descendant_region_ids: the set of the region attributes of all
+            the element's descendants
+        """
+        if not region_id:
+            region_id = ancestor_region_id
+
+        if not region_id:
+            if len(descendant_region_ids) > 1:
+                return
+            if descendant_region_ids:
+                region_id = next(iter(descendant_region_ids))
+
+        return region_id
+
+    @classmethod
+    def _collect_descendant_region_ids(cls, element, region_ids_by_element):
+        """Gather, in a single bottom-up pass, the region attributes of the
+        descendants of the element and of every one of its descendants.
+
+        :param element: a BeautifulSoup Tag
+        :param region_ids_by_element: dict to fill with a set of region ids
+            for every tag, by id()
+        :return: the region ids of the element's descendants
+        :rtype: set
+        """
+        region_ids = set()
+        for child in element.contents:
+            if getattr(child, 'name', None) is None:
+                # NavigableString
+                continue
+            region_ids.add(child.get('region'))
+            region_ids |= cls._collect_descendant_region_ids(
+                child, region_ids_by_element)
+        region_ids_by_element[id(element)] = region_ids
+        return region_ids
+
     def _extract_positioning_information(self, region_id, element):
         """Returns a Layout object that describes the element's positioning
         information
@@ -669,7 +869,7 @@ class LayoutAwareDFXPParser(BeautifulSoup):
         region_tag = None
 
         if region_id is not None:
-            region_tag = self.find('region', {'xml:id': region_id})
+            region_tag = self.id_index.regions.get(region_id)
 
         region_scraper = self._get_layout_info_scraper_class()(self, region_tag)
 
@@ -679,7 +879,7 @@ class LayoutAwareDFXPParser(BeautifulSoup):
 
         if layout_info and any(layout_info):
             # layout_info contains information?
-            return self._get_layout_class()(*layout_info)
+            return self._get_layout_class().intern(*layout_info)
         else:
             # layout_info doesn't contain any information
             return self.NO_POSITIONING_INFO
@@ -695,6 +895,35 @@ class LayoutAwareDFXPParser(BeautifulSoup):
         return Layout
 
 
+class DFXPIdIndex:
+    """Finds the tags of a DFXP document the layout is determined from (the
+    <region> and <style> tags, by their xml:id) without searching the whole
+    document every time.
+    """
+
+    def __init__(self, document):
+        """
+        :param document: the BeautifulSoup document instance
+        """
+        self.styling_section = document.find('styling')
+        self.root_element = document.find('tt')
+        self.regions = {}
+        for region in document.find_all('region'):
+            self.regions.setdefault(region.get('xml:id'), region)
+        self.styles = {}
+        if self.styling_section:
+            for style in self.styling_section.find_all('style'):
+                self.styles.setdefault(style.get('xml:id'), []).append(style)
+
+    def find_styles(self, style_id):
+        """Returns the styles of the <styling> section with the given xml:id
+        (normally only one), in document order
+
+        :rtype: list
+        """
+        return self.styles.get(style_id, [])
+
+
 class LayoutInfoScraper:
     """Encapsulates the methods for determining the layout information about
     an element (with the element's region playing an important role).
@@ -707,16 +936,18 @@ class LayoutInfoScraper:
         :param region: the region tag
         """
         self.region = region
-        self._styling_section = document.findChild('styling')
+        # BeautifulSoup documents return None for unknown attributes
+        self._index = (getattr(document, 'id_index', None)
+                       or DFXPIdIndex(document))
+        self._styling_section = self._index.styling_section
         if region:
-            self.region_styles = self._get_style_sources(
-                self._styling_section, region)
+            self.region_styles = self._get_style_sources(self._index, region)
         else:
             self.region_styles = []
-        self.root_element = document.find('tt')
+        self.root_element = self._index.root_element
 
     @classmethod
-    def _get_style_sources(cls, styling_section, element):
+    def _get_style_sources(cls, index, element):
         """Returns a list, containing  tags, in the order they should be
         evaluated, for determining layout information.
 
@@ -751,51 +982,48 @@ class LayoutInfoScraper:
             for style in element.contents:
                 if getattr(style, 'name', None) == 'style':
                     nested_styles.extend(
-                        cls._get_style_reference_chain(style, styling_section)
+                        cls._get_style_reference_chain(style, index)
                     )
 
         referenced_style_id = element.get('style')
 
         referenced_styles = []
-        if referenced_style_id and styling_section:
-            referenced_style = styling_section.findChild(
-                'style', {'xml:id': referenced_style_id}
-            )
+        if referenced_style_id and index.styling_section:
+            referenced_style = next(
+                iter(index.find_styles(referenced_style_id)), None)
 
             referenced_styles = cls._get_style_reference_chain(
-                referenced_style, styling_section
+                referenced_style, index
             )
         return nested_styles + referenced_styles
 
     @classmethod
-    def _get_style_reference_chain(cls, style, styling_tag):
+    def _get_style_reference_chain(cls, style, index):
         """If style s1 references s2, and s3 -> s4 -> s5 -> ... -> sn,
         if called with s1, this returns [s1, s2, ... sn] (supposing all the
         styles are defined in the styling section, or stops at the last found
         style)
 
         :param style: a style tag, that might refer another style
-        :param styling_tag: The tag representing the '<styling>' section of the
-            dfxp document
+        :param index: the DFXPIdIndex of the dfxp document, which knows the
+            styles of its '<styling>' section
         """
         if not style:
             return []
 
         result = [style]
 
-        if not styling_tag:
+        if not index.styling_section:
             return result
 
         reference = style.get('style')
 
         if reference:
-            referenced_styles = styling_tag.findChildren(
-                'style', {'xml:id': reference}
-            )
+            referenced_styles = index.find_styles(reference)
 
             if len(referenced_styles) == 1:
                 return result + cls._get_style_reference_chain(
-                    referenced_styles[0], styling_tag
+                    referenced_styles[0], index
                 )
             elif len(referenced_styles) > 1:
                 raise CaptionReadSyntaxError(
@@ -886,8 +1114,7 @@ class LayoutInfoScraper:
         )
         if value is None:
             # Does a referenced style of the element have it?
-            for style in self._get_style_sources(
-                    self._styling_section, element):
+            for style in self._get_style_sources(self._index, element):
                 value = _get_object_from_attribute(
                     style, attribute_name, factory, ignore, ignorecase
                 )
@@ -988,7 +1215,7 @@ class RegionCreator:
 
     def __init__(self, dfxp, caption_set):
         """
-        :type dfxp: BeautifulSoup
+        :param dfxp: the document being written by the DFXPWriter
         :type caption_set: CaptionSet
         """
         self._dfxp = dfxp
@@ -1040,7 +1267,7 @@ class RegionCreator:
 
         :param unique_layouts: an iterable (unique!) geometry.Layout instances,
             describing the properties to be added to the dfxp regions
-        :type dfxp: BeautifulSoup
+        :param dfxp: the document being written by the DFXPWriter
         :param id_factory: A callable which generates unique IDs
         :return: a dict, mapping each unique layout to the ID of the region
             created for it
@@ -1148,23 +1375,17 @@ class RegionCreator:
     def cleanup_regions(self):
         """Remove the unused regions from the output file"""
         layout_tag = self._dfxp.find('layout')
-        if not layout_tag:
-            return
-
-        regions = layout_tag.findChildren('region')
-        if not regions:
-            return
-
-        for region in regions:
-            if region.attrs.get('xml:id') not in self._assigned_region_ids:
-                region.extract()
+        layout_tag.contents = [
+            region for region in layout_tag.contents
+            if region.attrs.get('xml:id') in self._assigned_region_ids
+        ]
 
 
 def _recreate_style(content, dfxp):
     dfxp_style = {}
 
     if 'class' in content:
-        if dfxp.find("style", {"xml:id": content['class']}):
+        if dfxp.has_style(content['class']):
             dfxp_style['style'] = content['class']
     if 'text-align' in content:
         dfxp_style['tts:textAlign'] = content['text-align']
@@ -1345,18 +1566,29 @@ def _convert_layout_to_attributes(layout):
     return result
 
 
-class _OrderedSet(list):
-    """Quick implementation of a set that tracks the order. If this is a
-    performance bottleneck, replace it with some other implementation.
+class _OrderedSet:
+    """Quick implementation of a set that tracks the order, on top of a dict
+    (which keeps the insertion order)
     """
 
+    def __init__(self):
+        self._items = {}
+
     def add(self, p_object):
-        if p_object not in self:
-            super().append(p_object)
+        self._items.setdefault(p_object, None)
 
     def discard(self, value):
-        if value in self:
-            super().remove(value)
+        self._items.pop(value, None)
+
+    def __contains__(self, value):
+        return value in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
 
 class DFXPReaderNewLineFix(DFXPReader):
     def _translate_tag(self, tag):
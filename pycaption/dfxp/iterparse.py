@@ -0,0 +1,433 @@
+"""
+Streaming DFXP reading, built on the pull parser of lxml.
+
+The <p> tags are converted to captions as soon as the parser has read them,
+and are then removed from the tree, so the memory used doesn't grow with the
+size of the document. The elements are exposed to the layout code (the
+LayoutInfoScraper) through the subset of the BeautifulSoup Tag API it uses,
+with the tag and attribute names reported like html.parser reports them, so
+that the captions read are the same as the ones read by the BeautifulSoup
+based DFXPReader.
+"""
+import re
+
+from lxml import etree
+
+from ..base import (
+    Caption, CaptionList, CaptionNode, CaptionSet, DEFAULT_LANGUAGE_CODE,
+)
+from ..exceptions import CaptionReadNoCaptions
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# strips indentation whitespace only
+TEXT_PATTERN = re.compile("^(?:[\n\r]+\\s*)?(.+)")
+
+# The whitespace BeautifulSoup collapses, in strings made only of it
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+CHUNK_SIZE = 64 * 1024
+
+
+class DFXPStreamingError(Exception):
+    """The document can't be read by streaming it (e.g. the <styling> or
+    <region> tags come after the captions). Read it all at once instead.
+    """
+
+
+class _XMLTag:
+    """An lxml element, seen through the BeautifulSoup Tag API"""
+    __slots__ = ('_document', 'element', 'name', 'attrs', 'layout_info',
+                 'layout_signature')
+
+    def __init__(self, document, element):
+        self._document = document
+        self.element = element
+        self.name = _get_name(element)
+        self.attrs = _get_attributes(element)
+        self.layout_info = None
+        self.layout_signature = None
+
+    def __str__(self):
+        return etree.tostring(self.element, encoding="unicode",
+                              with_tail=False)
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key):
+        return key in self.attrs
+
+    @property
+    def parent(self):
+        parent = self.element.getparent()
+        if parent is None:
+            return None
+        return self._document.get_tag(parent)
+
+    @property
+    def parents(self):
+        for parent in self.element.iterancestors():
+            yield self._document.get_tag(parent)
+
+    @property
+    def contents(self):
+        get_tag = self._document.get_tag
+        return [get_tag(child) for child in self.element
+                if isinstance(child.tag, str)]
+
+    def findChildren(self, name=None, attrs=None):
+        get_tag = self._document.get_tag
+        return [
+            tag for tag in (
+                get_tag(descendant)
+                for descendant in self.element.iterdescendants()
+                if isinstance(descendant.tag, str)
+            )
+            if _matches(tag, name, attrs)
+        ]
+
+    findAll = find_all = findChildren
+
+    def findChild(self, name=None, attrs=None):
+        children = self.findChildren(name, attrs)
+        return children[0] if children else None
+
+    find = findChild
+
+
+class _XMLDocument:
+    """The document being streamed. It is its own DFXPIdIndex: the
+    LayoutInfoScraper finds the <tt>, <styling>, <region> and <style> tags
+    the layout is determined from in it.
+    """
+
+    def __init__(self):
+        self._tags = {}
+        self.root_element = None
+        self.styling_section = None
+        self.regions = {}
+        self.styles = {}
+
+    @property
+    def id_index(self):
+        return self
+
+    def find_styles(self, style_id):
+        return self.styles.get(style_id, [])
+
+    def get_tag(self, element):
+        tag = self._tags.get(element)
+        if tag is None:
+            tag = self._tags[element] = _XMLTag(self, element)
+        return tag
+
+    def forget(self, element):
+        """Drop the tags of the element and of its descendants"""
+        for descendant in element.iter():
+            self._tags.pop(descendant, None)
+
+
+def _get_name(element):
+    tag = element.tag
+    if not isinstance(tag, str):
+        return None
+    name = tag.rpartition('}')[2]
+    if element.prefix:
+        name = f"{element.prefix}:{name}"
+    return name.lower()
+
+
+def _get_attributes(element):
+    attrs = {}
+    for key, value in element.attrib.items():
+        if key[0] == '{':
+            namespace, _, key = key[1:].partition('}')
+            if namespace == XML_NAMESPACE:
+                key = f"xml:{key}"
+            else:
+                prefix = next(
+                    (prefix for prefix, uri in element.nsmap.items()
+                     if uri == namespace and prefix), None)
+                if prefix:
+                    key = f"{prefix}:{key}"
+        attrs[key.lower()] = value
+    return attrs
+
+
+def _matches(tag, name, attrs):
+    if name is not None and tag.name != name:
+        return False
+    if attrs:
+        return all(tag.get(key) == value for key, value in attrs.items())
+    return True
+
+
+class _DivCaptions:
+    """The captions of a <div>, and the regions of its descendants"""
+    __slots__ = ('tag', 'captions', 'region_ids')
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.captions = []
+        self.region_ids = set()
+
+
+class DFXPStreamReader:
+    """Reads a DFXP document with lxml's pull parser, converting and
+    releasing every <p> tag as soon as it has been read.
+
+    The conversion of the tags (timing, styles) is delegated to a DFXPReader,
+    and the layout is determined with the classes provided by its DFXP parser
+    class, so both read the same captions.
+    """
+
+    def __init__(self, reader, chunk_size=CHUNK_SIZE):
+        """
+        :type reader: pycaption.dfxp.base.DFXPReader
+        :param chunk_size: the number of characters fed to the parser at once
+        """
+        self.reader = reader
+        self.chunk_size = chunk_size
+        parser_class = self._parser_class = reader._get_dfxp_parser_class()
+        self._no_positioning_info = parser_class.NO_POSITIONING_INFO
+        self._scraper_class = parser_class._get_layout_info_scraper_class()
+        self._layout_class = parser_class._get_layout_class()
+
+    def read(self, content):
+        """
+        :type content: str
+        :rtype: pycaption.base.CaptionSet
+        :raises lxml.etree.XMLSyntaxError: if the content isn't well-formed
+            XML
+        :raises DFXPStreamingError: if the content can't be streamed
+        """
+        self._document = _XMLDocument()
+        self._default_language = DEFAULT_LANGUAGE_CODE
+        self._open_divs = []
+        self._p_depth = 0
+        self._read_captions = False
+        self._divs = {}
+        self._styles = {}
+        # The layouts resolved so far, by region id and layout signature
+        self._layouts = {}
+        self._layout_signatures = {}
+
+        parser = etree.XMLPullParser(
+            events=('start', 'end'), huge_tree=True)
+        # The XML declaration must be at the very start of the document
+        content = content.lstrip()
+        for start in range(0, len(content), self.chunk_size):
+            parser.feed(content[start:start + self.chunk_size])
+            self._handle_events(parser.read_events())
+        parser.close()
+        self._handle_events(parser.read_events())
+
+        caption_set = CaptionSet(
+            {lang: CaptionList(div.captions, div.tag.layout_info)
+             for lang, div in self._divs.items()},
+            styles=self._styles
+        )
+        if caption_set.is_empty():
+            raise CaptionReadNoCaptions("empty caption file")
+
+        return caption_set
+
+    def _handle_events(self, events):
+        for event, element in events:
+            if not isinstance(element.tag, str):
+                continue
+            if event == 'start':
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _start(self, element):
+        tag = self._document.get_tag(element)
+        name = tag.name
+        if name in ('tt', 'styling', 'region') and self._read_captions:
+            raise DFXPStreamingError(f"<{name}> found after the captions")
+        if name == 'tt' and self._document.root_element is None:
+            self._document.root_element = tag
+            self._default_language = tag.get(
+                'xml:lang', DEFAULT_LANGUAGE_CODE)
+        elif name == 'styling' and self._document.styling_section is None:
+            self._document.styling_section = tag
+        elif name == 'p':
+            self._p_depth += 1
+        elif name == 'div':
+            div = _DivCaptions(tag)
+            self._open_divs.append(div)
+            # Each div represents all the captions for a single language.
+            self._divs[tag.get('xml:lang', self._default_language)] = div
+
+    def _end(self, element):
+        document = self._document
+        tag = document.get_tag(element)
+        name = tag.name
+
+        if name == 'div':
+            div = self._open_divs.pop()
+            tag.layout_info = self._get_layout(
+                tag, self._parser_class._resolve_region_id(
+                    tag.get('region'),
+                    self._parser_class._get_region_from_ancestors(tag),
+                    div.region_ids))
+        if self._open_divs:
+            region_id = tag.get('region')
+            for div in self._open_divs:
+                div.region_ids.add(region_id)
+
+        if name == 'p':
+            self._p_depth -= 1
+            if not self._open_divs:
+                return
+            if ''.join(element.itertext()).strip():
+                caption = self._convert_p_tag_to_caption(tag)
+                for div in self._open_divs:
+                    div.captions.append(caption)
+                self._read_captions = True
+            # A <p> nested in another one is converted with its parent too
+            if not self._p_depth:
+                self._release(element)
+        elif name == 'div':
+            self._release(element)
+        elif name == 'region':
+            document.regions.setdefault(tag.get('xml:id'), tag)
+        elif name == 'style':
+            styling_section = document.styling_section
+            if styling_section is not None and any(
+                    parent is styling_section.element
+                    for parent in element.iterancestors()):
+                document.styles.setdefault(tag.get('xml:id'), []).append(tag)
+            id_ = tag.get('xml:id') or tag.get('id')
+            # Don't create document styles for those styles that are
+            # descendants of <region> tags. See link:
+            # http://www.w3.org/TR/ttaf1-dfxp/#styling-vocabulary-style
+            if id_ and 'region' not in [
+                    parent_.name for parent_ in tag.parents]:
+                self._styles[id_] = self.reader._convert_style(tag)
+
+    def _release(self, element):
+        """Remove the element's descendants and its preceding siblings from
+        the tree, they've been converted already
+        """
+        document = self._document
+        for child in element:
+            document.forget(child)
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                document.forget(parent[0])
+                del parent[0]
+
+    def _convert_p_tag_to_caption(self, p_tag):
+        start, end = self.reader._find_and_convert_times(p_tag)
+        descendant_region_ids = {}
+        self._parser_class._collect_descendant_region_ids(
+            p_tag, descendant_region_ids)
+        self._resolve_layouts(
+            p_tag, self._parser_class._get_region_from_ancestors(p_tag),
+            descendant_region_ids)
+        nodes = []
+        self._convert_tag_to_nodes(p_tag, nodes)
+        styles = self.reader._convert_style(p_tag)
+
+        if nodes:
+            return Caption(
+                start, end, nodes, style=styles, layout_info=p_tag.layout_info)
+        return None
+
+    def _convert_tag_to_nodes(self, tag, nodes):
+        layout_info = tag.layout_info
+        if tag.name == 'span':
+            args = self.reader._convert_style(tag)
+            nodes.append(CaptionNode.create_style(
+                True, args, layout_info=layout_info))
+            self._convert_contents_to_nodes(tag, nodes, layout_info)
+            nodes.append(CaptionNode.create_style(
+                False, args, layout_info=layout_info))
+        else:
+            self._convert_contents_to_nodes(tag, nodes, layout_info)
+
+    def _convert_contents_to_nodes(self, tag, nodes, layout_info):
+        """Convert the text and the children of the tag; the text and the
+        line breaks inherit the tag's layout
+        """
+        element = tag.element
+        self._convert_text_to_node(element.text, nodes, layout_info)
+        for child in element:
+            if isinstance(child.tag, str):
+                child_tag = self._document.get_tag(child)
+                if child_tag.name == 'br':
+                    nodes.append(
+                        CaptionNode.create_break(layout_info=layout_info))
+                else:
+                    self._convert_tag_to_nodes(child_tag, nodes)
+            elif child.tag is etree.Comment:
+                # html.parser keeps comments as strings of their parent
+                self._convert_text_to_node(child.text, nodes, layout_info)
+            self._convert_text_to_node(child.tail, nodes, layout_info)
+
+    @staticmethod
+    def _convert_text_to_node(text, nodes, layout_info):
+        if not text:
+            return
+        if not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        result = TEXT_PATTERN.search(text)
+        if result:
+            nodes.append(CaptionNode.create_text(
+                result.groups()[0], layout_info=layout_info))
+
+    def _resolve_layouts(self, tag, ancestor_region_id,
+                         descendant_region_ids):
+        """Set the .layout_info of the tag and of its descendants, in pre
+        order (see LayoutAwareDFXPParser._pre_order_visit)
+
+        :param ancestor_region_id: the region of the nearest ancestor of the
+            tag that has one
+        :param descendant_region_ids: the region ids of the descendants of
+            every tag, by id()
+        """
+        tag.layout_info = self._get_layout(
+            tag, self._parser_class._resolve_region_id(
+                tag.get('region'), ancestor_region_id,
+                descendant_region_ids[id(tag)]))
+        ancestor_region_id = tag.get('region') or ancestor_region_id
+        for child in tag.contents:
+            if child.name != 'br':
+                self._resolve_layouts(
+                    child, ancestor_region_id, descendant_region_ids)
+
+    def _get_layout(self, tag, region_id):
+        return self._parser_class._get_cached_layout(
+            self._layouts, region_id, self._get_layout_signature(tag),
+            self._extract_positioning_information, tag)
+
+    def _get_layout_signature(self, tag):
+        if tag.layout_signature is None:
+            parent = tag.parent
+            parent_signature = (
+                None if parent is None
+                else self._get_layout_signature(parent))
+            tag.layout_signature = self._parser_class._get_layout_signature(
+                tag, parent_signature, self._layout_signatures)
+        return tag.layout_signature
+
+    def _extract_positioning_information(self, region_id, tag):
+        region_tag = None
+        if region_id is not None:
+            region_tag = self._document.regions.get(region_id)
+
+        region_scraper = self._scraper_class(self._document, region_tag)
+        layout_info = region_scraper.scrape_positioning_info(
+            tag, self.reader.read_invalid_positioning)
+
+        if layout_info and any(layout_info):
+            return self._layout_class.intern(*layout_info)
+        return self._no_positioning_info
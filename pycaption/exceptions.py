@@ -43,6 +43,13 @@ class CaptionLineLengthError(CaptionReadError):
     """
 
 
+class CaptionLineLengthWarning(UserWarning):
+    """
+    Warning issued instead of CaptionLineLengthError when the reader was asked
+    to only warn about lines longer than 32 characters.
+    """
+
+
 class CaptionRendererError(Exception):
     """
     Error raised when caption content cannot be rendered correctly,
@@ -8,10 +8,51 @@ CONVENTIONS:
   necessary modifications.
 """
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 
 from .exceptions import RelativizationError, CaptionReadSyntaxError
 
+# The instances returned by the interning methods (Size.from_string,
+# Layout.intern etc.) in the current sharing_instances() block, by key
+_shared_instances = ContextVar('shared_instances', default=None)
+
+
+@contextmanager
+def sharing_instances(instances=None):
+    """Makes the interning methods (Size.from_string, Layout.intern etc.)
+    share the instances created with the same arguments within the block,
+    which readers use for the length of a single read. Outside of such a
+    block every call returns a new instance, so the objects of unrelated
+    documents can be modified independently.
+
+    Can also be used as a decorator.
+
+    :type instances: dict | None
+    :param instances: the instances to share, filled while in the block,
+        so that several blocks can share them (a new dict by default)
+    """
+    token = _shared_instances.set({} if instances is None else instances)
+    try:
+        yield
+    finally:
+        _shared_instances.reset(token)
+
+
+def _intern(key, create):
+    """Returns the instance shared under the key, after creating it with
+    create() if there is none
+    """
+    instances = _shared_instances.get()
+    if instances is None:
+        return create()
+    instance = instances.get(key)
+    if instance is None:
+        instance = create()
+        instances[key] = instance
+    return instance
+
 
 class UnitEnum(Enum):
     """Enumeration-like object, specifying the units of measure for length
@@ -29,6 +70,11 @@ class UnitEnum(Enum):
     PT = 'pt'
 
 
+SIZE_PATTERN = re.compile(
+    r"^(((?P<value>\d+(\.\d+)?)(?P<unit>"
+    fr"{'|'.join([unit.value for unit in UnitEnum])}))|0)$")
+
+
 class VerticalAlignmentEnum(Enum):
     """Enumeration object, specifying the allowed vertical alignment options
 
@@ -117,14 +163,20 @@ class TwoDimensionalObject:
     """Adds a couple useful methods to its subclasses, nothing fancy."""
 
     @classmethod
-    # TODO - highly cachable. Should use WeakValueDictionary here to return
-    # flyweights, not new objects.
     def from_xml_attribute(cls, attribute):
         """Instantiate the class from a value of the type "4px" or "5%"
         or any number concatenated with a measuring unit (member of UnitEnum)
 
+        Returns the same instance for the same attribute within a
+        sharing_instances() block.
+
         :type attribute: str
         """
+        return _intern((cls, attribute),
+                       lambda: cls._from_xml_attribute(attribute))
+
+    @classmethod
+    def _from_xml_attribute(cls, attribute):
         horizontal, vertical = attribute.split(' ')
         horizontal = Size.from_string(horizontal)
         vertical = Size.from_string(vertical)
@@ -492,20 +544,22 @@ class Size:
         return Size(value, unit)
 
     @classmethod
-    # TODO - this also looks highly cachable. Should use a WeakValueDict here
-    # to return flyweights
     def from_string(cls, string):
         """Given a string of the form "46px" or "5%" etc., returns the proper
         size object
 
+        Returns the same instance for the same string within a
+        sharing_instances() block.
+
         :param string: a number concatenated to any of the UnitEnum members.
         :type string: str
         :rtype: Size
         """
-        size_pattern = re.compile(
-            r"^(((?P<value>\d+(\.\d+)?)(?P<unit>"
-            fr"{'|'.join([unit.value for unit in UnitEnum])}))|0)$")
-        match = size_pattern.search(string)
+        return _intern((cls, string), lambda: cls._from_string(string))
+
+    @classmethod
+    def _from_string(cls, string):
+        match = SIZE_PATTERN.search(string)
         if not match:
             raise CaptionReadSyntaxError(
                 f"Invalid size: {string}. Please make sure the provided value "
@@ -555,7 +609,7 @@ class Size:
         )
 
     def __bool__(self):
-        return self.unit in UnitEnum and self.value is not None
+        return isinstance(self.unit, UnitEnum) and self.value is not None
 
 
 class Padding:
@@ -588,7 +642,10 @@ class Padding:
 
     @classmethod
     def from_xml_attribute(cls, attribute):
-        """As per the docs, the style attribute can contain 1,2,3 or 4 values.
+        """Returns the same instance for the same attribute within a
+        sharing_instances() block.
+
+        As per the docs, the style attribute can contain 1,2,3 or 4 values.
 
         If 1 value: apply to all edges
         If 2: first applies to before and after, second to start and end
@@ -600,6 +657,11 @@ class Padding:
         :param attribute: a string like object, representing a dfxp attr. value
         :return: a Padding object
         """
+        return _intern((cls, attribute),
+                       lambda: cls._from_xml_attribute(attribute))
+
+    @classmethod
+    def _from_xml_attribute(cls, attribute):
         values_list = attribute.split(' ')
         sizes = []
 
@@ -757,6 +819,19 @@ class Layout:
                 if not attr:
                     setattr(self, attr_name, getattr(inherit_from, attr_name))
 
+    @classmethod
+    def intern(cls, *args, **kwargs):
+        """Same as instantiating the class, but within a sharing_instances()
+        block returns the instance already created with the same settings,
+        if there is one. Readers use it so that the many elements of a
+        document positioned the same way share a single Layout.
+        """
+        layout = cls(*args, **kwargs)
+        key = (cls, layout.origin, layout.extent, layout.padding,
+               layout.alignment, layout.webvtt_positioning,
+               layout.center_horizontal)
+        return _intern(key, lambda: layout)
+
     def __bool__(self):
         return any([
             self.origin, self.extent, self.padding, self.alignment,
@@ -1,5 +1,5 @@
 import re
-from copy import deepcopy
+from io import StringIO
 
 from .base import (
     BaseReader, BaseWriter, CaptionSet, CaptionList, Caption, CaptionNode,
@@ -72,27 +72,21 @@ class MicroDVDReader(BaseReader):
 
 class MicroDVDWriter(BaseWriter):
     def write(self, caption_set):
-        caption_set = deepcopy(caption_set)
-
-        captions = []
+        output = StringIO()
+        self.write_to(caption_set, output)
+        return output.getvalue()
 
+    def write_to(self, caption_set, fp):
         for lang in caption_set.get_languages():
-            captions.append(
-                self._recreate_lang(caption_set.get_captions(lang))
-            )
-
-        return ''.join(captions)
+            self._write_lang(caption_set.get_captions(lang), fp)
 
     def _microtoframes(self, micro, fps=25.0):
         return int(micro * fps / (10 ** 6))
 
-    def _recreate_lang(self, captions):
-        sub = ''
-
+    def _write_lang(self, captions, fp):
         for caption in captions:
             start = self._microtoframes(caption.start)
             end = self._microtoframes(caption.end)
-            sub += f'{{{start}}}{{{end}}}'
 
             new_content = ''
             for node in caption.nodes:
@@ -106,9 +100,7 @@ class MicroDVDWriter(BaseWriter):
             while '|\n' in new_content:
                 new_content = new_content.replace('|\n', '\n')
 
-            sub += new_content
-
-        return sub
+            fp.write(f'{{{start}}}{{{end}}}{new_content}')
 
     def _recreate_line(self, sub, line):
         if line.type_ == CaptionNode.TEXT:
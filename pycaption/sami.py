@@ -36,15 +36,16 @@ OBS:
 
 """
 import re
+import warnings
 from xml.dom import SyntaxErr
+from bisect import bisect_left, bisect_right
 from collections import deque
-from copy import deepcopy
-from html.entities import name2codepoint
+from html.entities import html5, name2codepoint
 from html.parser import HTMLParser
 from logging import FATAL
 from xml.sax.saxutils import escape
 
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup
 from cssutils import parseString, log, css as cssutils_css
 
 from .base import (
@@ -55,7 +56,10 @@ from .exceptions import (
     CaptionReadNoCaptions, CaptionReadSyntaxError, InvalidInputError,
     CaptionReadTimingError
 )
-from .geometry import Layout, Alignment, Padding, Size
+from .geometry import (
+    Layout, Alignment, Padding, Size, sharing_instances,
+)
+from .utils import MarkupTag
 
 # change cssutils default logging
 log.setLevel(FATAL)
@@ -81,18 +85,18 @@ class SAMIReader(BaseReader):
         else:
             return False
 
+    @sharing_instances()
     def read(self, content):
         if not isinstance(content, str):
             raise InvalidInputError('The content is not a unicode string.')
 
-        content, doc_styles, doc_langs = (
-            self._get_sami_parser_class()().feed(content))
-        sami_soup = self._get_xml_parser_class()(content, features="lxml")
+        parser = self._get_sami_parser_class()(markup=False)
+        _, doc_styles, doc_langs = parser.feed(content)
 
         # Get the global layout that applies to all <p> tags
         global_layout = self._build_layout(doc_styles.get('p', {}))
 
-        caption_dict = {}
+        lang_layouts = {}
         for language in doc_langs:
             lang_layout = None
             for target, styling in list(doc_styles.items()):
@@ -103,12 +107,9 @@ class SAMIReader(BaseReader):
                             inherit_from=global_layout
                         )
                         break
-            lang_layout = lang_layout or global_layout
-            lang_captions = self._translate_lang(
-                language, sami_soup, lang_layout)
-
-            caption_dict[language] = lang_captions
+            lang_layouts[language] = lang_layout or global_layout
 
+        caption_dict = self._translate_langs(lang_layouts, parser.paragraphs)
         caption_set = CaptionSet(
             caption_dict,
             layout_info=global_layout
@@ -132,7 +133,14 @@ class SAMIReader(BaseReader):
 
     @staticmethod
     def _get_xml_parser_class():
-        """Hook method for providing a custom XML parser class"""
+        """Hook method for providing a custom XML parser class
+
+        Deprecated, the captions are read from the tree SAMIParser builds,
+        so the class returned is no longer used.
+        """
+        warnings.warn("SAMIReader no longer uses an XML parser, so "
+                      "_get_xml_parser_class has no effect",
+                      DeprecationWarning)
         return BeautifulSoup
 
     def _build_layout(self, styles, inherit_from=None):
@@ -148,7 +156,7 @@ class SAMIReader(BaseReader):
         alignment = Alignment.from_horizontal_and_vertical_align(
             text_align=styles.get('text-align')
         )
-        return self._get_layout_class()(
+        return self._get_layout_class().intern(
             origin=None,
             extent=None,
             padding=self._get_padding(styles),
@@ -181,61 +189,102 @@ class SAMIReader(BaseReader):
             return None
         return Size.from_string(value_from_style)
 
-    def _translate_lang(self, language, sami_soup, parent_layout):
-        """
-        For a given language, translate the SAMI XML to internal list of
-        captions.
-
-        :rtype: list
-        """
-        captions = CaptionList(layout_info=parent_layout)
-        milliseconds = 0
-
-        for p in sami_soup.select(f'p[lang|={language}]'):
-            start_str = p.parent.get('start')
-            if not start_str:
-                raise CaptionReadTimingError(
-                    f"Missing start time on the following line: {p.parent}.")
-            milliseconds = int(float(start_str))
-            start = milliseconds * 1000
-            end = 0
-
-            # Setting current start time as end time for previous elements with
-            # 0 as ending ( when we have more p elements inside a SYNC element )
-            for i in reversed(range(len(captions))):
-                if captions[i].end != 0:
-                    break
-                if captions[i].start != start:
-                    captions[i].end = start
-
-            if p.get_text().strip():
-                self.first_alignment = None
-                styles = self._translate_attrs(p)
-                layout_info = self._build_layout(styles,
-                                                 inherit_from=parent_layout)
-                self.line = []
-
-                self._translate_tag(p, layout_info)
-                caption_layout = self._get_layout_class()(
-                    alignment=self.first_alignment,
-                    inherit_from=layout_info
-                )
-                for node in self.line:
-                    node.layout_info = Layout(
-                        alignment=self.first_alignment,
-                        inherit_from=node.layout_info
-                    )
-                self.first_alignment = None
+    def _translate_langs(self, lang_layouts, paragraphs):
+        """
+        Translate the <p> tags of the SAMI document to internal lists of
+        captions, for all the languages at once.
+
+        :type lang_layouts: dict
+        :param lang_layouts: the Layout of the captions of each language
 
-                caption = Caption(start, end, self.line, styles, caption_layout)
-                captions.append(caption)
+        :type paragraphs: list
+        :param paragraphs: the <p> tags of the document, in document order
 
-        if captions and captions[-1].end == 0:
-            # Arbitrarily make this last 4 seconds. Not ideal...
-            captions[-1].end = (milliseconds + 4000) * 1000
+        :rtype: dict
+        """
+        captions = {
+            language: CaptionList(layout_info=layout)
+            for language, layout in lang_layouts.items()
+        }
+        last_start = dict.fromkeys(lang_layouts, 0)
+        languages_by_lang_attr = {}
+
+        for p in paragraphs:
+            lang_attr = p.get('lang')
+            languages = languages_by_lang_attr.get(lang_attr)
+            if languages is None:
+                languages = languages_by_lang_attr[lang_attr] = [
+                    language for language in lang_layouts
+                    if self._is_lang_match(lang_attr, language)
+                ]
+            for language in languages:
+                last_start[language] = self._translate_p(
+                    p, captions[language], lang_layouts[language])
+
+        for language, lang_captions in captions.items():
+            if lang_captions and lang_captions[-1].end == 0:
+                # Arbitrarily make this last 4 seconds. Not ideal...
+                lang_captions[-1].end = (last_start[language] + 4000) * 1000
 
         return captions
 
+    @staticmethod
+    def _is_lang_match(lang_attr, language):
+        """Whether a lang attribute matches the language, as the CSS
+        [lang|=language] selector does
+        """
+        if lang_attr is None:
+            return False
+        return (lang_attr == language
+                or lang_attr.startswith(f'{language}-'))
+
+    def _translate_p(self, p, captions, parent_layout):
+        """
+        Translate a <p> tag to a caption, appended to the captions of its
+        language.
+
+        :returns: the start of the <p> tag's <sync>, in milliseconds
+        """
+        start_str = p.parent.get('start')
+        if not start_str:
+            raise CaptionReadTimingError(
+                f"Missing start time on the following line: {p.parent}.")
+        milliseconds = int(float(start_str))
+        start = milliseconds * 1000
+        end = 0
+
+        # Setting current start time as end time for previous elements with
+        # 0 as ending ( when we have more p elements inside a SYNC element )
+        for i in reversed(range(len(captions))):
+            if captions[i].end != 0:
+                break
+            if captions[i].start != start:
+                captions[i].end = start
+
+        if p.get_text().strip():
+            self.first_alignment = None
+            styles = self._translate_attrs(p)
+            layout_info = self._build_layout(styles,
+                                             inherit_from=parent_layout)
+            self.line = []
+
+            self._translate_tag(p, layout_info)
+            caption_layout = self._get_layout_class().intern(
+                alignment=self.first_alignment,
+                inherit_from=layout_info
+            )
+            for node in self.line:
+                node.layout_info = Layout.intern(
+                    alignment=self.first_alignment,
+                    inherit_from=node.layout_info
+                )
+            self.first_alignment = None
+
+            caption = Caption(start, end, self.line, styles, caption_layout)
+            captions.append(caption)
+
+        return milliseconds
+
     def _get_style_name_from_tag(self, tag):
         if tag == 'i':
             return 'italics'
@@ -250,10 +299,9 @@ class SAMIReader(BaseReader):
                 to be attached to leaf nodes
         """
         # convert text
-        if isinstance(tag, NavigableString):
-            # BeautifulSoup apparently handles unescaping character codes
-            # (e.g. &amp;) automatically. The following variable, therefore,
-            # should contain a plain unicode string.
+        if isinstance(tag, str):
+            # SAMIParser unescapes character codes (e.g. &amp;) while
+            # building the tree, so this is a plain unicode string.
             # strips indentation whitespace only
             pattern = re.compile("^(?:[\n\r]+\\s*)?(.+)")
             result = pattern.search(tag)
@@ -308,7 +356,7 @@ class SAMIReader(BaseReader):
         css_attrs = tag.attrs
 
         if 'class' in css_attrs:
-            attrs['class'] = css_attrs['class'][0].lower()
+            attrs['class'] = css_attrs['class'].split()[0].lower()
         if 'id' in css_attrs:
             attrs['class'] = css_attrs['id'].lower()
         if 'style' in css_attrs:
@@ -380,6 +428,91 @@ class SAMIReader(BaseReader):
                 Alignment.from_horizontal_and_vertical_align(text_align=align)
 
 
+class _SAMIDocument:
+    """The SAMI document being written, starting out as SAMI_BASE_MARKUP, with
+    its <sync> tags indexed by start time.
+
+    As long as the <sync> tags of the primary language come in order, the
+    document order is the order of the start times (the <sync> tags of the
+    other languages are only created for new start times), so they are only
+    sorted once, when the document is serialized. Otherwise they are sorted
+    right away, and from then on inserted where their start time belongs.
+    """
+
+    def __init__(self):
+        self.style = MarkupTag('style', type="text/css")
+        self.body = MarkupTag('body')
+        head = MarkupTag('head')
+        head.append(self.style)
+        self.sami = MarkupTag('sami')
+        self.sami.append(head)
+        self.sami.append(self.body)
+        # the first <sync> tag of every start time
+        self._syncs_by_start = {}
+        self._last_start = None
+        # the start times of the <sync> tags, once they are kept sorted
+        self._starts = None
+
+    @staticmethod
+    def new_tag(name, **attrs):
+        return MarkupTag(name, **attrs)
+
+    def find(self, name):
+        """Returns the 'style' or the 'body' tag of the document"""
+        return {'style': self.style, 'body': self.body}.get(name)
+
+    def find_sync(self, start):
+        """The first <sync> tag with the given start time, if any"""
+        return self._syncs_by_start.get(start)
+
+    def append_sync(self, sync):
+        """Append a <sync> tag after the ones starting at the same time or
+        earlier
+        """
+        start = sync['start']
+        self._syncs_by_start.setdefault(start, sync)
+        if self._starts is None:
+            if self._last_start is None or start >= self._last_start:
+                self._last_start = start
+                self.body.append(sync)
+                return
+            self._sort_syncs()
+        self._insert(bisect_right(self._starts, start), sync)
+
+    def insert_sync(self, sync):
+        """Insert a <sync> tag after the last one starting earlier or, if
+        there is none, before the first one starting later. There must be no
+        <sync> tag with the same start time yet (see find_sync).
+        """
+        syncs = self.body.contents
+        if not syncs:
+            return
+        start = sync['start']
+        self._syncs_by_start[start] = sync
+        if self._starts is None:
+            syncs.append(sync)
+        else:
+            self._insert(bisect_left(self._starts, start), sync)
+
+    def _insert(self, index, sync):
+        self._starts.insert(index, sync['start'])
+        self.body.contents.insert(index, sync)
+
+    def _sort_syncs(self):
+        """Put the <sync> tags in start time order, from which point they are
+        inserted where they belong right away
+        """
+        if self._starts is None:
+            self.body.contents.sort(key=lambda sync: sync['start'])
+            self._starts = [sync['start'] for sync in self.body.contents]
+
+    def prettify(self):
+        self._sort_syncs()
+        pieces = []
+        self.sami.serialize(pieces)
+        return ''.join(pieces)
+
+
 class SAMIWriter(BaseWriter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -387,8 +520,12 @@ class SAMIWriter(BaseWriter):
         self.last_time = None
 
     def write(self, caption_set):
-        caption_set = deepcopy(caption_set)
-        sami = BeautifulSoup(SAMI_BASE_MARKUP, "lxml-xml")
+        # Apply transformations to the layout of all captions/nodes in
+        # function of the provided or default settings, without altering the
+        # caller's caption set
+        caption_set = caption_set.copy_with_layout(
+            self._relativize_and_fit_to_screen)
+        sami = _SAMIDocument()
 
         caption_set.layout_info = self._relativize_and_fit_to_screen(
             caption_set.layout_info)
@@ -407,22 +544,13 @@ class SAMIWriter(BaseWriter):
             )
 
             for caption in caption_set.get_captions(lang):
-                # Loop through all captions/nodes and apply transformations to
-                # layout in function of the provided or default settings
-                caption.layout_info = self._relativize_and_fit_to_screen(
-                    caption.layout_info)
-                for node in caption.nodes:
-                    node.layout_info = self._relativize_and_fit_to_screen(
-                        node.layout_info)
                 sami = self._recreate_p_tag(
                     caption, sami, lang, primary, caption_set)
 
         stylesheet = self._recreate_stylesheet(caption_set)
-        sami.find('style').append(stylesheet)
+        sami.find('style').string = stylesheet
 
-        a = sami.prettify(formatter=None).split('\n')
-        caption_content = '\n'.join(a[1:])
-        return caption_content
+        return sami.prettify()
 
     def _recreate_p_tag(self, caption, sami, lang, primary, captions):
         """
@@ -430,12 +558,12 @@ class SAMIWriter(BaseWriter):
         and return it.
 
         :type caption: Caption
-        :type sami: BeautifulSoup
+        :type sami: _SAMIDocument
         :type lang: str
         :type primary: str
         :type captions: CaptionSet
 
-        :rtype: BeautifulSoup
+        :rtype: _SAMIDocument
         """
         time = caption.start // 1000
 
@@ -466,20 +594,20 @@ class SAMIWriter(BaseWriter):
         """
         Creates a sync tag for a given language and timing (if it doesn't
         already exist), attach it to the sami body and return the sami
-        BeautifulSoup object.
+        document.
 
-        :type sami: BeautifulSoup
+        :type sami: _SAMIDocument
         :type lang: str
         :type primary: str
         :type time: int
 
-        :rtype: BeautifulSoup
+        :rtype: _SAMIDocument
         """
         if lang == primary:
             sync = sami.new_tag("sync", start=time)
-            sami.body.append(sync)
+            sami.append_sync(sync)
         else:
-            sync = sami.find("sync", start=time)
+            sync = sami.find_sync(time)
             if sync is None:
                 sami, sync = self._find_closest_sync(sami, time)
 
@@ -487,16 +615,7 @@ class SAMIWriter(BaseWriter):
 
     def _find_closest_sync(self, sami, time):
         sync = sami.new_tag("sync", start=time)
-
-        earlier = sami.find_all("sync", start=lambda x: int(x) < time)
-        if earlier:
-            last_sync = earlier[-1]
-            last_sync.insert_after(sync)
-        else:
-            later = sami.find_all("sync", start=lambda x: int(x) > time)
-            if later:
-                last_sync = later[0]
-                last_sync.insert_before(sync)
+        sami.insert_sync(sync)
         return sami, sync
 
     def _recreate_blank_tag(self, sami, caption, lang, primary, captions):
@@ -552,6 +671,8 @@ class SAMIWriter(BaseWriter):
         sami_style = f'\n    {selector} {{\n    '
 
         if layout_info and layout_info.padding:
+            # Don't alter the caption set's own styling rules
+            rules = dict(rules)
             rules.update({
                 'margin-top': str(layout_info.padding.before),
                 'margin-right': str(layout_info.padding.end),
@@ -634,12 +755,61 @@ class SAMIWriter(BaseWriter):
         return escape(s)
 
 
+class _SAMIElement:
+    """A tag of the SAMI document being read, as built by SAMIParser: its
+    attributes and its contents, which are either tags or strings
+    """
+    __slots__ = ('name', 'attrs', 'contents', 'parent')
+
+    def __init__(self, name, attrs=None, parent=None):
+        self.name = name
+        self.attrs = attrs if attrs is not None else {}
+        self.contents = []
+        self.parent = parent
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def get_text(self):
+        return ''.join(
+            content if isinstance(content, str) else content.get_text()
+            for content in self.contents
+        )
+
+    def __str__(self):
+        attributes = ''.join(
+            f' {name}="{value}"' for name, value in self.attrs.items())
+        if self.name == 'br':
+            return f'<br{attributes}/>'
+        contents = ''.join(
+            escape(content) if isinstance(content, str) else str(content)
+            for content in self.contents
+        )
+        return f'<{self.name}{attributes}>{contents}</{self.name}>'
+
+
 class SAMIParser(HTMLParser):
-    def __init__(self, *args, **kw):
+    def __init__(self, *args, markup=True, **kw):
+        """
+        :type markup: bool
+        :param markup: whether feed should also return the markup of the
+            cleaned-up document (None otherwise)
+        """
         HTMLParser.__init__(self, *args, **kw)
-        self.sami = ''
+        # the pieces of the cleaned-up document, joined once fully parsed, if
+        # it was asked for
+        self.sami = [] if markup else None
+        # the tree of the cleaned-up document, built along with it, and its
+        # <p> tags in document order
+        self.document = _SAMIElement('[document]')
+        self.paragraphs = []
+        # the tags of the tree still open, in the same order as the queue
+        self.elements = []
         self.line = ''
         self.styles = {}
+        # the text of the <style> tag, while it is being parsed
+        self.css = None
+        self.head_parsed = False
         self.queue = deque()
         self.langs = set()
         self.last_element = ''
@@ -655,6 +825,10 @@ class SAMIParser(HTMLParser):
         """
         self.last_element = tag
 
+        # only the first <style> tag of the <head> is used
+        if tag == 'style' and not self.head_parsed:
+            self.css = []
+
         # treat divs as spans
         if tag == 'div':
             tag = 'span'
@@ -668,24 +842,41 @@ class SAMIParser(HTMLParser):
             attrs.append(('lang', lang))
             self.langs.add(lang)
 
+        self._collapse_blank_text()
+        parent = self._current_element()
         # clean-up line breaks
         if tag == 'br':
-            self.sami += "<br/>"
+            self._write("<br/>")
+            parent.contents.append(_SAMIElement(tag, parent=parent))
         # add tag to queue
         else:
             # if already in queue, first close tags off in LIFO order
             while tag in self.queue:
-                closer = self.queue.pop()
-                self.sami += f"</{closer}>"
+                self._close_tag()
+            parent = self._current_element()
+            element = _SAMIElement(tag, parent=parent)
+            parent.contents.append(element)
+            if tag == 'p':
+                self.paragraphs.append(element)
             # open new tag in queue
             self.queue.append(tag)
-            # add tag with attributes
+            self.elements.append(element)
+            # add tag with attributes, keeping the first of repeated ones
             for attr, value in attrs:
-                tag += f' {attr.lower()}="{value}"'
-            self.sami += f"<{tag}>"
+                element.attrs.setdefault(
+                    attr.lower(), value if value is not None else '')
+            if self.sami is not None:
+                for attr, value in attrs:
+                    tag += f' {attr.lower()}="{value}"'
+                self.sami.append(f"<{tag}>")
 
     # override the parser's handling of endtags
     def handle_endtag(self, tag):
+        if tag == 'style' and self.css is not None:
+            self._parse_stylesheet()
+        elif tag == 'head':
+            self.head_parsed = True
+
         # treat divs as spans
         if tag == 'div':
             tag = 'span'
@@ -695,37 +886,89 @@ class SAMIParser(HTMLParser):
             return
 
         # close off tags in LIFO order, if matching starting tag in queue
+        if tag in self.queue:
+            self._collapse_blank_text()
         while tag in self.queue:
-            closing_tag = self.queue.pop()
-            self.sami += f"</{closing_tag}>"
+            self._close_tag()
 
     def handle_entityref(self, name):
         if name in ['gt', 'lt']:
-            self.sami += f'&{name};'
+            self._write(f'&{name};')
+            text = '>' if name == 'gt' else '<'
         else:
             try:
-                self.sami += chr(self.name2codepoint[name])
+                text = chr(self.name2codepoint[name])
+                self._write(text)
             except (KeyError, ValueError):
-                self.sami += f'&{name}'
+                self._write(f'&{name}')
+                text = self._resolve_legacy_entity(name)
+        self._add_text(text)
 
         self.last_element = ''
 
     def handle_charref(self, name):
         if name[0] == 'x':
-            self.sami += chr(int(name[1:], 16))
+            text = chr(int(name[1:], 16))
         else:
-            self.sami += chr(int(name))
+            text = chr(int(name))
+        self._write(text)
+        self._add_text(text)
 
     # override the parser's handling of data
     def handle_data(self, data):
-        self.sami += data
+        if self.css is not None:
+            self.css.append(data)
+        self._write(data)
+        self._add_text(data)
         self.last_element = ''
 
+    @staticmethod
+    def _resolve_legacy_entity(name):
+        """Resolve the legacy entity the name starts with (e.g. &GT, which
+        needs no semicolon), as lxml did when it read the cleaned-up document
+        """
+        for end in range(len(name), 0, -1):
+            if name[:end] in html5:
+                return html5[name[:end]] + name[end:]
+        return f'&{name}'
+
+    def _current_element(self):
+        return self.elements[-1] if self.elements else self.document
+
+    def _close_tag(self):
+        closing_tag = self.queue.pop()
+        self.elements.pop()
+        self._write(f"</{closing_tag}>")
+
+    def _write(self, markup):
+        if self.sami is not None:
+            self.sami.append(markup)
+
+    def _add_text(self, text):
+        # line breaks are normalized, as lxml did when it read the cleaned-up
+        # document
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        contents = self._current_element().contents
+        if contents and isinstance(contents[-1], str):
+            contents[-1] += text
+        else:
+            contents.append(text)
+
+    def _collapse_blank_text(self):
+        """Collapse the text before the tag about to be written, if it is only
+        whitespace, as BeautifulSoup did when it read the cleaned-up document
+        """
+        contents = self._current_element().contents
+        if (contents and isinstance(contents[-1], str)
+                and not contents[-1].strip(' \t\n\x0c')):
+            contents[-1] = '\n' if '\n' in contents[-1] else ' '
+
     # override the parser's feed function
     def feed(self, data):
         """
         :param data: Raw SAMI unicode string
-        :returns: tuple (str, dict, set)
+        :returns: tuple (str, dict, set), the str being None if the markup
+            was not asked for
         """
         no_cc = 'no closed captioning available'
 
@@ -735,15 +978,6 @@ class SAMIParser(HTMLParser):
         elif no_cc in data.lower():
             raise CaptionReadSyntaxError(f'SAMI File contains "{no_cc}"')
 
-        # try to find style tag in SAMI
-        # prevent BS4 error with huge SAMI files with unclosed tags
-        index = data.lower().find("</head>")
-        style = BeautifulSoup(data[:index], "lxml").find('style')
-        if style and style.contents:
-            self.styles = self._css_parse(' '.join(style.contents))
-        else:
-            self.styles = {}
-
         # fix erroneous italics tags
         data = data.replace('<i/>', '<i>')
 
@@ -752,11 +986,20 @@ class SAMIParser(HTMLParser):
         HTMLParser.feed(self, data)
 
         # close any tags that remain in the queue
+        if self.queue:
+            self._collapse_blank_text()
         while self.queue != deque([]):
-            closing_tag = self.queue.pop()
-            self.sami += f"</{closing_tag}>"
+            self._close_tag()
+
+        sami = ''.join(self.sami) if self.sami is not None else None
+        return sami, self.styles, self.langs
 
-        return self.sami, self.styles, self.langs
+    def _parse_stylesheet(self):
+        css = ''.join(self.css)
+        self.css = None
+        self.head_parsed = True
+        if css:
+            self.styles = self._css_parse(css)
 
     # parse the SAMI's stylesheet
     def _css_parse(self, css):
@@ -81,31 +81,33 @@ http://www.theneitherworld.com/mcpoodle/SCC_TOOLS/DOCS/SCC_FORMAT.HTML
 import math
 import re
 import textwrap
-from collections import defaultdict, deque, OrderedDict
-from copy import deepcopy
+import warnings
+from collections import deque
+from io import StringIO
 
 from pycaption.base import BaseReader, BaseWriter, CaptionNode, CaptionSet
 from pycaption.exceptions import (
     CaptionLineLengthError,
+    CaptionLineLengthWarning,
     CaptionReadNoCaptions,
     CaptionReadTimingError,
     InvalidInputError,
 )
+from pycaption.geometry import sharing_instances
 
 from .constants import (
-    CHARACTER_TO_CODE,
-    CHARACTERS,
-    COMMANDS,
-    CUE_STARTING_COMMAND,
-    EXTENDED_CHARS,
+    CHANNEL_WORDS,
+    CHARACTER_TO_SCC_CODE,
+    DECODED_WORDS,
     HEADER,
     MICROSECONDS_PER_CODEWORD,
-    PAC_BYTES_TO_POSITIONING_MAP,
     PAC_HIGH_BYTE_BY_ROW,
     PAC_LOW_BYTE_BY_ROW_RESTRICTED,
-    PAC_TAB_OFFSET_COMMANDS,
-    SPECIAL_CHARS,
-    SPECIAL_OR_EXTENDED_CHAR_TO_CODE,
+    UNKNOWN_WORD,
+    WORD_CHARACTERS,
+    WORD_COMMAND,
+    WORD_EXTENDED_CHAR,
+    WORD_SPECIAL_CHAR,
 )
 from .specialized_collections import CaptionCreator  # noqa: F401
 from .specialized_collections import (
@@ -117,6 +119,16 @@ from .specialized_collections import (
 from .state_machines import DefaultProvidingPositionTracker
 
 
+# Splits a line into its timestamp and its words
+_LINE_RE = re.compile(r"([0-9:;]*)([\s\t]*)((.)*)")
+_TIMESTAMP_RE = re.compile(r"(\d{2}):(\d{2}):(\d{2})([:;])(\d{1,2})")
+
+# The duration of one timecode frame in thirds of a microsecond, for
+# drop-frame (wall clock) and non-drop-frame (1.001 slower) timestamps
+_THIRD_MICROSECONDS_PER_FRAME = 100000
+_THIRD_MICROSECONDS_PER_FRAME_NTSC = 100100
+
+
 class NodeCreatorFactory:
     """Will return instances of the given node_creator.
 
@@ -149,6 +161,35 @@ class NodeCreatorFactory:
         )
 
 
+def _describe_lines_too_long(captions):
+    """Describes the lines longer than 32 characters in the given captions,
+    grouped by caption start time
+
+    :type captions: CaptionList
+    :rtype: str
+    :returns: an empty string if all the lines fit
+    """
+    lines_too_long = {}
+    for caption in captions:
+        text_nodes = caption.get_text_nodes()
+        # no line can be longer than the whole text
+        if sum(map(len, text_nodes)) <= 32:
+            continue
+        text_too_long = [
+            line for line in "".join(text_nodes).split("\n") if len(line) > 32
+        ]
+        if text_too_long:
+            lines_too_long.setdefault(caption.format_start(), []).extend(
+                text_too_long)
+
+    msg = ""
+    for start, lines in lines_too_long.items():
+        msg += f"around {start} - "
+        for line in lines:
+            msg += line + f" - Length { len(line)}" + "\n"
+    return msg
+
+
 def fix_last_captions_without_ending(caption_list):
     """
     If the last captions were never explicitly ended, set their end time to
@@ -199,29 +240,7 @@ class SCCReader(BaseReader):
         self.time = 0
 
     def _group_captions_by_start_time(self, caps):
-        # group captions that have the same start time
-        caps_start_time = OrderedDict()
-        for i, cap in enumerate(caps):
-            if cap.start not in caps_start_time:
-                caps_start_time[cap.start] = [cap]
-            else:
-                caps_start_time[cap.start].append(cap)
-        # order by start timestamp
-        caps_start_time = OrderedDict(sorted(caps_start_time.items(), key=lambda item: item[0]))
-
-        # check if captions with the same start time also have the same end time
-        # fail if different end times are found - this is not (yet?) supported
-        caps_final = []
-        for start_time, caps_list in caps_start_time.items():
-            if len(caps_list) == 1:
-                caps_final.append(caps_list)
-            else:
-                end_times = list(set([c.end for c in caps_list]))
-                if len(end_times) != 1:
-                    raise ValueError("Unsupported subtitles - overlapping subtitles with different end times found")
-                else:
-                    caps_final.append(caps_list)
-        return caps_final
+        return CaptionSet._group_captions_by_start_time(caps)
 
     def detect(self, content):
         """Checks whether the given content is a proper SCC file
@@ -236,7 +255,9 @@ class SCCReader(BaseReader):
         else:
             return False
 
-    def read(self, content, lang="en-US", simulate_roll_up=False, offset=0):
+    @sharing_instances()
+    def read(self, content, lang="en-US", simulate_roll_up=False, offset=0,
+             line_length_errors="raise", channels=None):
         """Converts the unicode string into a CaptionSet
 
         :type content: str
@@ -253,53 +274,92 @@ class SCCReader(BaseReader):
         :type offset: int
         :param offset:
 
+        :type line_length_errors: str
+        :param line_length_errors: What to do when captions have lines longer
+            than 32 characters: "raise" a CaptionLineLengthError, "warn" with
+            a CaptionLineLengthWarning (which can be collected with
+            warnings.catch_warnings(record=True)) or "ignore" them.
+
+        :type channels: dict | list | None
+        :param channels: The caption channels (1 to 4, for CC1 to CC4) to
+            read, all in a single pass. Either a dict of channel: language,
+            or a list of channels, the captions of which are stored under
+            "CC1" to "CC4". By default the whole file is read as a single
+            channel, with the given lang.
+
         :rtype: CaptionSet
         """
+        if line_length_errors not in ("raise", "warn", "ignore"):
+            raise ValueError(
+                f"Unknown line_length_errors value: {line_length_errors}")
         if not isinstance(content, str):
             raise InvalidInputError("The content is not a unicode string.")
 
-        self.simulate_roll_up = simulate_roll_up
-        self.time_translator.offset = offset * 1000000
+        if channels is None:
+            languages = {1: lang}
+            readers = {1: self}
+        else:
+            if not isinstance(channels, dict):
+                channels = {channel: f"CC{channel}" for channel in channels}
+            if not channels or not set(channels) <= {1, 2, 3, 4}:
+                raise ValueError(f"Invalid caption channels: {channels}")
+            languages = channels
+            readers = {channel: SCCReader() for channel in channels}
+
+        for reader in readers.values():
+            reader.simulate_roll_up = simulate_roll_up
+            reader.time_translator.offset = offset * 1000000
         # split lines
         lines = content.splitlines()
 
         # loop through each line except the first
-        for line in lines[1:]:
-            self._translate_line(line)
+        if channels is None:
+            for line in lines[1:]:
+                self._translate_line(line)
+        else:
+            demuxer = _ChannelDemuxer(readers)
+            for line in lines[1:]:
+                demuxer.translate_line(line)
+
+        captions = CaptionSet({})
+        for channel, reader in readers.items():
+            channel_captions = reader._get_validated_captions(
+                line_length_errors)
+            if channel_captions:
+                captions.set_captions(languages[channel], channel_captions)
+
+        if captions.is_empty():
+            raise CaptionReadNoCaptions("empty caption file")
+
+        for language in captions.get_languages():
+            fix_last_captions_without_ending(captions.get_captions(language))
+
+        return captions
 
+    def _get_validated_captions(self, line_length_errors):
+        """Flushes the buffers and checks the captions that were read
+
+        :rtype: CaptionList
+        """
         self._flush_implicit_buffers(self.buffer_dict.active_key)
 
-        captions_raw = self.caption_stash.get_all()
-        captions = CaptionSet({lang: captions_raw})
+        captions = self.caption_stash.get_all()
 
         # check captions for incorrect lengths
-        lines_too_long = defaultdict(list)
-        for caption in self.caption_stash._collection:
-            caption_start = caption.to_real_caption().format_start()
-            caption_text = "".join(caption.to_real_caption().get_text_nodes())
-            text_too_long = [
-                line for line in caption_text.split("\n") if len(line) > 32
-            ]
-            if caption_start in lines_too_long:
-                lines_too_long[caption_start] = text_too_long
-            else:
-                lines_too_long[caption_start].extend(text_too_long)
-
-        msg = ""
-        if bool(lines_too_long.keys()):
-            for key in lines_too_long:
-                if lines_too_long[key]:
-                    msg += f"around {key} - "
-                    for line in lines_too_long[key]:
-                        msg += line + f" - Length { len(line)}" + "\n"
-        if len(msg):
-            raise CaptionLineLengthError(
-                f"32 character limit for caption cue in scc file.\n"
-                f"Lines longer than 32:\n"
-                f"{msg}"
-            )
+        if line_length_errors != "ignore":
+            msg = _describe_lines_too_long(captions)
+            if msg:
+                msg = (
+                    f"32 character limit for caption cue in scc file.\n"
+                    f"Lines longer than 32:\n"
+                    f"{msg}"
+                )
+                if line_length_errors == "warn":
+                    warnings.warn(msg, CaptionLineLengthWarning, stacklevel=3)
+                else:
+                    raise CaptionLineLengthError(msg)
 
-        for cap in captions.get_captions(lang):
+        for cap in captions:
             # if there's an end time on a caption and the difference is
             # less than .05s kill it (this is likely caused by a standalone
             # EOC marker in the SCC file)
@@ -310,11 +370,6 @@ class SCCReader(BaseReader):
                     f"must be at least 0.05 seconds."
                 )
 
-        if captions.is_empty():
-            raise CaptionReadNoCaptions("empty caption file")
-        else:
-            fix_last_captions_without_ending(captions.get_captions(lang))
-
         return captions
 
     def _flush_implicit_buffers(self, old_key=None, *args):
@@ -347,12 +402,12 @@ class SCCReader(BaseReader):
             return
 
         # split line in timestamp and words
-        r = re.compile(r"([0-9:;]*)([\s\t]*)((.)*)")
-        parts = r.findall(line.lower())
+        parts = _LINE_RE.findall(line.lower())
 
         self.time_translator.start_at(parts[0][0])
-        word_list = parts[0][2].split(" ")
+        self._translate_words(parts[0][2].split(" "))
 
+    def _translate_words(self, word_list):
         for idx, word in enumerate(word_list):
             word = word.strip()
             if len(word) == 4:
@@ -360,31 +415,34 @@ class SCCReader(BaseReader):
                 self._translate_word(word=word, next_command=next_command)
 
     def _translate_word(self, word, next_command=None):
-        if self._handle_double_command(word):
+        # a single lookup classifies the word (see DECODED_WORDS)
+        decoded = DECODED_WORDS.get(word, UNKNOWN_WORD)
+
+        if self._handle_double_command(word, decoded):
             # count frames for timing
             self.time_translator.increment_frames()
             return
+
+        kind = decoded.kind
         # first check if word is a command
-        # TODO - check that all the positioning commands are here, or use
-        # some other strategy to determine if the word is a command.
-        if word in COMMANDS or _is_pac_command(word):
+        if kind == WORD_COMMAND:
             self._translate_command(word=word, next_command=next_command)
 
         # second, check if word is a special character
-        elif word in SPECIAL_CHARS:
-            self._translate_special_char(word)
+        elif kind == WORD_SPECIAL_CHAR:
+            self.buffer.add_chars(*decoded.chars)
 
-        elif word in EXTENDED_CHARS:
-            self._translate_extended_char(word)
+        elif kind == WORD_EXTENDED_CHAR:
+            self._translate_extended_char(word, decoded.chars)
 
-        # third, try to convert word into 2 characters
-        else:
-            self._translate_characters(word)
+        # third, the word is made of 2 recognized characters
+        elif kind == WORD_CHARACTERS:
+            self.buffer.add_chars(*decoded.chars)
 
         # count frames for timing only after processing a command
         self.time_translator.increment_frames()
 
-    def _handle_double_command(self, word):
+    def _handle_double_command(self, word, decoded=None):
         # If the caption is to be broadcast, each of the commands are doubled
         # up for redundancy in case the signal is garbled in transmission.
         # The decoder is programmed to ignore a second command when it is the
@@ -392,29 +450,28 @@ class SCCReader(BaseReader):
         # If we have doubled commands we're skipping also
         # doubled special characters and doubled extended characters
         # with only one member of each pair being displayed.
+        if decoded is None:
+            decoded = DECODED_WORDS.get(word, UNKNOWN_WORD)
 
-        doubled_types = (word != "94a1" and word in COMMANDS) or _is_pac_command(word) or word in SPECIAL_CHARS
         if self.double_starter:
-            doubled_types = (
-                doubled_types
-                or word in EXTENDED_CHARS
-                or word == "94a1"
-            )
+            doubled_types = decoded.doubled_after_starter
+        else:
+            doubled_types = decoded.doubled
 
-        if word in CUE_STARTING_COMMAND and word != self.last_command:
+        if decoded.starts_cue and word != self.last_command:
             self.double_starter = False
 
         if doubled_types and word == self.last_command:
-            if word in CUE_STARTING_COMMAND:
+            if decoded.starts_cue:
                 self.double_starter = True
             self.last_command = ""
             return True
             # Fix for the <position> <tab offset> <position> <tab offset>
             # repetition
-        elif _is_pac_command(word) and word in self.last_command:
+        elif decoded.is_pac and word in self.last_command:
             self.last_command = ""
             return True
-        elif word in PAC_TAB_OFFSET_COMMANDS:
+        elif decoded.is_tab_offset:
             if _is_pac_command(self.last_command):
                 self.last_command += f" {word}"
                 return False
@@ -424,10 +481,7 @@ class SCCReader(BaseReader):
         self.last_command = word
         return False
 
-    def _translate_special_char(self, word):
-        self.buffer.add_chars(SPECIAL_CHARS[word])
-
-    def _translate_extended_char(self, word):
+    def _translate_extended_char(self, word, chars):
         """
         Each of the 64 Extended Characters incorporates an automatic BS.
         When an Extended Character is received, the cursor moves to the
@@ -437,7 +491,7 @@ class SCCReader(BaseReader):
         """
         self.buffer.handle_backspace(word)
         # add to buffer
-        self.buffer.add_chars(EXTENDED_CHARS[word])
+        self.buffer.add_chars(*chars)
 
     def _translate_command(self, word, next_command=None):
         # if command is pop_up
@@ -488,7 +542,7 @@ class SCCReader(BaseReader):
                 self._pop_on(end=self.time)
             if self.buffer.is_empty():
                 return
-            cue = PopOnCue(buffer=deepcopy(self.buffer), start=self.time, end=0)
+            cue = PopOnCue(buffer=self.buffer.detach(), start=self.time, end=0)
             self.pop_ons_queue.appendleft(cue)
             self.buffer = self.node_creator_factory.new_creator()
 
@@ -507,17 +561,6 @@ class SCCReader(BaseReader):
         else:
             self.buffer.interpret_command(command=word, next_command=next_command)
 
-    def _translate_characters(self, word):
-        # split word into the 2 bytes
-        byte1 = word[:2]
-        byte2 = word[2:]
-
-        # check to see if the the bytes are recognized characters
-        if byte1 not in CHARACTERS or byte2 not in CHARACTERS:
-            return
-
-        self.buffer.add_chars(CHARACTERS[byte1], CHARACTERS[byte2])
-
     @property
     def buffer(self):
         """Returns the currently active buffer"""
@@ -560,53 +603,223 @@ class SCCReader(BaseReader):
         self.caption_stash.create_and_store(pop_on_cue.buffer, pop_on_cue.start, end)
 
 
+class _ChannelDemuxer:
+    """Routes the words of an SCC file to one SCCReader state machine per
+    caption channel, translated to their CC1 equivalent.
+
+    Characters belong to the channel of the last control code. Every word
+    takes a frame, so the readers of the other channels count it too.
+    """
+
+    def __init__(self, readers):
+        """
+        :type readers: dict[int, SCCReader]
+        :param readers: the reader of each channel to decode
+        """
+        self.readers = readers
+        self.channel = 1
+
+    def translate_line(self, line):
+        # ignore blank lines
+        if line.strip() == "":
+            return
+
+        # split line in timestamp and words
+        parts = _LINE_RE.findall(line.lower())
+
+        for reader in self.readers.values():
+            reader.time_translator.start_at(parts[0][0])
+
+        routed_words = [
+            self._route(word)
+            for word in (word.strip() for word in parts[0][2].split(" "))
+            if len(word) == 4
+        ]
+
+        for idx, (channel, word) in enumerate(routed_words):
+            next_command = None
+            if idx + 1 < len(routed_words):
+                next_channel, next_word = routed_words[idx + 1]
+                if next_channel == channel:
+                    next_command = next_word
+
+            for reader_channel, reader in self.readers.items():
+                if reader_channel == channel:
+                    reader._translate_word(
+                        word=word, next_command=next_command)
+                else:
+                    reader.time_translator.increment_frames()
+
+    def _route(self, word):
+        """
+        :rtype: tuple
+        :returns: the channel of the word and its CC1 equivalent
+        """
+        routing = CHANNEL_WORDS.get(word)
+        if routing is None:
+            return self.channel, word
+
+        data_channel, field, cc1_word = routing
+        if field is None:
+            field = 2 if self.channel > 2 else 1
+        self.channel = data_channel + 2 * (field - 1)
+        return self.channel, cc1_word
+
+
+class SCCDecoder:
+    """Push-style SCC decoder, for live CEA-608 streams.
+
+    Feeds SCC lines (or bare code words) through the same state machine as
+    SCCReader, returning the captions as soon as their end time is final:
+    when they are taken off the screen by an End Of Caption [EOC], an Erase
+    Displayed Memory [EDM] or a Carriage Return [CR]. A caption that ends
+    less than 5 frames before the next one may still be extended to it, so
+    those are returned once the stream moved past that window.
+
+    Only the captions not returned yet are kept, so memory and the work done
+    per call don't grow with the length of the stream. Unlike SCCReader.read,
+    no validation is done on the returned captions.
+    """
+
+    def __init__(self, simulate_roll_up=False, offset=0):
+        """
+        :type simulate_roll_up: bool
+        :param simulate_roll_up: see SCCReader.read
+
+        :type offset: int
+        :param offset: see SCCReader.read
+        """
+        self._reader = SCCReader()
+        self._reader.simulate_roll_up = simulate_roll_up
+        self._reader.time_translator.offset = offset * 1000000
+        # The layouts shared by the captions of this stream
+        self._layouts = {}
+
+    def feed(self, line_or_words):
+        """Decodes an SCC line, or code words following the last line
+
+        :type line_or_words: str | list[str]
+        :param line_or_words: a line of an SCC file (the header and blank
+            lines are ignored), or a list of 4 letter code words, timed as
+            if they followed the last words fed
+
+        :rtype: list[Caption]
+        :returns: the captions finalized by this call
+        """
+        with sharing_instances(self._layouts):
+            if isinstance(line_or_words, str):
+                if line_or_words != HEADER:
+                    self._reader._translate_line(line_or_words)
+            else:
+                self._reader._translate_words(
+                    [word.lower() for word in line_or_words])
+
+        return self._take_captions(self._count_final_captions())
+
+    def flush(self):
+        """Ends the stream, finalizing all the captions left
+
+        :rtype: list[Caption]
+        """
+        reader = self._reader
+        with sharing_instances(self._layouts):
+            reader._flush_implicit_buffers(reader.buffer_dict.active_key)
+
+        captions = self._take_captions(len(reader.caption_stash._collection))
+        fix_last_captions_without_ending(captions)
+        return captions
+
+    def _count_final_captions(self):
+        """Returns how many of the stored captions, from the first one, can
+        no longer be changed by the state machine
+        """
+        reader = self._reader
+        collection = reader.caption_stash._collection
+        # Only the last captions stored get their end time corrected, when
+        # the next caption starts less than 5 frames after their end
+        last_batch = collection._last_batch
+        if not collection or not last_batch:
+            return len(collection)
+
+        end = last_batch[-1].end
+        if end == 0:
+            return len(collection) - len(last_batch)
+
+        if reader.pop_ons_queue:
+            # The queued pop-on cue is the next caption to be stored
+            next_start = reader.pop_ons_queue[-1].start
+            is_final = (
+                next_start == end
+                or next_start - end >= 5 * MICROSECONDS_PER_CODEWORD + 1
+            )
+        else:
+            earliest_start = reader.time_translator.get_time()
+            if reader.buffer_dict.active_key in ("roll", "paint"):
+                earliest_start = min(earliest_start, reader.time)
+            is_final = (
+                earliest_start - end >= 5 * MICROSECONDS_PER_CODEWORD + 1
+            )
+
+        if is_final:
+            return len(collection)
+        return len(collection) - len(last_batch)
+
+    def _take_captions(self, count):
+        collection = self._reader.caption_stash._collection
+        captions = [precap.to_real_caption() for precap in collection[:count]]
+        del collection[:count]
+        return captions
+
+
 class SCCWriter(BaseWriter):
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
 
     def write(self, caption_set):
-        output = HEADER + "\n\n"
+        output = StringIO()
+        self.write_to(caption_set, output)
+        return output.getvalue()
 
-        if caption_set.is_empty():
-            return output
+    def write_to(self, caption_set, fp):
+        fp.write(HEADER + "\n\n")
 
-        caption_set = deepcopy(caption_set)
+        if caption_set.is_empty():
+            return
 
         # Only support one language.
         lang = list(caption_set.get_languages())[0]
         captions = caption_set.get_captions(lang)
 
-        # PASS 1: compute codes for each caption
+        # PASS 1: compute the code words of each caption
         codes = [
-            (self._text_to_code(caption), caption.start, caption.end)
+            (self._text_to_words(caption), caption.start, caption.end)
             for caption in captions
         ]
 
         # PASS 2:
         # Advance start times so as to have time to write to the pop-on
         # buffer; possibly remove the previous clear-screen command
-        for index, (code, start, end) in enumerate(codes):
-            code_words = len(code) / 5 + 8
+        for index, (words, start, end) in enumerate(codes):
+            code_words = len(words) + 8
             code_time_microseconds = code_words * MICROSECONDS_PER_CODEWORD
             code_start = start - code_time_microseconds
             if index == 0:
                 continue
-            previous_code, previous_start, previous_end = codes[index - 1]
+            previous_words, previous_start, previous_end = codes[index - 1]
             if previous_end + 3 * MICROSECONDS_PER_CODEWORD >= code_start:
-                codes[index - 1] = (previous_code, previous_start, None)
-            codes[index] = (code, code_start, end)
+                codes[index - 1] = (previous_words, previous_start, None)
+            codes[index] = (words, code_start, end)
 
         # PASS 3:
         # Write captions.
-        for code, start, end in codes:
-            output += f"{self._format_timestamp(start)}\t"
-            output += "94ae 94ae 9420 9420 "
-            output += code
-            output += "942c 942c 942f 942f\n\n"
+        for words, start, end in codes:
+            fp.write(
+                f"{self._format_timestamp(start)}\t"
+                f"94ae 94ae 9420 9420 {' '.join(words)} "
+                f"942c 942c 942f 942f\n\n"
+            )
             if end is not None:
-                output += f"{self._format_timestamp(end)}\t942c 942c\n\n"
-
-        return output
+                fp.write(f"{self._format_timestamp(end)}\t942c 942c\n\n")
 
     # Wrap lines at 32 chars
     @staticmethod
@@ -616,53 +829,44 @@ class SCCWriter(BaseWriter):
         inner_lines_laid_out = [textwrap.fill(x, 32) for x in inner_lines]
         return "\n".join(inner_lines_laid_out)
 
-    @staticmethod
-    def _maybe_align(code):
-        # Finish a half-word with a no-op so we can move to a full word
-        if len(code) % 5 == 2:
-            code += "80 "
-        return code
-
-    @staticmethod
-    def _maybe_space(code):
-        if len(code) % 5 == 4:
-            code += " "
-        return code
+    def _text_to_words(self, caption):
+        """Encodes the text of the caption as a list of 4 letter code words
 
-    def _print_character(self, code, char):
-        try:
-            char_code = CHARACTER_TO_CODE[char]
-        except KeyError:
-            try:
-                char_code = SPECIAL_OR_EXTENDED_CHAR_TO_CODE[char]
-            except KeyError:
-                char_code = "91b6"  # Use £ as "unknown character" symbol
-
-        if len(char_code) == 2:
-            return code + char_code
-        elif len(char_code) == 4:
-            return self._maybe_align(code) + char_code
-        else:
-            # This should not happen!
-            return code
-
-    def _text_to_code(self, s):
-        code = ""
-        lines = self._layout_line(s).split("\n")
+        :rtype: list[str]
+        """
+        words = []
+        lines = self._layout_line(caption).split("\n")
         for row, line in enumerate(lines):
             row += 16 - len(lines)
             # Move cursor to column 0 of the destination row
-            for _ in range(2):
-                code += (
-                    PAC_HIGH_BYTE_BY_ROW[row]
-                    + f"{PAC_LOW_BYTE_BY_ROW_RESTRICTED[row]} "
-                )
-            # Print the line using the SCC encoding
+            pac = (PAC_HIGH_BYTE_BY_ROW[row]
+                   + PAC_LOW_BYTE_BY_ROW_RESTRICTED[row])
+            words.append(pac)
+            words.append(pac)
+
+            # Print the line using the SCC encoding: standard characters
+            # take one byte, and are paired into words, while special and
+            # extended characters take a whole word
+            pending_byte = None
             for char in line:
-                code = self._print_character(code, char)
-                code = self._maybe_space(code)
-            code = self._maybe_align(code)
-        return code
+                # Use £ as "unknown character" symbol
+                char_code = CHARACTER_TO_SCC_CODE.get(char, "91b6")
+                if len(char_code) == 2:
+                    if pending_byte is None:
+                        pending_byte = char_code
+                    else:
+                        words.append(pending_byte + char_code)
+                        pending_byte = None
+                else:
+                    # Finish a half-word with a no-op so we can move to a
+                    # full word
+                    if pending_byte is not None:
+                        words.append(pending_byte + "80")
+                        pending_byte = None
+                    words.append(char_code)
+            if pending_byte is not None:
+                words.append(pending_byte + "80")
+        return words
 
     @staticmethod
     def _format_timestamp(microseconds):
@@ -684,6 +888,8 @@ class _SccTimeTranslator:
 
     def __init__(self):
         self._time = "00:00:00;00"
+        # (frame count of the timestamp, drop frame), parsed on first use
+        self._parsed_time = None
 
         # microseconds. The offset from which we begin the time calculation
         self.offset = 0
@@ -695,50 +901,47 @@ class _SccTimeTranslator:
 
         :rtype: int
         """
-        return self._translate_time(
-            self._time[:-2] + str(int(self._time[-2:]) + self._frames), self.offset
-        )
+        if self._parsed_time is None:
+            self._parsed_time = self._parse_time(self._time)
+        timestamp_frames, drop_frame = self._parsed_time
+
+        # A drop-frame timestamp runs at the same rate as wall clock, a
+        # non-drop-frame one runs "slow" (1 second of timecode is 1.001s).
+        # The frames are counted in thirds of a microsecond so that the
+        # arithmetic stays exact, and frames passed since the timestamp may
+        # overflow past frame 29 without any carrying, before rounding to the
+        # nearest microsecond.
+        if drop_frame:
+            frame_duration = _THIRD_MICROSECONDS_PER_FRAME
+        else:
+            frame_duration = _THIRD_MICROSECONDS_PER_FRAME_NTSC
+        thirds = (timestamp_frames + self._frames) * frame_duration
+        microseconds = (thirds + 1) // 3 - self.offset
+
+        return max(microseconds, 0)
 
     @staticmethod
-    def _translate_time(stamp, offset):
-        """
-        :param stamp:
-        :type offset: int
-        :param offset: Subtract this many microseconds from the calculated time
-            Helpful for when the captions are off by some time interval.
-        :rtype: int
+    def _parse_time(stamp):
+        """Parses a timestamp into its number of frames
+
+        :type stamp: str
+        :rtype: tuple
+        :returns: the number of frames since 00:00:00:00 and whether the
+            timestamp is drop-frame
         """
-        if not re.match(r"\d{2}:\d{2}:\d{2}[:;]\d{1,2}", stamp):
+        match = _TIMESTAMP_RE.match(stamp)
+        if not match:
             raise CaptionReadTimingError(
                 "Timestamps should follow the hour:minute:seconds"
                 ";frames or hour:minute:seconds:frames format. Please correct "
                 f"the following time: {stamp}."
             )
+        hours, minutes, seconds, separator, frames = match.groups()
+        timestamp_frames = (
+            (int(hours) * 60 + int(minutes)) * 60 + int(seconds)
+        ) * 30 + int(frames)
 
-        if ";" in stamp:
-            # Drop-frame timebase runs at the same rate as wall clock
-            seconds_per_timestamp_second = 1.0
-        else:
-            # Non-drop-frame timebase runs "slow"
-            # 1 second of timecode is longer than an actual second (1.001s)
-            seconds_per_timestamp_second = 1001.0 / 1000.0
-
-        time_split = stamp.replace(";", ":").split(":")
-
-        timestamp_seconds = (
-            int(time_split[0]) * 3600
-            + int(time_split[1]) * 60
-            + int(time_split[2])
-            + int(time_split[3]) / 30.0
-        )
-
-        seconds = timestamp_seconds * seconds_per_timestamp_second
-        microseconds = seconds * 1000 * 1000 - offset
-
-        if microseconds < 0:
-            microseconds = 0
-
-        return microseconds
+        return timestamp_frames, separator == ";"
 
     def start_at(self, timespec):
         """Reset the counter to the given time
@@ -746,6 +949,7 @@ class _SccTimeTranslator:
         :type timespec: str
         """
         self._time = timespec
+        self._parsed_time = None
         self._frames = 0
 
     def increment_frames(self):
@@ -761,11 +965,4 @@ def _is_pac_command(word):
 
     :rtype: bool
     """
-    byte1, byte2 = word[:2], word[2:]
-
-    try:
-        PAC_BYTES_TO_POSITIONING_MAP[byte1][byte2]
-    except KeyError:
-        return False
-    else:
-        return True
\ No newline at end of file
+    return DECODED_WORDS.get(word, UNKNOWN_WORD).is_pac
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from itertools import product
 
 COMMANDS = {
@@ -980,6 +981,11 @@ SPECIAL_OR_EXTENDED_CHAR_TO_CODE.update(
     {character: code for code, character in SPECIAL_CHARS.items()}
 )
 
+# The code of every character the writer can encode: 2 hex digits for
+# standard characters, a whole word for special and extended ones
+CHARACTER_TO_SCC_CODE = dict(SPECIAL_OR_EXTENDED_CHAR_TO_CODE)
+CHARACTER_TO_SCC_CODE.update(CHARACTER_TO_CODE)
+
 # Time to transmit a single codeword = 1 second / 29.97
 MICROSECONDS_PER_CODEWORD = 1000.0 * 1000.0 / (30.0 * 1000.0 / 1001.0)
 
@@ -1625,4 +1631,124 @@ PLAIN_TEXT_COMMANDS = {
 
 STYLE_SETTING_COMMANDS = {
     **ITALICS_COMMANDS, **UNDERLINE_COMMANDS, **PLAIN_TEXT_COMMANDS
-}
\ No newline at end of file
+}
+
+# Kinds of 4 letter SCC code words, in the order of precedence used when
+# decoding them
+WORD_COMMAND = 1
+WORD_SPECIAL_CHAR = 2
+WORD_EXTENDED_CHAR = 3
+WORD_CHARACTERS = 4
+
+# How the reader handles a code word:
+# - kind: one of the WORD_* values above, or None if the word is ignored
+# - chars: tuple of the characters the word prints
+# - doubled: whether a repetition of the word is skipped
+# - doubled_after_starter: same, after a doubled cue starting command
+# - is_pac: whether it is a Preamble Address Code
+# - starts_cue: whether it is in CUE_STARTING_COMMAND
+# - is_tab_offset: whether it is in PAC_TAB_OFFSET_COMMANDS
+DecodedWord = namedtuple('DecodedWord', [
+    'kind', 'chars', 'doubled', 'doubled_after_starter', 'is_pac',
+    'starts_cue', 'is_tab_offset',
+])
+
+UNKNOWN_WORD = DecodedWord(None, (), False, False, False, False, False)
+
+
+def _create_decoded_word_table():
+    """Classify every code word known to the reader once, so that decoding
+    a word takes a single dictionary lookup. Words missing from the table
+    decode to UNKNOWN_WORD.
+    """
+    pac_words = {
+        high_byte + low_byte
+        for high_byte, low_bytes in PAC_BYTES_TO_POSITIONING_MAP.items()
+        for low_byte in low_bytes
+    }
+
+    # least to most precedence, so that later kinds override earlier ones
+    kinds = {
+        byte1 + byte2: (WORD_CHARACTERS, (char1, char2))
+        for byte1, char1 in CHARACTERS.items()
+        for byte2, char2 in CHARACTERS.items()
+    }
+    kinds.update({
+        word: (WORD_EXTENDED_CHAR, (char,))
+        for word, char in EXTENDED_CHARS.items()
+    })
+    kinds.update({
+        word: (WORD_SPECIAL_CHAR, (char,))
+        for word, char in SPECIAL_CHARS.items()
+    })
+    kinds.update({
+        word: (WORD_COMMAND, ())
+        for word in list(COMMANDS) + list(pac_words)
+    })
+
+    table = {}
+    words = (set(kinds) | set(CUE_STARTING_COMMAND)
+             | set(PAC_TAB_OFFSET_COMMANDS))
+    for word in words:
+        kind, chars = kinds.get(word, (None, ()))
+        is_pac = word in pac_words
+        doubled = (
+            (word != '94a1' and word in COMMANDS) or is_pac
+            or word in SPECIAL_CHARS
+        )
+        table[word] = DecodedWord(
+            kind=kind,
+            chars=chars,
+            doubled=doubled,
+            doubled_after_starter=(
+                doubled or word in EXTENDED_CHARS or word == '94a1'),
+            is_pac=is_pac,
+            starts_cue=word in CUE_STARTING_COMMAND,
+            is_tab_offset=word in PAC_TAB_OFFSET_COMMANDS,
+        )
+    return table
+
+
+DECODED_WORDS = _create_decoded_word_table()
+
+
+def _with_odd_parity(byte):
+    if bin(byte).count('1') % 2 == 0:
+        return byte | 0x80
+    return byte
+
+
+def _create_channel_word_table():
+    """Map the control words of every caption channel to their channel 1
+    (CC1) equivalent, which is what the reader's tables are keyed by.
+
+    Channels 2 and 4 use the first bytes 0x18-0x1f instead of 0x10-0x17.
+    Only the miscellaneous control codes tell the fields apart: they start
+    with 0x14 (CC1), 0x1c (CC2), 0x15 (CC3) or 0x1d (CC4). Every other word
+    belongs to the field of the last miscellaneous control code.
+
+    :returns: a dict of word: (data channel (1 or 2), field (1, 2 or None),
+        CC1 word)
+    """
+    table = {}
+    for first_byte in range(0x10, 0x20):
+        data_channel = 2 if first_byte & 0x08 else 1
+        cc1_first_byte = first_byte & ~0x08
+        for second_byte in range(0x20, 0x80):
+            field = None
+            if cc1_first_byte in (0x14, 0x15) and second_byte < 0x30:
+                field = 2 if cc1_first_byte == 0x15 else 1
+                cc1_first_byte_for_word = 0x14
+            else:
+                cc1_first_byte_for_word = cc1_first_byte
+            # the reader's tables also have some words with a wrong parity
+            # bit on the second byte, so both forms are routed
+            for second in {_with_odd_parity(second_byte), second_byte | 0x80}:
+                word = f'{_with_odd_parity(first_byte):02x}{second:02x}'
+                cc1_word = (f'{_with_odd_parity(cc1_first_byte_for_word):02x}'
+                            f'{second:02x}')
+                table[word] = (data_channel, field, cc1_word)
+    return table
+
+
+CHANNEL_WORDS = _create_channel_word_table()
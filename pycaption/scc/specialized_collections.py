@@ -36,6 +36,8 @@ class PreCaption:
     used to eventually instantiate an actual Caption object.
     """
 
+    __slots__ = ("start", "end", "nodes", "style", "layout_info")
+
     def __init__(self, start=0, end=0):
         self.start = start
         self.end = end
@@ -314,6 +316,17 @@ class InstructionNodeCreator:
         )
         self._position_tracer = position_tracker
 
+    def detach(self):
+        """Stops interrogating the shared position tracker, so that the nodes
+        collected so far can be handed over (e.g. to a pop-on cue waiting to
+        be displayed) without copying them. No more chars or commands should
+        be added to a detached instance.
+
+        :rtype: InstructionNodeCreator
+        """
+        self._position_tracer = None
+        return self
+
     def is_empty(self):
         """Whether any text was added to the buffer"""
         return not any(element.text for element in self._collection)
@@ -579,7 +592,7 @@ def _get_layout_from_tuple(position_tuple):
     horizontal = Size(80 * column / 32.0 + 10, UnitEnum.PERCENT)
     # Vertical safe area between 5% and 95%
     vertical = Size(90 * (row - 1) / 15.0 + 5, UnitEnum.PERCENT)
-    return Layout(
+    return Layout.intern(
         origin=Point(horizontal, vertical),
         alignment=Alignment(HorizontalAlignmentEnum.LEFT, VerticalAlignmentEnum.TOP),
     )
@@ -593,6 +606,8 @@ class _InstructionNode:
     be easily converted to a CaptionNode.
     """
 
+    __slots__ = ("text", "position", "_type")
+
     TEXT = 0
     BREAK = 1
     ITALICS_ON = 2
@@ -1,5 +1,39 @@
+import re
+
 from pycaption.scc.constants import ALL_CHARACTERS, COMMAND_LABELS
 
+_WORD_RE = re.compile(r'\S+')
+
+
+def _create_word_label_table():
+    """Precompute the label of every word translate_scc can translate: the
+    commands, the characters and the words made of 2 characters
+    """
+    labels = {
+        first + second: f"{first_char}{second_char}"
+        for first, first_char in ALL_CHARACTERS.items() if len(first) == 2
+        for second, second_char in ALL_CHARACTERS.items()
+    }
+    labels.update(ALL_CHARACTERS)
+    labels.update(COMMAND_LABELS)
+    return {word: label for word, label in labels.items() if label}
+
+
+WORD_LABELS = _create_word_label_table()
+
+
+def _word_translator(brackets):
+    opening_bracket, closing_bracket = brackets if brackets else ('', '')
+
+    def translate_word(match):
+        word = match.group()
+        name = WORD_LABELS.get(word)
+        if name is None:
+            return word
+        return f"{opening_bracket}{name}{closing_bracket}"
+
+    return translate_word
+
 
 def translate_scc(scc_content, brackets='[]'):
     """
@@ -16,17 +50,21 @@ def translate_scc(scc_content, brackets='[]'):
     :return: Translated SCC captions
     :rtype: str
     """
-    opening_bracket, closing_bracket = brackets if brackets else ('', '')
-    scc_elements = set(scc_content.split())
-    for elem in scc_elements:
-        name = COMMAND_LABELS.get(elem, ALL_CHARACTERS.get(elem))
-        # If a 2 byte command was not found, try retrieving 1 byte characters
-        if not name:
-            char1 = ALL_CHARACTERS.get(elem[:2])
-            char2 = ALL_CHARACTERS.get(elem[2:])
-            if char1 is not None and char2 is not None:
-                name = f"{char1}{char2}"
-        if name:
-            scc_content = scc_content.replace(
-                elem, f"{opening_bracket}{name}{closing_bracket}")
-    return scc_content
\ No newline at end of file
+    return _WORD_RE.sub(_word_translator(brackets), scc_content)
+
+
+def iter_translate_scc(lines, brackets='[]'):
+    """
+    Same as translate_scc, one line at a time, for files too large to be
+    translated at once
+
+    :param lines: SCC lines to be translated, e.g. an open file
+    :type lines: iterable of str
+    :param brackets: Brackets to group the translated content of a command
+    :type brackets: str
+    :return: the translated lines, line endings included
+    :rtype: iterator of str
+    """
+    translate_word = _word_translator(brackets)
+    for line in lines:
+        yield _WORD_RE.sub(translate_word, line)
@@ -1,7 +1,8 @@
-from copy import deepcopy
+from io import StringIO
 
 from .base import (
     BaseReader, BaseWriter, CaptionSet, CaptionList, Caption, CaptionNode,
+    iter_lines,
 )
 from .exceptions import CaptionReadNoCaptions, InvalidInputError
 
@@ -23,52 +24,21 @@ class SRTReader(BaseReader):
 
     def read(self, content, lang='en-US', strip_html=False, strip_ass_tags=False):
         if strip_html:
-            warnings.warn("Using strip_html in the read function is deprecated. "
-                          "Use CaptionSet.strip_html_tags() instead", DeprecationWarning)
+            warnings.warn("Using strip_html in the read function is "
+                          "deprecated. Use CaptionSet.strip_html_tags() "
+                          "instead", DeprecationWarning)
 
         if strip_ass_tags:
-            warnings.warn("Using strip_ass_tags in the read function is deprecated. "
-                          "Use CaptionSet.strip_ass_tags() instead", DeprecationWarning)
+            warnings.warn("Using strip_ass_tags in the read function is "
+                          "deprecated. Use CaptionSet.strip_ass_tags() "
+                          "instead", DeprecationWarning)
 
         if not isinstance(content, str):
             raise InvalidInputError('The content is not a unicode string.')
 
-        lines = content.splitlines()
-        start_line = 0
-        captions = CaptionList()
-
-        while start_line < len(lines):
-            if not lines[start_line].isdigit():
-                break
-
-            end_line = self._find_text_line(start_line, lines)
-
-            timing = lines[start_line + 1].split('-->')
-            start = self._srttomicro(timing[0].strip(' \r\n'))
-            end = self._srttomicro(timing[1].strip(' \r\n'))
-
-            nodes = []
-
-            for line in lines[start_line + 2:end_line - 1]:
-                # skip extra blank lines
-                if not nodes or line != '':
-                    txt = line
-                    if strip_html:
-                        txt = SRTReader.RE_HTML.sub('', txt)
-
-                    if strip_ass_tags:
-                        txt = SRTReader.RE_ASS.sub('', txt)
-                    nodes.append(CaptionNode.create_text(txt))
-                    nodes.append(CaptionNode.create_break())
-
-            if len(nodes):
-                # remove last line break from end of caption list
-                nodes.pop()
-                caption = Caption(start, end, nodes)
-                captions.append(caption)
-
-            start_line = end_line
-
+        captions = CaptionList(
+            self._parse_lines(content.splitlines(), strip_html, strip_ass_tags)
+        )
         caption_set = CaptionSet({lang: captions})
 
         if caption_set.is_empty():
@@ -76,6 +46,76 @@ class SRTReader(BaseReader):
 
         return caption_set
 
+    def iter_captions(self, fileobj, encoding='utf-8-sig'):
+        """
+        Parse an SRT stream cue by cue, yielding each Caption as soon as it
+        is complete, so the whole file never has to be held in memory.
+
+        The captions are not stripped of HTML or ASS tags; collect them in a
+        CaptionSet and use its strip_html_tags() / strip_ass_tags() for that.
+
+        :param fileobj: a text or binary file-like object (or any iterable
+            of lines)
+        :param encoding: used to decode lines when the stream is binary
+        """
+        return self._parse_lines(iter_lines(fileobj, encoding))
+
+    def _parse_lines(self, lines, strip_html=False, strip_ass_tags=False):
+        # A cue block runs from its number line up to (and including) the
+        # blank lines separating it from the next non-blank line.
+        block = []
+        found_blank = False
+
+        for line in lines:
+            if not block:
+                if not line.isdigit():
+                    return
+            elif line.strip() == '':
+                found_blank = True
+            elif found_blank:
+                # the last blank line is the cue separator, not cue text
+                caption = self._build_caption(
+                    block, block[2:-1], strip_html, strip_ass_tags)
+                if caption:
+                    yield caption
+                block = []
+                found_blank = False
+                if not line.isdigit():
+                    return
+            block.append(line)
+
+        if block:
+            caption = self._build_caption(
+                block, block[2:], strip_html, strip_ass_tags)
+            if caption:
+                yield caption
+
+    def _build_caption(self, block, text_lines, strip_html, strip_ass_tags):
+        timing = block[1].split('-->')
+        start = self._srttomicro(timing[0].strip(' \r\n'))
+        end = self._srttomicro(timing[1].strip(' \r\n'))
+
+        nodes = []
+
+        for line in text_lines:
+            # skip extra blank lines
+            if not nodes or line != '':
+                txt = line
+                if strip_html:
+                    txt = SRTReader.RE_HTML.sub('', txt)
+
+                if strip_ass_tags:
+                    txt = SRTReader.RE_ASS.sub('', txt)
+                nodes.append(CaptionNode.create_text(txt))
+                nodes.append(CaptionNode.create_break())
+
+        if not nodes:
+            return None
+
+        # remove last line break from end of caption list
+        nodes.pop()
+        return Caption(start, end, nodes)
+
     def _srttomicro(self, stamp):
         timesplit = stamp.split(':')
 
@@ -97,25 +137,16 @@ class SRTReader(BaseReader):
 
         return microseconds
 
-    def _find_text_line(self, start_line, lines):
-        end_line = start_line
-
-        found = False
-        while end_line < len(lines):
-            if lines[end_line].strip() == "":
-                found = True
-            elif found is True:
-                end_line -= 1
-                break
-            end_line += 1
-
-        return end_line + 1
-
 
 class SRTWriter(BaseWriter):
     VALID_POSITION = ['top', 'bottom']
 
     def write(self, caption_set, position='bottom'):
+        output = StringIO()
+        self.write_to(caption_set, output, position=position)
+        return output.getvalue()
+
+    def write_to(self, caption_set, fp, position='bottom'):
         position = position.lower().strip()
         if position not in SRTWriter.VALID_POSITION:
             raise ValueError('Unknown position. Supported: {}'.format(','.join(SRTWriter.VALID_POSITION)))
@@ -123,19 +154,12 @@ class SRTWriter(BaseWriter):
         if position == 'top' and not all([self.video_width, self.video_height]):
             raise ValueError('Top position requires video width and height.')
 
-        caption_set = deepcopy(caption_set)
+        for index, lang in enumerate(caption_set.get_languages()):
+            if index:
+                fp.write('MULTI-LANGUAGE SRT\n')
+            self._write_lang(caption_set.get_captions(lang), fp, position)
 
-        srt_captions = []
-
-        for lang in caption_set.get_languages():
-            srt_captions.append(
-                self._recreate_lang(caption_set.get_captions(lang), position)
-            )
-
-        caption_content = 'MULTI-LANGUAGE SRT\n'.join(srt_captions)
-        return caption_content
-
-    def _recreate_lang(self, captions, position='bottom'):
+    def _write_lang(self, captions, fp, position='bottom'):
         # Merge caption's that are on the exact same timestamp otherwise some
         # players will play them in reversed order, libass specifically which is
         # used quite a lot, including VLC and MPV.
@@ -157,7 +181,6 @@ class SRTWriter(BaseWriter):
                 merged_captions.append(caption)
         captions = merged_captions
 
-        srt = ''
         count = 1
 
         for caption in captions:
@@ -171,7 +194,10 @@ class SRTWriter(BaseWriter):
             while '\n\n' in new_content:
                 new_content = new_content.replace('\n\n', '\n')
 
-            srt += f'{count}\n'
+            if count > 1:
+                # blank line separating this cue from the previous one
+                fp.write('\n')
+            fp.write(f'{count}\n')
 
             start = caption.format_start(msec_separator=',')
             end = caption.format_end(msec_separator=',')
@@ -196,13 +222,10 @@ class SRTWriter(BaseWriter):
                 timestamp = '%s --> %s X1:%s X2:%s Y1:%s Y2:%s' % (start[:12], end[:12], x1, x2, y1, y2)
             else:
                 raise ValueError('Unsupported position: %s' % position)
-            srt += f'{timestamp}\n'
-            srt += f"{new_content}\n\n"
+            fp.write(f'{timestamp}\n{new_content}\n')
 
             count += 1
 
-        return srt[:-1]  # remove unwanted newline at end of file
-
     def _recreate_line(self, srt, line):
         if line.type_ == CaptionNode.TEXT:
             return srt + f'{line.content} '
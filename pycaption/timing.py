@@ -0,0 +1,159 @@
+"""
+Columnar view over the timing of a CaptionSet, for bulk timing operations
+(offsets, frame-rate conversions, frame snapping, gap enforcement) on large
+caption sets.
+
+The start and end times of each language are held as two int64 arrays when
+NumPy is installed (``pip install pycaption[numpy]``) so that every operation
+runs vectorised; otherwise plain lists of ints are used. The Caption objects
+themselves are only updated when ``apply`` is called.
+"""
+
+try:
+    import numpy
+except ModuleNotFoundError:
+    numpy = None
+
+MICROSECONDS_PER_SECOND = 1000000
+
+
+class CaptionTimingView:
+    def __init__(self, caption_set, use_numpy=None):
+        """
+        :param caption_set: the CaptionSet whose timing is operated on
+        :param use_numpy: whether to use the NumPy backend. Defaults to using
+            it if it is installed.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ModuleNotFoundError(
+                'Missing Dependency You must install numpy')
+
+        self.caption_set = caption_set
+        self.use_numpy = use_numpy
+        self._starts = {}
+        self._ends = {}
+        # the caption lists the times were taken from, and their lengths, to
+        # make sure the times are written back to the same captions
+        self._captions = {}
+
+        for lang in caption_set.get_languages():
+            captions = caption_set.get_captions(lang)
+            self._captions[lang] = (captions, len(captions))
+            starts = [int(caption.start) for caption in captions]
+            ends = [int(caption.end) for caption in captions]
+            if use_numpy:
+                starts = numpy.array(starts, dtype=numpy.int64)
+                ends = numpy.array(ends, dtype=numpy.int64)
+            self._starts[lang] = starts
+            self._ends[lang] = ends
+
+    def get_starts(self, lang):
+        return self._starts[lang]
+
+    def get_ends(self, lang):
+        return self._ends[lang]
+
+    def offset(self, microseconds):
+        """Shift all the captions by the given (possibly negative) amount."""
+        microseconds = int(microseconds)
+        return self._map(lambda times: times + microseconds,
+                         lambda time: time + microseconds)
+
+    def skew(self, rate):
+        """
+        Multiply all the timestamps by rate, e.g. 24000 / 1001 / 25 to
+        convert captions timed for 23.976 fps video to 25 fps.
+        """
+        return self._map(
+            lambda times: numpy.rint(times * rate).astype(numpy.int64),
+            lambda time: round(time * rate))
+
+    def clamp(self, minimum=0, maximum=None):
+        """Limit all the timestamps to the [minimum, maximum] range."""
+        def clamp_time(time):
+            time = max(time, minimum)
+            if maximum is not None:
+                time = min(time, maximum)
+            return time
+
+        return self._map(
+            lambda times: numpy.clip(times, minimum, maximum),
+            clamp_time)
+
+    def snap_to_frames(self, fps):
+        """Round all the timestamps to the closest frame boundary."""
+        frame_duration = MICROSECONDS_PER_SECOND / fps
+        return self._map(
+            lambda times: numpy.rint(
+                numpy.rint(times / frame_duration) * frame_duration
+            ).astype(numpy.int64),
+            lambda time: round(round(time / frame_duration) * frame_duration))
+
+    def enforce_gap(self, min_gap):
+        """
+        Make sure there are at least min_gap microseconds between the end of
+        a caption and the start of the next one (in start time order), by
+        cutting the end of the former. Ends are never moved before starts.
+        """
+        for lang in self._starts:
+            starts = self._starts[lang]
+            ends = self._ends[lang]
+            if len(starts) < 2:
+                continue
+
+            if self.use_numpy:
+                order = numpy.argsort(starts, kind='stable')
+                sorted_starts = starts[order]
+                sorted_ends = ends[order]
+                sorted_ends[:-1] = numpy.maximum(
+                    sorted_starts[:-1],
+                    numpy.minimum(sorted_ends[:-1],
+                                  sorted_starts[1:] - min_gap))
+                ends[order] = sorted_ends
+            else:
+                order = sorted(range(len(starts)), key=starts.__getitem__)
+                for current, following in zip(order, order[1:]):
+                    ends[current] = max(
+                        starts[current],
+                        min(ends[current], starts[following] - min_gap))
+        return self
+
+    def apply(self):
+        """
+        Write the timing held by this view back to the Caption objects.
+
+        :raises ValueError: if the captions of a language were replaced, added
+            or removed since the view was created
+        """
+        for lang, (captions, length) in self._captions.items():
+            current = self.caption_set.get_captions(lang)
+            if current is not captions or len(current) != length:
+                raise ValueError(
+                    f'The captions of the language "{lang}" changed since '
+                    f'the timing view was created')
+
+        for lang in self._starts:
+            starts = self._starts[lang]
+            ends = self._ends[lang]
+            if self.use_numpy:
+                starts = starts.tolist()
+                ends = ends.tolist()
+
+            captions = self._captions[lang][0]
+            for caption, start, end in zip(captions, starts, ends):
+                caption.start = start
+                caption.end = end
+            self.caption_set.set_captions(lang, captions)
+        return self.caption_set
+
+    def _map(self, vectorised, scalar):
+        for lang in self._starts:
+            if self.use_numpy:
+                self._starts[lang] = vectorised(self._starts[lang])
+                self._ends[lang] = vectorised(self._ends[lang])
+            else:
+                self._starts[lang] = [scalar(t) for t in self._starts[lang]]
+                self._ends[lang] = [scalar(t) for t in self._ends[lang]]
+        return self
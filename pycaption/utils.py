@@ -8,3 +8,57 @@ def is_leaf(element):
     if not name or name == 'br':
         return True
     return False
+
+
+def quote_attribute_value(value):
+    """Quote the value as BeautifulSoup does: with double quotes, or single
+    ones if the value contains double quotes
+    """
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', '&quot;') + '"'
+        return f"'{value}'"
+    return f'"{value}"'
+
+
+class MarkupTag:
+    """A tag of a document being written: its attributes, and either its
+    child tags or its content, as markup
+    """
+    __slots__ = ('name', 'attrs', 'contents', 'string')
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.contents = []
+        self.string = None
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def __setitem__(self, key, value):
+        self.attrs[key] = value
+
+    def append(self, tag):
+        self.contents.append(tag)
+
+    def serialize(self, pieces, indent=''):
+        """Append the markup of the tag to pieces, laid out as BeautifulSoup's
+        prettify(formatter=None) used to lay it out: one tag per line, indented
+        by one space per level, with the attributes in alphabetical order.
+        """
+        attributes = ''.join(
+            f' {name}={quote_attribute_value(str(value))}'
+            for name, value in sorted(self.attrs.items())
+        )
+        if self.string is None and not self.contents:
+            pieces.append(f'{indent}<{self.name}{attributes}/>\n')
+            return
+        pieces.append(f'{indent}<{self.name}{attributes}>\n')
+        if self.string is not None:
+            string = self.string.strip()
+            if string:
+                pieces.append(f'{indent} {string}\n')
+        for tag in self.contents:
+            tag.serialize(pieces, indent + ' ')
+        pieces.append(f'{indent}</{self.name}>\n')
@@ -1,9 +1,12 @@
 import datetime
 import re
 import sys
-from copy import deepcopy
+from io import StringIO
 
-from .base import BaseReader, BaseWriter, Caption, CaptionList, CaptionNode, CaptionSet
+from .base import (
+    BaseReader, BaseWriter, Caption, CaptionList, CaptionNode, CaptionSet,
+    iter_lines,
+)
 from .exceptions import (
     CaptionReadError,
     CaptionReadNoCaptions,
@@ -12,7 +15,7 @@ from .exceptions import (
 )
 from .geometry import (
     Alignment, HorizontalAlignmentEnum, Layout, Point, Size, UnitEnum,
-    VerticalAlignmentEnum,
+    VerticalAlignmentEnum, sharing_instances,
 )
 
 # A WebVTT timing line has both start/end times and layout related settings
@@ -71,24 +74,42 @@ class WebVTTReader(BaseReader):
 
         return caption_set
 
+    def iter_captions(self, fileobj, encoding="utf-8-sig"):
+        """
+        Parse a WebVTT stream, yielding each Caption as soon as the blank
+        line terminating its cue is seen, so arbitrarily large inputs can be
+        converted in constant memory.
+
+        :param fileobj: a text or binary file-like object (or any iterable
+            of lines)
+        :param encoding: used to decode lines when the stream is binary
+        """
+        return self._iter_parse(iter_lines(fileobj, encoding))
+
     def _parse(self, lines):
-        captions = CaptionList()
+        return CaptionList(self._iter_parse(lines))
+
+    def _iter_parse(self, lines):
         start = None
         end = None
         nodes = []
         layout_info = None
         found_timing = False
+        # Start time of the last emitted caption, used to validate ordering
+        last_start_time = 0
+        # The layouts shared by the cues of this document
+        layouts = {}
 
         for i, line in enumerate(lines):
 
             if "-->" in line:
                 found_timing = True
                 timing_line = i
-                last_start_time = captions[-1].start if captions else 0
                 try:
-                    start, end, layout_info = self._parse_timing_line(
-                        line, last_start_time
-                    )
+                    with sharing_instances(layouts):
+                        start, end, layout_info = self._parse_timing_line(
+                            line, last_start_time
+                        )
                 except CaptionReadError as e:
                     new_msg = f"{e.args[0]} (line {timing_line})"
                     tb = sys.exc_info()[2]
@@ -97,8 +118,8 @@ class WebVTTReader(BaseReader):
             elif "" == line:
                 if found_timing and nodes:
                     found_timing = False
-                    caption = Caption(start, end, nodes, layout_info=layout_info)
-                    captions.append(caption)
+                    yield Caption(start, end, nodes, layout_info=layout_info)
+                    last_start_time = start
                     nodes = []
             else:
                 if found_timing:
@@ -111,10 +132,7 @@ class WebVTTReader(BaseReader):
 
         # Add a last caption if there are remaining nodes
         if nodes:
-            caption = Caption(start, end, nodes, layout_info=layout_info)
-            captions.append(caption)
-
-        return captions
+            yield Caption(start, end, nodes, layout_info=layout_info)
 
     def _remove_styles(self, line):
         partial_result = VOICE_SPAN_PATTERN.sub("\\2: ", line)
@@ -214,7 +232,7 @@ class WebVTTReader(BaseReader):
             )
             alignment = Alignment(h_align, v_align)
 
-        return Layout(
+        return Layout.intern(
             origin=origin,
             alignment=alignment,
             webvtt_positioning=cue_settings,
@@ -266,18 +284,50 @@ class WebVTTWriter(BaseWriter):
     video_width = None
     video_height = None
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_memos()
+
+    def _reset_memos(self):
+        """Forget the cue settings and the styles computed for the previous
+        caption set. A file typically has a handful of distinct layouts and
+        style classes, so they are only converted once per write.
+        """
+        # (Layout, webvtt_positioning) -> cue settings
+        self._cue_settings = {}
+        # id(Layout) -> (Layout, cue settings), to skip hashing the layouts
+        # the nodes share
+        self._cue_settings_by_id = {}
+        # style class -> resulting style
+        self._class_styles = {}
+
     def write(self, caption_set, lang=None, force_hours=False, include_sequence_numbers=False):
         """
         :type caption_set: CaptionSet
         @param force_hours: force writing timestamps in full (hh:mm:ss.xxx) even when "hour" is 0
         :type lang: str
         """
-        output = self.HEADER
+        output = StringIO()
+        self.write_to(
+            caption_set, output, lang=lang, force_hours=force_hours,
+            include_sequence_numbers=include_sequence_numbers,
+        )
+        return output.getvalue()
 
-        if caption_set.is_empty():
-            return output
+    def write_to(self, caption_set, fp, lang=None, force_hours=False,
+                 include_sequence_numbers=False):
+        """
+        Same as ``write``, but each cue is written to ``fp`` as soon as it
+        is converted.
 
-        caption_set = deepcopy(caption_set)
+        :type caption_set: CaptionSet
+        :param fp: a writable file-like object
+        """
+        fp.write(self.HEADER)
+        self._reset_memos()
+
+        if caption_set.is_empty():
+            return
 
         # TODO: styles. These go into a separate CSS file, which doesn't really
         # fit the API here. Figure that out.  Though some style stuff can be
@@ -289,16 +339,15 @@ class WebVTTWriter(BaseWriter):
         self.global_layout = caption_set.get_layout_info(lang)
 
         captions = caption_set.get_captions(lang)
-        captions_out = []
         count = 1 if include_sequence_numbers else None
-        for caption in captions:
-            converted_caption = self._convert_caption(caption_set, caption, force_hours, count=count)
-            captions_out.append(converted_caption)
+        for index, caption in enumerate(captions):
+            if index:
+                fp.write("\n")
+            fp.write(self._convert_caption(
+                caption_set, caption, force_hours, count=count))
             if count is not None:
                 count += 1
 
-        return output + "\n".join(captions_out)
-
     def _timestamp(self, ts, force_hours):
         td = datetime.timedelta(microseconds=ts)
         mm, ss = divmod(td.seconds, 60)
@@ -329,16 +378,23 @@ class WebVTTWriter(BaseWriter):
             style_classes = [style["class"]]
 
         for style_class in style_classes:
-            sub_style = caption_set.get_style(style_class).copy()
-            # Recursively resolve class attributes and calculate style
             resulting_style.update(
-                self._calculate_resulting_style(sub_style, caption_set)
-            )
+                self._calculate_class_style(style_class, caption_set))
 
         resulting_style.update(style)
 
         return resulting_style
 
+    def _calculate_class_style(self, style_class, caption_set):
+        class_style = self._class_styles.get(style_class)
+        if class_style is None:
+            sub_style = caption_set.get_style(style_class).copy()
+            # Recursively resolve class attributes and calculate style
+            class_style = self._calculate_resulting_style(
+                sub_style, caption_set)
+            self._class_styles[style_class] = class_style
+        return class_style
+
     def _convert_caption(self, caption_set, caption, force_hours, count=None):
         """
         :type caption: Caption
@@ -364,7 +420,7 @@ class WebVTTWriter(BaseWriter):
         for cue_text, layout in layout_groups:
             if not layout:
                 layout = caption.layout_info or self.global_layout
-            cue_settings = self._convert_positioning(layout)
+            cue_settings = self._get_cue_settings(layout)
             if count is not None:
                 output += f"{count}\n"
             output += timespan + cue_settings + "\n"
@@ -372,6 +428,21 @@ class WebVTTWriter(BaseWriter):
 
         return output
 
+    def _get_cue_settings(self, layout):
+        """_convert_positioning, memoized for the duration of a write"""
+        cached = self._cue_settings_by_id.get(id(layout))
+        if cached is not None and cached[0] is layout:
+            return cached[1]
+
+        # Layouts compare equal regardless of their webvtt_positioning
+        key = (layout, getattr(layout, 'webvtt_positioning', None))
+        cue_settings = self._cue_settings.get(key)
+        if cue_settings is None:
+            cue_settings = self._convert_positioning(layout)
+            self._cue_settings[key] = cue_settings
+        self._cue_settings_by_id[id(layout)] = (layout, cue_settings)
+        return cue_settings
+
     def _convert_positioning(self, layout):
         """
         Return WebVTT cue settings string based on layout info
@@ -22,6 +22,8 @@ dev_dependencies = ["pytest", "pytest-lazy-fixture"]
 
 transcript_dependencies = ["nltk==3.8.0"]
 
+numpy_dependencies = ["numpy"]
+
 setup(
     name="pycaption",
     version="2.2.15",
@@ -36,7 +38,11 @@ setup(
     },
     python_requires=">=3.8,<4.0",
     install_requires=dependencies,
-    extras_require={"dev": dev_dependencies, "transcript": transcript_dependencies},
+    extras_require={
+        "dev": dev_dependencies,
+        "transcript": transcript_dependencies,
+        "numpy": numpy_dependencies,
+    },
     packages=find_packages(),
     include_package_data=True,
     classifiers=[
@@ -56,6 +56,7 @@ from tests.fixtures.scc import (  # noqa: F401
     sample_scc_pop_on, sample_scc_multiple_positioning, sample_scc_with_italics,
     sample_scc_empty, sample_scc_roll_up_ru2, sample_scc_roll_up_ru3,
     sample_no_positioning_at_all_scc, sample_scc_with_line_too_long,
+    sample_scc_multiple_channels,
     sample_scc_no_explicit_end_to_last_caption, sample_scc_flashing_cue,
     sample_scc_eoc_first_command, sample_scc_with_extended_characters,
     sample_scc_with_ampersand_character, sample_scc_multiple_formats,
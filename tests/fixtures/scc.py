@@ -495,6 +495,22 @@ Scenarist_SCC V1.0
 """
 
 
+# "Hello" on CC1, "Hola" on CC2 and "Salut" on CC3, interleaved
+@pytest.fixture(scope="session")
+def sample_scc_multiple_channels():
+    return """\
+Scenarist_SCC V1.0
+
+00:00:01;00	9420 9420 94ae 94ae 9470 9470 c8e5 ecec ef80 942f 942f
+
+00:00:01;20	1c20 1c20 1cae 1cae 1c70 1c70 c8ef ec61 1c2f 1c2f
+
+00:00:02;10	1520 1520 15ae 15ae 9470 9470 d361 ec75 f480 152f 152f
+
+00:00:04;00	942c 942c 1c2c 1c2c 152c 152c
+"""
+
+
 @pytest.fixture(scope="function")
 def sample_scc_mid_row_before_text_pop():
     return """\
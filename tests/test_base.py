@@ -1,6 +1,9 @@
 import pytest
 
-from pycaption.base import CaptionList, Caption, CaptionNode, CaptionSet
+from pycaption.base import (
+    BaseWriter, CaptionList, Caption, CaptionNode, CaptionSet,
+)
+from pycaption.geometry import Layout, Point
 
 
 class TestCaption:
@@ -13,6 +16,14 @@ class TestCaption:
     def test_format_end(self):
         assert self.caption.format_end() == '13:46:39.999'
 
+    def test_slotted_attributes_are_mutable(self):
+        self.caption.start = 1000
+        self.caption.layout_info = "My Layout"
+
+        assert not hasattr(self.caption, '__dict__')
+        assert (self.caption.start, self.caption.layout_info) == \
+            (1000, "My Layout")
+
 
 class TestCaptionList:
     def setup_method(self):
@@ -58,6 +69,85 @@ class TestCaptionList:
             newcaps = self.caps + CaptionList([4], layout_info="Other Layout")
 
 
+class TestCaptionListIntervalIndex:
+    def setup_method(self):
+        self.first = Caption(0, 10, [CaptionNode.create_text("first")])
+        self.long = Caption(5, 100, [CaptionNode.create_text("long")])
+        self.last = Caption(30, 40, [CaptionNode.create_text("last")])
+        self.caps = CaptionList([self.last, self.first, self.long])
+
+    def test_active_at(self):
+        assert self.caps.active_at(7) == [self.first, self.long]
+        assert self.caps.active_at(35) == [self.long, self.last]
+
+    def test_active_at_excludes_end_time(self):
+        assert self.caps.active_at(10) == [self.long]
+        assert self.caps.active_at(100) == []
+
+    def test_overlapping(self):
+        assert self.caps.overlapping(10, 30) == [self.long]
+        assert self.caps.overlapping(9, 31) == [
+            self.first, self.long, self.last]
+
+    def test_index_is_invalidated_on_append(self):
+        assert self.caps.active_at(150) == []
+
+        later = Caption(120, 200, [CaptionNode.create_text("later")])
+        self.caps.append(later)
+
+        assert self.caps.active_at(150) == [later]
+
+    def test_index_is_invalidated_on_extend(self):
+        assert self.caps.active_at(150) == []
+
+        later = Caption(120, 200, [CaptionNode.create_text("later")])
+        self.caps.extend([later])
+
+        assert self.caps.active_at(150) == [later]
+
+    def test_index_is_invalidated_on_set_captions(self):
+        caption_set = CaptionSet({"en": self.caps})
+        assert self.caps.active_at(150) == []
+
+        self.last.end = 200
+        caption_set.set_captions("en", self.caps)
+
+        assert self.caps.active_at(150) == [self.last]
+
+    def test_index_is_invalidated_on_sane_start_times(self):
+        first = Caption(0, 5000000, [CaptionNode.create_text("a")])
+        second = Caption(3000000, 8000000, [CaptionNode.create_text("b")])
+        caps = CaptionList([first, second])
+        caption_set = CaptionSet({"en": caps})
+        assert caps.active_at(4000000) == [first, second]
+
+        caption_set.make_sure_of_sane_start_times_and_gap()
+
+        assert caps.active_at(4000000) == [first]
+
+    def test_timing_changes_of_plain_lists(self):
+        first = Caption(0, 5000000, [CaptionNode.create_text("a")])
+        second = Caption(3000000, 8000000, [CaptionNode.create_text("b")])
+        caption_set = CaptionSet({"en": [first, second]})
+
+        caption_set.make_sure_of_sane_start_times_and_gap()
+        caption_set.adjust_caption_timing(offset=1000000)
+
+        assert [(caption.start, caption.end)
+                for caption in caption_set.get_captions("en")] == [
+            (1000000, 6000000), (6250000, 9000000)]
+
+    def test_index_is_invalidated_on_adjust_caption_timing(self):
+        caption_set = CaptionSet({"en": self.caps})
+        assert self.caps.active_at(135) == []
+
+        caption_set.adjust_caption_timing(offset=100)
+
+        assert self.caps.active_at(135) == [self.long, self.last]
+        assert caption_set.get_captions("en").active_at(135) == [
+            self.long, self.last]
+
+
 class TestCaptionSetRemoveStyling:
     def setup_method(self):
         nodes = [
@@ -92,3 +182,138 @@ class TestCaptionSetRemoveStyling:
             (CaptionNode.BREAK, None),
             (CaptionNode.TEXT, "world"),
         ]
+
+
+class TestCaptionSetCopyWithLayout:
+    def setup_method(self):
+        self.plain = Caption(0, 1000, [CaptionNode.create_text("plain")])
+        self.positioned = Caption(
+            1000, 2000,
+            [CaptionNode.create_text("positioned", layout_info="node")],
+            layout_info="caption",
+        )
+        self.caption_set = CaptionSet(
+            {"en": CaptionList([self.plain, self.positioned],
+                               layout_info="list")},
+            layout_info="set",
+        )
+
+    @staticmethod
+    def _transform(layout_info):
+        return layout_info and layout_info.upper()
+
+    def test_layouts_are_transformed(self):
+        result = self.caption_set.copy_with_layout(self._transform)
+        caption = result.get_captions("en")[1]
+
+        assert caption.layout_info == "CAPTION"
+        assert caption.nodes[0].layout_info == "NODE"
+        assert result.get_layout_info("en") == "list"
+        assert result.layout_info == "set"
+
+    def test_original_is_not_modified(self):
+        self.caption_set.copy_with_layout(self._transform)
+
+        assert self.positioned.layout_info == "caption"
+        assert self.positioned.nodes[0].layout_info == "node"
+
+    def test_unchanged_captions_are_shared(self):
+        result = self.caption_set.copy_with_layout(self._transform)
+        captions = result.get_captions("en")
+
+        assert captions is not self.caption_set.get_captions("en")
+        assert captions[0] is self.plain
+        assert captions[1] is not self.positioned
+
+    def test_only_given_languages_are_transformed(self):
+        self.caption_set.set_captions(
+            "fr", CaptionList([self.positioned], layout_info="list"))
+        result = self.caption_set.copy_with_layout(self._transform, ["en"])
+
+        assert result.get_captions("fr")[0] is self.positioned
+        assert result.get_layout_info("fr") == "list"
+
+    def test_shared_layouts_are_transformed_once(self):
+        transformed = []
+
+        def transform(layout_info):
+            transformed.append(layout_info)
+            return self._transform(layout_info)
+
+        self.caption_set.set_captions(
+            "fr", CaptionList([self.positioned], layout_info="list"))
+        result = self.caption_set.copy_with_layout(transform)
+
+        assert sorted(transformed, key=str) == [None, "caption", "node"]
+        assert result.get_captions("fr")[0].layout_info == "CAPTION"
+
+
+class TestCaptionSetMergeCaptions:
+    def setup_method(self):
+        self.first = Caption(0, 1000, [CaptionNode.create_text("first")])
+        self.second = Caption(2000, 3000, [CaptionNode.create_text("second")])
+        self.concurrent = Caption(
+            0, 1000, [CaptionNode.create_text("concurrent")])
+        self.caps = CaptionList([self.first, self.second, self.concurrent])
+        self.caption_set = CaptionSet({"en": self.caps})
+
+    def test_concurrent_captions_are_merged(self):
+        self.caption_set.merge_captions()
+
+        assert self.caption_set.get_captions("en") is self.caps
+        assert list(self.caps) == [self.first, self.second]
+        assert self.first.get_text() == "first\nconcurrent"
+
+    def test_different_end_times_are_not_supported(self):
+        self.concurrent.end = 1500
+
+        with pytest.raises(ValueError):
+            self.caption_set.merge_captions()
+
+    def test_sane_start_times_and_gap(self):
+        overlapping = Caption(500, 5000, [CaptionNode.create_text("late")])
+        caption_set = CaptionSet({"en": CaptionList([self.first, overlapping])})
+        caption_set.make_sure_of_sane_start_times_and_gap(min_sub_gap_ms=1)
+
+        assert overlapping.start == 2000
+
+
+class TestBaseWriterLayoutCache:
+    def setup_method(self):
+        self.writer = BaseWriter(video_width=640, video_height=360)
+
+    @staticmethod
+    def _layout(origin):
+        return Layout(origin=Point.from_xml_attribute(origin))
+
+    def test_equal_layouts_are_transformed_once(self):
+        first = self.writer._relativize_and_fit_to_screen(
+            self._layout('64px 0px'))
+        second = self.writer._relativize_and_fit_to_screen(
+            self._layout('64px 0px'))
+
+        assert second is first
+        assert str(first.origin.x) == '10%'
+        assert self.writer.layout_cache_hits == 1
+        assert self.writer.layout_cache_misses == 1
+
+    def test_changed_settings_are_taken_into_account(self):
+        layout = self._layout('64px 0px')
+        self.writer._relativize_and_fit_to_screen(layout)
+        self.writer.video_width = 320
+        result = self.writer._relativize_and_fit_to_screen(layout)
+
+        assert str(result.origin.x) == '20%'
+        assert self.writer.layout_cache_misses == 2
+
+    def test_cache_is_bounded(self):
+        self.writer.LAYOUT_CACHE_SIZE = 2
+        for origin in ('1px 0px', '2px 0px', '3px 0px', '1px 0px'):
+            self.writer._relativize_and_fit_to_screen(self._layout(origin))
+
+        assert len(self.writer._layout_cache) == 2
+        assert self.writer.layout_cache_misses == 4
+
+    def test_missing_layouts_are_returned_as_is(self):
+        assert self.writer._relativize_and_fit_to_screen(None) is None
+        assert self.writer.layout_cache_misses == 0
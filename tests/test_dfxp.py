@@ -1,6 +1,7 @@
 import pytest
 
 from pycaption import DFXPReader, CaptionReadNoCaptions
+from pycaption.dfxp.base import LayoutAwareDFXPParser
 from pycaption.exceptions import (
     CaptionReadSyntaxError, CaptionReadError, CaptionReadTimingError,
 )
@@ -195,3 +196,120 @@ class TestDFXPReader(ReaderTestingMixIn):
         caps = caption_set.get_captions('en-US')
 
         assert len(caps) == 1
+
+    @pytest.mark.parametrize('backend', ['beautifulsoup', 'lxml'])
+    def test_identically_positioned_captions_share_their_layout(
+            self, sample_dfxp, backend):
+        captions = DFXPReader(backend=backend).read(
+            sample_dfxp).get_captions("en-US")
+        span_start = captions[2].nodes[0]
+
+        assert captions[0].layout_info is captions[1].layout_info
+        assert captions[0].layout_info is captions[3].layout_info
+        assert span_start.layout_info != captions[2].layout_info
+        assert (span_start.layout_info.alignment.horizontal
+                == HorizontalAlignmentEnum.RIGHT)
+
+
+class TestDFXPIdIndex:
+    def test_regions_and_styles_by_id(self, sample_dfxp):
+        index = LayoutAwareDFXPParser(sample_dfxp).id_index
+
+        assert index.regions['bottom'].get('tts:displayalign') == 'after'
+        assert [style.get('tts:color')
+                for style in index.find_styles('default')] == ['white']
+        assert index.find_styles('missing') == []
+        assert index.root_element.name == 'tt'
+        assert index.styling_section.name == 'styling'
+
+
+def _caption_set_contents(caption_set):
+    return [
+        (lang, caption_set.get_captions(lang).layout_info,
+         [(caption.start, caption.end, caption.style, caption.layout_info,
+           [(node.type_, node.content, node.start, node.layout_info)
+            for node in caption.nodes])
+          for caption in caption_set.get_captions(lang)])
+        for lang in sorted(caption_set.get_languages())
+    ] + [caption_set.get_styles()]
+
+
+class TestDFXPReaderLxmlBackend:
+    @pytest.mark.parametrize('fixture', [
+        'sample_dfxp', 'sample_dfxp_with_positioning',
+        'sample_dfxp_with_nested_spans',
+        'sample_dfxp_multiple_captions_with_the_same_timing',
+        'sample_dfxp_with_properly_closing_spans_output',
+        'sample_dfxp_only_spaces_paragraph', 'sample_dfxp_empty_cue',
+        'dfxp_style_region_align_conflict',
+    ])
+    @pytest.mark.parametrize('read_invalid_positioning', [False, True])
+    def test_same_captions_as_beautifulsoup(
+            self, request, fixture, read_invalid_positioning):
+        content = request.getfixturevalue(fixture)
+
+        expected = DFXPReader(
+            read_invalid_positioning=read_invalid_positioning).read(content)
+        actual = DFXPReader(
+            backend='lxml',
+            read_invalid_positioning=read_invalid_positioning).read(content)
+
+        assert (_caption_set_contents(expected)
+                == _caption_set_contents(actual))
+
+    def test_falls_back_to_beautifulsoup_for_invalid_xml(
+            self, sample_dfxp_with_escaped_apostrophe):
+        expected = DFXPReader().read(sample_dfxp_with_escaped_apostrophe)
+        actual = DFXPReader(backend='lxml').read(
+            sample_dfxp_with_escaped_apostrophe)
+
+        assert (_caption_set_contents(expected)
+                == _caption_set_contents(actual))
+
+    def test_falls_back_when_the_regions_come_after_the_captions(self):
+        content = (
+            '<tt xmlns="http://www.w3.org/ns/ttml" '
+            'xmlns:tts="http://www.w3.org/ns/ttml#styling" xml:lang="en">'
+            '<body><div><p begin="00:00:01.000" end="00:00:02.000" '
+            'region="top">Hello</p></div></body>'
+            '<head><layout><region xml:id="top" tts:origin="10% 10%"/>'
+            '</layout></head></tt>'
+        )
+        expected = DFXPReader().read(content)
+        actual = DFXPReader(backend='lxml').read(content)
+
+        assert (_caption_set_contents(expected)
+                == _caption_set_contents(actual))
+        assert actual.get_captions('en')[0].layout_info.origin is not None
+
+    def test_missing_begin(self, sample_dfxp_missing_begin):
+        with pytest.raises(CaptionReadTimingError) as exc_info:
+            DFXPReader(backend='lxml').read(sample_dfxp_missing_begin)
+        assert exc_info.value.args[0].startswith('Missing begin time on line ')
+
+    def test_empty_file(self, sample_dfxp_empty):
+        with pytest.raises(CaptionReadNoCaptions):
+            DFXPReader(backend='lxml').read(sample_dfxp_empty)
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            DFXPReader(backend='html5lib')
+
+
+class TestLayoutAwareDFXPParser:
+    @pytest.mark.parametrize('fixture', [
+        'sample_dfxp', 'sample_dfxp_with_positioning',
+        'sample_dfxp_multiple_regions_input', 'sample_dfxp_with_nested_spans',
+    ])
+    def test_region_ids_gathered_in_one_pass(self, request, fixture):
+        parser = LayoutAwareDFXPParser(request.getfixturevalue(fixture))
+
+        for div in parser.find_all('div'):
+            descendant_region_ids = {}
+            parser._collect_descendant_region_ids(div, descendant_region_ids)
+            for tag in [div] + div.find_all(True):
+                assert parser._resolve_region_id(
+                    tag.get('region'),
+                    parser._get_region_from_ancestors(tag),
+                    descendant_region_ids[id(tag)]
+                ) == parser._determine_region_id(tag)
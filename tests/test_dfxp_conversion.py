@@ -5,7 +5,8 @@ from pycaption import (
 )
 from pycaption.dfxp.extras import LegacyDFXPWriter
 from pycaption.dfxp.base import (
-    DFXP_DEFAULT_STYLE, DFXP_DEFAULT_STYLE_ID, DFXP_DEFAULT_REGION,
+    DFXP_BASE_MARKUP, DFXP_DEFAULT_STYLE, DFXP_DEFAULT_STYLE_ID,
+    DFXP_DEFAULT_REGION,
     DFXP_DEFAULT_REGION_ID, _recreate_style, _convert_layout_to_attributes
 )
 
@@ -129,6 +130,20 @@ class TestDFXPtoDFXP(DFXPTestingMixIn):
 
         assert result == sample_dfxp_with_relativized_positioning
 
+    def test_caller_caption_set_is_not_modified(
+            self, sample_dfxp_with_relativized_positioning,
+            sample_dfxp_with_positioning):
+        caption_set = DFXPReader().read(sample_dfxp_with_positioning)
+        writer = DFXPWriter(video_width=VIDEO_WIDTH, video_height=VIDEO_HEIGHT)
+        writer.write(caption_set)
+
+        # Writing a second time from the same caption set yields the same
+        # result, and the absolute positioning read from the input is kept
+        assert writer.write(caption_set) == \
+            sample_dfxp_with_relativized_positioning
+        caption = caption_set.get_captions('en-US')[0]
+        assert not caption.layout_info.is_relative()
+
     def test_fit_to_screen(self, sample_dfxp_long_cue_fit_to_screen,
                            sample_dfxp_long_cue):
         # Check if caption width and height are is explicitly set and
@@ -148,6 +163,29 @@ class TestDFXPtoDFXP(DFXPTestingMixIn):
         result = DFXPWriter().write(caption_set)
         assert "&lt;&lt; \"Andy's Café &amp; Restaurant\" this way" in result
 
+    def test_attribute_values_with_quotes(self, sample_dfxp):
+        # Values containing double quotes are written between single quotes,
+        # as BeautifulSoup used to write them
+        caption_set = DFXPReader().read(sample_dfxp)
+        caption_set.set_styles({'p': {'font-family': '"Times New Roman"'}})
+        result = DFXPWriter().write(caption_set)
+
+        assert 'tts:fontFamily=\'"Times New Roman"\'' in result
+        rewritten = DFXPReader().read(result).get_styles()
+        assert dict(rewritten)['p']['font-family'] == '"Times New Roman"'
+
+    def test_customized_base_markup(self, sample_dfxp, monkeypatch):
+        monkeypatch.setattr(
+            'pycaption.dfxp.base.DFXP_BASE_MARKUP',
+            DFXP_BASE_MARKUP.replace('xmlns:tts=', (
+                'xmlns:ttp="http://www.w3.org/ns/ttml#parameter" '
+                'ttp:profile="custom" xmlns:tts=')))
+        caption_set = DFXPReader().read(sample_dfxp)
+        result = DFXPWriter().write(caption_set)
+
+        assert 'ttp:profile="custom"' in result
+        assert len(DFXPReader().read(result).get_captions('en-US')) == 7
+
 
 class TestDFXPtoWebVTT(WebVTTTestingMixIn):
     def test_conversion(self, sample_webvtt_from_dfxp, sample_dfxp):
@@ -1,7 +1,9 @@
 import pytest
 
 from pycaption import CaptionReadSyntaxError
-from pycaption.geometry import Size, Point, Stretch, Padding, UnitEnum, Layout
+from pycaption.geometry import (
+    Size, Point, Stretch, Padding, UnitEnum, Layout, sharing_instances,
+)
 
 
 class TestIsValidGeometryObject:
@@ -140,4 +142,41 @@ class TestSize:
         with pytest.raises(CaptionReadSyntaxError) as exc_info:
             Size.from_string(string)
 
-        assert exc_info.value.args[0].startswith(f"Invalid size: {string}.")
\ No newline at end of file
+        assert exc_info.value.args[0].startswith(f"Invalid size: {string}.")
+
+    def test_sizes_from_the_same_string_are_shared(self):
+        with sharing_instances():
+            assert Size.from_string('12.5%') is Size.from_string('12.5%')
+            assert Point.from_xml_attribute('1px 2px') is \
+                Point.from_xml_attribute('1px 2px')
+            assert Stretch.from_xml_attribute('1px 2px') is not \
+                Point.from_xml_attribute('1px 2px')
+
+    def test_sizes_are_only_shared_within_a_block(self):
+        with sharing_instances():
+            size = Size.from_string('12.5%')
+        with sharing_instances():
+            assert Size.from_string('12.5%') is not size
+        assert Size.from_string('12.5%') is not Size.from_string('12.5%')
+
+
+class TestLayoutIntern:
+    @sharing_instances()
+    def test_equal_layouts_are_shared(self):
+        origin = Point.from_xml_attribute('10% 20%')
+        layout = Layout.intern(origin=origin)
+
+        assert Layout.intern(origin=Point(
+            Size(10, UnitEnum.PERCENT), Size(20, UnitEnum.PERCENT))) is layout
+        assert Layout.intern(inherit_from=layout) is layout
+        assert Layout.intern(origin=origin, extent=Stretch.from_xml_attribute(
+            '50% 50%')) is not layout
+
+    @sharing_instances()
+    def test_webvtt_positioning_is_kept(self):
+        layout = Layout.intern(webvtt_positioning='align:start')
+
+        assert Layout.intern(webvtt_positioning='align:end') is not layout
+        assert Layout.intern(
+            webvtt_positioning='align:start').webvtt_positioning == \
+            'align:start'
@@ -1,3 +1,5 @@
+from io import StringIO
+
 from pycaption import MicroDVDReader, MicroDVDWriter, SAMIReader
 
 from tests.mixins import MicroDVDTestingMixIn
@@ -11,6 +13,13 @@ class TestMicroDVDtoMicroDVD(MicroDVDTestingMixIn):
         assert isinstance(results, str)
         self.assert_microdvd_equals(sample_microdvd, results)
 
+    def test_microdvd_write_to_stream(self, sample_microdvd):
+        caption_set = MicroDVDReader().read(sample_microdvd)
+        output = StringIO()
+        MicroDVDWriter().write_to(caption_set, output)
+
+        self.assert_microdvd_equals(sample_microdvd, output.getvalue())
+
 
 class TestSAMItoMicroDVD(MicroDVDTestingMixIn):
     def test_sami_to_micro_dvd_conversion(self, sample_microdvd_2, sample_sami):
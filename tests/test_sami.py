@@ -3,6 +3,7 @@ from copy import deepcopy
 import pytest
 
 from pycaption import SAMIReader, CaptionReadNoCaptions, CaptionReadSyntaxError
+from pycaption.sami import SAMIParser
 from pycaption.exceptions import CaptionReadTimingError
 from pycaption.geometry import HorizontalAlignmentEnum, Size, UnitEnum  # noqa
 from tests.mixins import ReaderTestingMixIn
@@ -177,3 +178,41 @@ class TestSAMIReader(ReaderTestingMixIn):
 
         assert paragraph_1.start == paragraph_2.start
         assert paragraph_1.end == paragraph_2.end
+
+    def test_interleaved_languages_are_timed_separately(self):
+        caption_set = self.reader.read("""<SAMI><HEAD><STYLE TYPE="text/css">
+            <!-- .ENCC {lang: en-US;} .FRCC {lang: fr-FR;} -->
+            </STYLE></HEAD><BODY>
+            <SYNC start="0"><P class="ENCC">One</P></SYNC>
+            <SYNC start="500"><P class="FRCC">Un</P></SYNC>
+            <SYNC start="2000"><P class="ENCC">Two</P></SYNC>
+            <SYNC start="3000"><P class="FRCC">Deux</P></SYNC>
+            </BODY></SAMI>""")
+
+        assert [(caption.start, caption.end, caption.get_text())
+                for caption in caption_set.get_captions("en-US")] == [
+            (0, 2000000, "One"), (2000000, 6000000, "Two")]
+        assert [(caption.start, caption.end, caption.get_text())
+                for caption in caption_set.get_captions("fr-FR")] == [
+            (500000, 3000000, "Un"), (3000000, 7000000, "Deux")]
+
+    def test_escaped_markup_is_read_as_text(self):
+        caption_set = self.reader.read(
+            "<SAMI><BODY><SYNC Start=0><P Class=ENCC>"
+            "&GT&GT NEXT,&nbsp;&#60;b&#x3e;<br>\n   <I>now</I>"
+            "</SYNC></BODY></SAMI>")
+        paragraph = caption_set.get_captions("und")[0]
+
+        assert paragraph.get_text() == ">> NEXT,\xa0<b>\nnow"
+
+    def test_parser_markup_is_only_built_on_request(self):
+        content = "<SAMI><BODY><SYNC Start=0><P Class=ENCC>a&gt;b</SAMI>"
+
+        assert SAMIParser().feed(content)[0] == \
+            '<sami><body><sync start="0"><p class="ENCC" lang="und">' \
+            'a&gt;b</p></sync></body></sami>'
+        assert SAMIParser(markup=False).feed(content)[0] is None
+
+    def test_xml_parser_class_is_deprecated(self):
+        with pytest.warns(DeprecationWarning):
+            self.reader._get_xml_parser_class()
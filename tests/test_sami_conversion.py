@@ -1,5 +1,8 @@
+import re
+
 from pycaption import (
-    DFXPReader, SAMIReader, SAMIWriter, SRTReader, WebVTTReader,
+    Caption, CaptionList, CaptionNode, CaptionSet, DFXPReader, SAMIReader,
+    SAMIWriter, SRTReader, WebVTTReader,
 )
 
 from .mixins import SAMITestingMixIn
@@ -101,6 +104,37 @@ class TestSAMItoSAMI(SAMITestingMixIn):
         self.assert_sami_captions_equal(sample_sami_with_lang, result)
         assert "lang: und;" in result
 
+    def test_syncs_of_all_languages_are_in_order(self):
+        caption_set = self.reader.read("""<SAMI><HEAD><STYLE TYPE="text/css">
+            <!-- .ENCC {lang: en-US;} .FRCC {lang: fr-FR;} -->
+            </STYLE></HEAD><BODY>
+            <SYNC start="0"><P class="ENCC">One</P></SYNC>
+            <SYNC start="500"><P class="FRCC">Un</P></SYNC>
+            <SYNC start="2000"><P class="ENCC">Two</P></SYNC>
+            <SYNC start="3000"><P class="FRCC">Deux</P></SYNC>
+            </BODY></SAMI>""")
+        result = self.writer.write(caption_set)
+
+        assert re.findall(r'<sync start="(\d+)">', result) == [
+            "0", "500", "2000", "3000"]
+        self.assert_sami_captions_equal(
+            self.writer.write(self.reader.read(result)), result)
+
+    def test_syncs_of_unsorted_captions_are_in_order(self):
+        def caption(start, text):
+            return Caption(start * 1000, (start + 500) * 1000,
+                           [CaptionNode.create_text(text)])
+
+        caption_set = CaptionSet({
+            "en": CaptionList([caption(2000, "Two"), caption(0, "One"),
+                               caption(4000, "Three")]),
+            "fr": CaptionList([caption(1000, "Un"), caption(3000, "Deux")]),
+        })
+        result = self.writer.write(caption_set)
+
+        assert re.findall(r'<sync start="(\d+)">', result) == [
+            "0", "500", "1000", "1500", "2000", "2500", "3000", "4000"]
+
 
 class TestWebVTTtoSAMI(SAMITestingMixIn):
     def test_webvtt_to_sami_conversion(self, sample_sami, sample_webvtt):
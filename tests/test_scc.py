@@ -1,9 +1,18 @@
 import pytest
 
 from pycaption import CaptionNode, CaptionReadNoCaptions, SCCReader
-from pycaption.exceptions import CaptionLineLengthError, CaptionReadTimingError
+from pycaption.exceptions import (
+    CaptionLineLengthError,
+    CaptionLineLengthWarning,
+    CaptionReadTimingError,
+)
 from pycaption.geometry import HorizontalAlignmentEnum, UnitEnum, VerticalAlignmentEnum
-from pycaption.scc.constants import MICROSECONDS_PER_CODEWORD
+from pycaption.scc import SCCDecoder, _SccTimeTranslator
+from pycaption.scc.constants import (
+    COMMANDS, DECODED_WORDS, EXTENDED_CHARS, MICROSECONDS_PER_CODEWORD,
+    SPECIAL_CHARS, UNKNOWN_WORD, WORD_CHARACTERS, WORD_COMMAND,
+    WORD_EXTENDED_CHAR, WORD_SPECIAL_CHAR,
+)
 from pycaption.scc.specialized_collections import (
     InstructionNodeCreator,
     TimingCorrectingCaptionList,
@@ -278,6 +287,65 @@ class TestSCCReader(ReaderTestingMixIn):
         assert "around 00:00:05.900" in exc_info.value.args[0].split("\n")[2]
         assert str_to_check in exc_info.value.args[0].split("\n")[2]
 
+    def test_line_too_long_warning(self, sample_scc_with_line_too_long):
+        with pytest.warns(CaptionLineLengthWarning) as record:
+            caption_set = SCCReader().read(
+                sample_scc_with_line_too_long, line_length_errors="warn"
+            )
+
+        assert len(record) == 1
+        message = str(record[0].message)
+        assert message.startswith(
+            "32 character limit for caption cue in scc file.")
+        assert "around 00:00:05.900" in message.split("\n")[2]
+        assert not caption_set.is_empty()
+
+    def test_line_too_long_ignored(self, sample_scc_with_line_too_long):
+        caption_set = SCCReader().read(
+            sample_scc_with_line_too_long, line_length_errors="ignore"
+        )
+
+        assert not caption_set.is_empty()
+
+    def test_unknown_line_length_errors_value(self, sample_scc_pop_on):
+        with pytest.raises(ValueError):
+            SCCReader().read(sample_scc_pop_on, line_length_errors="log")
+
+    def test_multiple_channels_in_one_pass(self, sample_scc_multiple_channels):
+        caption_set = SCCReader().read(
+            sample_scc_multiple_channels, channels={1: "en", 2: "es", 3: "fr"}
+        )
+
+        assert set(caption_set.get_languages()) == {"en", "es", "fr"}
+        assert _timing_and_text(caption_set.get_captions("en")) == [
+            (1300000, 4000000, "Hello")
+        ]
+        assert _timing_and_text(caption_set.get_captions("es")) == [
+            (1933333, 4066667, "Hola")
+        ]
+        assert _timing_and_text(caption_set.get_captions("fr")) == [
+            (2633333, 4133333, "Salut")
+        ]
+
+    def test_channels_without_languages(self, sample_scc_multiple_channels):
+        caption_set = SCCReader().read(
+            sample_scc_multiple_channels, channels=[2, 4])
+
+        assert caption_set.get_languages() == ["CC2"]
+        assert caption_set.get_captions("CC2")[0].get_text() == "Hola"
+
+    def test_invalid_channels(self, sample_scc_multiple_channels):
+        with pytest.raises(ValueError):
+            SCCReader().read(sample_scc_multiple_channels, channels=[5])
+
+    def test_single_channel_is_same_as_default(self, sample_scc_pop_on):
+        expected = SCCReader().read(sample_scc_pop_on, lang="en")
+        caption_set = SCCReader().read(sample_scc_pop_on, channels={1: "en"})
+
+        assert _timing_and_text(caption_set.get_captions("en")) == (
+            _timing_and_text(expected.get_captions("en"))
+        )
+
     def test_mid_row_codes_not_adding_space_before_text(
         self,
         sample_scc_mid_row_before_text_pop,
@@ -395,6 +463,37 @@ class TestSCCReader(ReaderTestingMixIn):
             assert expected_lines == actual_lines
 
 
+class TestDecodedWords:
+    def test_commands_take_precedence(self):
+        assert all(
+            DECODED_WORDS[word].kind == WORD_COMMAND for word in COMMANDS)
+
+    def test_pac_command(self):
+        decoded = DECODED_WORDS["9470"]
+
+        assert decoded.kind == WORD_COMMAND
+        assert decoded.is_pac and decoded.doubled
+
+    def test_special_and_extended_characters(self):
+        special = next(word for word in SPECIAL_CHARS if word not in COMMANDS)
+        extended = next(word for word in EXTENDED_CHARS
+                        if word not in COMMANDS and word not in SPECIAL_CHARS)
+
+        assert DECODED_WORDS[special].kind == WORD_SPECIAL_CHAR
+        assert DECODED_WORDS[special].chars == (SPECIAL_CHARS[special],)
+        assert DECODED_WORDS[extended].kind == WORD_EXTENDED_CHAR
+        assert not DECODED_WORDS[extended].doubled
+        assert DECODED_WORDS[extended].doubled_after_starter
+
+    def test_character_pairs(self):
+        assert DECODED_WORDS["c1c2"] == (
+            WORD_CHARACTERS, ("A", "B"), False, False, False, False, False)
+
+    def test_unknown_words_are_ignored(self):
+        assert "zzzz" not in DECODED_WORDS
+        assert UNKNOWN_WORD.kind is None
+
+
 class TestCoverageOnly:
     """In order to refactor safely, we need coverage of 95% or more.
     This class includes tests that ensure that at the very least, we don't
@@ -473,22 +572,22 @@ class TestCoverageOnly:
         scc1 = SCCReader().read(sample_scc_roll_up_ru3)
         captions = scc1.get_captions("en-US")
         expected_timings = [
-            (733333.3333333333, 2766666.6666666665),
-            (2766666.6666666665, 4566666.666666666),
-            (4566666.666666666, 6133333.333333334),
-            (6133333.333333334, 9700000.0),
-            (9700000.0, 11233333.333333332),
-            (11233333.333333332, 12233333.333333332),
-            (12233333.333333332, 13233333.333333332),
-            (13233333.333333332, 14233333.333333332),
-            (14233333.333333332, 17033333.333333336),
-            (17033333.333333336, 18633333.333333332),
-            (18633333.333333332, 20200000.0),
-            (20200000.0, 21800000.0),
-            (21800000.0, 34900000.0),
-            (34900000.0, 36400000.0),
-            (36400000.0, 44266666.666666664),
-            (44266666.666666664, 44866666.666666664),
+            (733333, 2766667),
+            (2766667, 4566667),
+            (4566667, 6133333),
+            (6133333, 9700000),
+            (9700000, 11233333),
+            (11233333, 12233333),
+            (12233333, 13233333),
+            (13233333, 14233333),
+            (14233333, 17033333),
+            (17033333, 18633333),
+            (18633333, 20200000),
+            (20200000, 21800000),
+            (21800000, 34900000),
+            (34900000, 36400000),
+            (36400000, 44266667),
+            (44266667, 44866667),
         ]
 
         actual_timings = [(c_.start, c_.end) for c_ in captions]
@@ -500,13 +599,13 @@ class TestCoverageOnly:
         # remain unchanged.
         scc1 = SCCReader().read(sample_scc_pop_on)
         expected_timings = [
-            (9743066.666666664, 12278933.333333332),
-            (14748066.666666666, 16916899.999999996),
-            (16916899.999999996, 18651966.666666664),
-            (18651966.666666664, 20787433.333333332),
-            (20787433.333333332, 26659966.666666664),
-            (26659966.666666664, 32132100.000000004),
-            (32132100.000000004, 36169466.666666664),
+            (9743067, 12278933),
+            (14748067, 16916900),
+            (16916900, 18651967),
+            (18651967, 20787433),
+            (20787433, 26659967),
+            (26659967, 32132100),
+            (32132100, 36169467),
         ]
 
         actual_timings = [(c_.start, c_.end) for c_ in scc1.get_captions("en-US")]
@@ -514,7 +613,151 @@ class TestCoverageOnly:
         assert expected_timings == actual_timings
 
 
+def _timing_and_text(captions):
+    return [(caption.start, caption.end, caption.get_text())
+            for caption in captions]
+
+
+class TestSCCDecoder:
+    @pytest.mark.parametrize("simulate_roll_up", [False, True])
+    @pytest.mark.parametrize(
+        "fixture",
+        [
+            "sample_scc_pop_on",
+            "sample_scc_roll_up_ru2",
+            "sample_scc_multiple_formats",
+            "sample_scc_no_explicit_end_to_last_caption",
+        ],
+    )
+    def test_same_captions_as_reader(self, request, fixture, simulate_roll_up):
+        content = request.getfixturevalue(fixture)
+        expected = SCCReader().read(content, simulate_roll_up=simulate_roll_up)
+
+        decoder = SCCDecoder(simulate_roll_up=simulate_roll_up)
+        captions = []
+        for line in content.splitlines():
+            captions.extend(decoder.feed(line))
+        captions.extend(decoder.flush())
+
+        assert _timing_and_text(captions) == _timing_and_text(
+            expected.get_captions("en-US")
+        )
+
+    def test_captions_are_returned_before_the_end_of_stream(
+            self, sample_scc_pop_on):
+        decoder = SCCDecoder()
+        fed_lines = []
+        for line in sample_scc_pop_on.splitlines():
+            fed_lines.append(line)
+            if decoder.feed(line):
+                break
+
+        # the first caption is erased at 00:00:12:08, and returned as soon as
+        # the stream moved on
+        assert fed_lines[-1].startswith("00:00:13:18")
+
+    def test_end_of_caption_finalizes_the_displayed_caption(self):
+        decoder = SCCDecoder()
+        decoder.feed("00:00:01;00 9420 9420 9470 9470 c1c2 942f 942f")
+
+        captions = decoder.feed(
+            "00:00:03;00 9420 9420 9470 9470 c445 942f 942f")
+
+        assert _timing_and_text(captions) == [(1166667, 3166667, "AB")]
+        assert _timing_and_text(decoder.flush()) == [(3166667, 7166667, "DE")]
+
+    def test_feeding_words(self):
+        decoder = SCCDecoder()
+        decoder.feed("00:00:01;00 9420 9420 9470 9470")
+        decoder.feed(["C1C2", "942f", "942f"])
+
+        assert _timing_and_text(decoder.flush()) == [(1166667, 5166667, "AB")]
+
+    def test_only_pending_captions_are_kept(self):
+        decoder = SCCDecoder()
+        returned = 0
+        for second in range(1, 200, 2):
+            returned += len(
+                decoder.feed(f"00:{second // 60:02}:{second % 60:02};00 "
+                             f"9420 9420 9470 9470 c1c2 942f 942f")
+            )
+            assert len(decoder._reader.caption_stash._collection) <= 1
+
+        assert returned + len(decoder.flush()) == 100
+
+
+class TestSccTimeTranslator:
+    def test_drop_frame_runs_at_wall_clock_rate(self):
+        translator = _SccTimeTranslator()
+        translator.start_at("00:01:00;15")
+
+        assert translator.get_time() == 60500000
+
+    def test_non_drop_frame_runs_slow(self):
+        translator = _SccTimeTranslator()
+        translator.start_at("00:00:10:00")
+
+        assert translator.get_time() == 10010000
+
+    @pytest.mark.parametrize("timespec", ["00:00:59;28", "00:00:59:28"])
+    def test_frames_overflow_past_29(self, timespec):
+        separator = timespec[-3]
+        translator = _SccTimeTranslator()
+        translator.start_at(timespec)
+        for _ in range(5):
+            translator.increment_frames()
+
+        expected = _SccTimeTranslator()
+        expected.start_at(f"00:01:00{separator}03")
+
+        assert translator.get_time() == expected.get_time()
+
+    def test_single_digit_frames(self):
+        translator = _SccTimeTranslator()
+        translator.start_at("00:00:01;5")
+        translator.increment_frames()
+
+        assert translator.get_time() == 1200000
+
+    def test_offset_is_subtracted_and_clamped(self):
+        translator = _SccTimeTranslator()
+        translator.offset = 2000000
+        translator.start_at("00:00:03;00")
+
+        assert translator.get_time() == 1000000
+
+        translator.start_at("00:00:01;00")
+
+        assert translator.get_time() == 0
+
+    def test_invalid_timestamp(self):
+        translator = _SccTimeTranslator()
+        translator.start_at("00:00;01")
+
+        with pytest.raises(CaptionReadTimingError):
+            translator.get_time()
+
+
 class TestInterpretableNodeCreator:
+    def test_end_of_caption_hands_buffer_over_to_cue(self):
+        reader = SCCReader()
+        reader.time_translator.start_at("00:00:01;00")
+        for word in ("9420", "9470", "c1c2"):
+            reader._translate_word(word)
+        pop_on_buffer = reader.buffer
+
+        reader._translate_word("942f")
+        reader._translate_word("9470")
+        reader._translate_word("c4c5")
+
+        cue = reader.pop_ons_queue[0]
+        assert cue.buffer is pop_on_buffer
+        assert cue.buffer._position_tracer is None
+        assert reader.buffer is not pop_on_buffer
+        assert [node.text for node in cue.buffer if node.is_text_node()] == [
+            "AB"
+        ]
+
     def test_italics_commands_are_formatted_properly(self):
         node_creator = InstructionNodeCreator(
             position_tracker=(DefaultProvidingPositionTracker())
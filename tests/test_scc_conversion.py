@@ -1,6 +1,11 @@
+from io import StringIO
+
 import pytest
 
 from pycaption import (
+    Caption,
+    CaptionNode,
+    CaptionSet,
     DFXPWriter,
     SCCReader,
     SCCWriter,
@@ -28,12 +33,57 @@ class TestSRTtoSCCtoSRT(CaptionSetTestingMixIn):
     def test_srt_to_scc_to_srt_conversion(self, sample_srt_ascii):
         self._test_srt_to_scc_to_srt_conversion(sample_srt_ascii)
 
+    def test_scc_write_to_stream(self):
+        caption_set = CaptionSet({"en-US": [
+            Caption(1000000, 3000000, [CaptionNode.create_text("Hello")]),
+            Caption(4000000, 6000000, [CaptionNode.create_text("World")]),
+        ]})
+        output = StringIO()
+        SCCWriter().write_to(caption_set, output)
+
+        assert output.getvalue() == """\
+Scenarist_SCC V1.0
+
+00:00:00:29\t94ae 94ae 9420 9420 9470 9470 c8e5 ecec ef80 942c 942c 942f 942f
+
+00:00:02:29\t942c 942c
+
+00:00:03:16\t94ae 94ae 9420 9420 9470 9470 57ef f2ec 6480 942c 942c 942f 942f
+
+00:00:05:29\t942c 942c
+
+"""
+
+    def test_scc_character_encoding(self):
+        caption_set = CaptionSet(
+            {"en-US": [Caption(1000000, 3000000, [
+                CaptionNode.create_text("A♪B\u0101")])]}
+        )
+
+        scc = SCCWriter().write(caption_set)
+
+        # standard characters are paired into words, padded with 80 before
+        # the special/extended ones; unknown characters are written as £
+        assert "9420 9420 9470 9470 c180 9137 c280 91b6 942c" in scc
+
 
 # The following test fails -- maybe a bug with SCCReader
 #    def test_srt_to_srt_unicode_conversion(self):
 #        self._test_srt_to_scc_to_srt_conversion(SAMPLE_SRT_UNICODE)
 
 
+class TestSCCtoSCC:
+    def test_scc_to_scc_timestamps(self, sample_scc_pop_on):
+        scc = SCCWriter().write(SCCReader().read(sample_scc_pop_on))
+
+        assert [line.split("\t")[0]
+                for line in scc.splitlines() if "\t" in line] == [
+            "00:00:09:22", "00:00:12:07", "00:00:13:16", "00:00:16:01",
+            "00:00:17:18", "00:00:19:10", "00:00:25:14", "00:00:31:13",
+            "00:00:36:04",
+        ]
+
+
 class TestSCCtoDFXP:
     def test_scc_to_dfxp(
         self, sample_dfxp_from_scc_output, sample_scc_multiple_positioning
@@ -1,4 +1,6 @@
-from pycaption.scc.translator import translate_scc
+from io import StringIO
+
+from pycaption.scc.translator import iter_translate_scc, translate_scc
 
 
 class TestSCCTranslator:
@@ -33,3 +35,16 @@ class TestSCCTranslator:
         result = translate_scc(sample_scc_special_and_extended_characters)
 
         assert sample_translated_scc_special_and_extended_characters == result
+
+    def test_words_are_translated_whole(self):
+        # "45" is "E", so replacing it inside other words would garble them
+        result = translate_scc("00:00:01;00\t45cb c845 4520")
+
+        assert result == "00:00:01;00\t[EK] [HE] [E ]"
+
+    def test_translation_line_by_line(self, sample_scc_pop_on):
+        lines = StringIO(sample_scc_pop_on)
+
+        result = "".join(iter_translate_scc(lines, brackets="{}"))
+
+        assert result == translate_scc(sample_scc_pop_on, brackets="{}")
@@ -1,3 +1,5 @@
+from io import BytesIO, StringIO
+
 import pytest
 
 from pycaption import SRTReader, CaptionReadNoCaptions
@@ -74,3 +76,28 @@ class TestSRTReader(ReaderTestingMixIn):
 
         assert 13000000 == first_paragraph.start
         assert 16000000 == first_paragraph.end
+
+    def test_iter_captions_matches_read(self, sample_srt):
+        expected = self.reader.read(sample_srt).get_captions("en-US")
+        captions = list(self.reader.iter_captions(StringIO(sample_srt)))
+
+        assert len(expected) == len(captions)
+        for exp, cap in zip(expected, captions):
+            assert (exp.start, exp.end) == (cap.start, cap.end)
+            assert exp.get_text() == cap.get_text()
+
+    def test_iter_captions_from_binary_stream(self, sample_srt):
+        stream = BytesIO(sample_srt.encode("utf-8-sig"))
+        captions = self.reader.iter_captions(stream)
+        first = next(captions)
+
+        assert 9209000 == first.start
+        assert "( clock ticking )" == first.get_text()
+        assert 6 == len(list(captions))
+
+    def test_iter_captions_is_lazy(self, sample_srt):
+        lines = iter(sample_srt.splitlines(keepends=True))
+        next(self.reader.iter_captions(lines))
+
+        # the first caption is available once the next cue number is seen
+        assert next(lines) == "00:00:14,848 --> 00:00:17,000\n"
@@ -1,4 +1,5 @@
 import re
+from io import StringIO
 
 from pycaption import (
     DFXPReader, SAMIReader, SRTReader, SRTWriter, WebVTTReader,
@@ -56,6 +57,13 @@ class TestSRTtoSRT(SRTTestingMixIn):
         assert 3 == len(sentences)
         assert 4 == len(sentences[0].splitlines())
 
+    def test_write_to_stream(self, sample_srt):
+        caption_set = self.reader.read(sample_srt)
+        output = StringIO()
+        self.writer.write_to(caption_set, output)
+
+        self.assert_srt_equals(sample_srt, output.getvalue())
+
 
 class TestWebVTTtoSRT(SRTTestingMixIn):
     def test_webvtt_to_srt_conversion(self, sample_srt, sample_webvtt):
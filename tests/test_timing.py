@@ -0,0 +1,91 @@
+import pytest
+
+from pycaption.base import Caption, CaptionList, CaptionNode, CaptionSet
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def _caption_set(*timings):
+    return CaptionSet({"en": CaptionList([
+        Caption(start, end, [CaptionNode.create_text("text")])
+        for start, end in timings
+    ])})
+
+
+def _timings(caption_set):
+    return [(caption.start, caption.end)
+            for caption in caption_set.get_captions("en")]
+
+
+class TestCaptionTimingView:
+    def test_changes_are_only_applied_on_demand(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000))
+        view = caption_set.get_timing_view(use_numpy).offset(500000)
+
+        assert _timings(caption_set) == [(1000000, 2000000)]
+        assert list(view.get_starts("en")) == [1500000]
+
+        view.apply()
+
+        assert _timings(caption_set) == [(1500000, 2500000)]
+
+    def test_skew_and_offset(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000), (4000000, 5000000))
+        caption_set.get_timing_view(use_numpy) \
+            .skew(1.5).offset(-1000000).apply()
+
+        assert _timings(caption_set) == [
+            (500000, 2000000), (5000000, 6500000)]
+
+    def test_clamp(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000), (4000000, 5000000))
+        caption_set.get_timing_view(use_numpy) \
+            .offset(-1500000).clamp(0, 3000000).apply()
+
+        assert _timings(caption_set) == [(0, 500000), (2500000, 3000000)]
+
+    def test_snap_to_frames(self, use_numpy):
+        caption_set = _caption_set((1010000, 1990000))
+        caption_set.get_timing_view(use_numpy).snap_to_frames(25).apply()
+
+        assert _timings(caption_set) == [(1000000, 2000000)]
+
+    def test_enforce_gap(self, use_numpy):
+        caption_set = _caption_set(
+            (3000000, 4000000), (1000000, 3000000), (500000, 600000))
+        caption_set.get_timing_view(use_numpy).enforce_gap(250000).apply()
+
+        assert _timings(caption_set) == [
+            (3000000, 4000000), (1000000, 2750000), (500000, 600000)]
+
+    def test_results_are_integers(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000))
+        caption_set.get_timing_view(use_numpy).skew(1000 / 1001).apply()
+        caption = caption_set.get_captions("en")[0]
+
+        assert type(caption.start) is int
+        assert type(caption.end) is int
+
+    def test_captions_changed_since_the_view_was_created(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000), (4000000, 5000000))
+        view = caption_set.get_timing_view(use_numpy).offset(500000)
+        caption_set.get_captions("en").pop(0)
+
+        with pytest.raises(ValueError):
+            view.apply()
+
+        assert _timings(caption_set) == [(4000000, 5000000)]
+
+    def test_captions_replaced_since_the_view_was_created(self, use_numpy):
+        caption_set = _caption_set((1000000, 2000000))
+        view = caption_set.get_timing_view(use_numpy).offset(500000)
+        caption_set.set_captions("en", CaptionList([
+            Caption(3000000, 4000000, [CaptionNode.create_text("text")])]))
+
+        with pytest.raises(ValueError):
+            view.apply()
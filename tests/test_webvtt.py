@@ -1,3 +1,5 @@
+from io import BytesIO, StringIO
+
 import pytest
 
 from pycaption import (
@@ -149,6 +151,42 @@ class TestWebVTTReader(ReaderTestingMixIn):
                 "This cue starts before the previous one.\n"
             )
 
+    def test_iter_captions_matches_read(self, sample_webvtt_2):
+        expected = self.reader.read(sample_webvtt_2).get_captions('en-US')
+        captions = list(self.reader.iter_captions(StringIO(sample_webvtt_2)))
+
+        assert len(expected) == len(captions)
+        for exp, cap in zip(expected, captions):
+            assert (exp.start, exp.end) == (cap.start, cap.end)
+            assert exp.get_text() == cap.get_text()
+
+    def test_iter_captions_yields_on_blank_line(self):
+        lines = iter([
+            b"WEBVTT\n", b"\n",
+            b"00:00:01.000 --> 00:00:02.000\n", b"first\n", b"\n",
+            b"00:00:03.000 --> 00:00:04.000\n", b"second\n",
+        ])
+        captions = self.reader.iter_captions(lines)
+
+        assert next(captions).get_text() == "first"
+        assert next(lines) == b"00:00:03.000 --> 00:00:04.000\n"
+
+    def test_iter_captions_validates_ordering(self):
+        stream = BytesIO(
+            b"WEBVTT\n\n"
+            b"00:00:20.000 --> 00:00:30.000\n"
+            b"Start times should be consecutive.\n"
+            b"\n"
+            b"00:00:10.000 --> 00:00:20.000\n"
+            b"This cue starts before the previous one.\n"
+        )
+        captions = WebVTTReader(
+            ignore_timing_errors=False).iter_captions(stream)
+
+        assert next(captions).start == 20000000
+        with pytest.raises(CaptionReadError):
+            next(captions)
+
     def test_zero_start(self, sample_webvtt_last_cue_zero_start):
         captions = self.reader.read(sample_webvtt_last_cue_zero_start)
         cue = captions.get_captions('en-US')[0]
@@ -159,6 +197,24 @@ class TestWebVTTReader(ReaderTestingMixIn):
         assert 1 == len(self.reader.read(
             sample_webvtt_empty_cue).get_captions('en-US'))
 
+    def test_layouts_are_only_shared_within_a_document(self):
+        content = (
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:02.000 line:20%\nfirst\n\n"
+            "00:00:03.000 --> 00:00:04.000 line:20%\nsecond\n"
+        )
+        first, second = [
+            self.reader.read(content).get_captions('en-US')
+            for _ in range(2)
+        ]
+        assert first[0].layout_info is first[1].layout_info
+
+        first[0].layout_info.webvtt_positioning = 'align:start'
+        first[0].layout_info.origin.y.value = 50
+
+        assert second[0].layout_info.webvtt_positioning == 'line:20%'
+        assert second[0].layout_info.origin.y.value == 20.0
+
     def test_line_percent_sets_origin_y(self):
         content = "WEBVTT\n\n00:00:01.000 --> 00:00:03.000 line:20%\nHello\n"
         captions = self.reader.read(content)
@@ -243,3 +299,19 @@ class TestWebVTTWriter:
         assert sample_webvtt_multi_lang_de == results
         results = WebVTTWriter().write(caption_set, 'en-US')
         assert sample_webvtt_multi_lang_en == results
+
+    def test_cue_settings_of_equal_layouts_are_kept_as_read(self):
+        # Both cues have the same Layout, but the cue settings are written
+        # back as they were read
+        caption_set = WebVTTReader().read(
+            "WEBVTT\n\n"
+            "00:00.000 --> 00:01.000 align:start line:90%\nOne\n\n"
+            "00:01.000 --> 00:02.000 line:90% align:start\nTwo\n"
+        )
+        captions = caption_set.get_captions("en-US")
+        assert captions[0].layout_info == captions[1].layout_info
+
+        results = self.writer.write(caption_set)
+
+        assert "00:00.000 --> 00:01.000 align:start line:90%\n" in results
+        assert "00:01.000 --> 00:02.000 line:90% align:start\n" in results
@@ -1,4 +1,5 @@
 import re
+from io import StringIO
 
 from pycaption import (
     SAMIReader, SRTReader, WebVTTReader, WebVTTWriter, DFXPWriter,
@@ -92,6 +93,13 @@ class TestWebVTTtoWebVTT(WebVTTTestingMixIn):
 
         assert sample_webvtt_keeps_positioning == results
 
+    def test_write_to_stream(self, sample_webvtt_with_cue_settings):
+        caption_set = WebVTTReader().read(sample_webvtt_with_cue_settings)
+        output = StringIO()
+        WebVTTWriter().write_to(caption_set, output)
+
+        assert sample_webvtt_with_cue_settings == output.getvalue()
+
     def test_output_timestamps(self, sample_webvtt_timestamps):
         expected_timestamp_line_pattern = re.compile(
             r'^(\d{2,}):(\d{2})(:\d{2})?\.(\d{3}) '